@@ -35,16 +35,21 @@
 
 import argparse
 import base64
+import codecs
 import hashlib
 import json
+import multiprocessing
 import os
+import pickle
+import shutil
 import sys
+import tempfile
 import time
 import gc
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, date
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict, Any, Union
+from typing import Optional, Tuple, List, Dict, Any, Union, Callable
 
 # ══════════════════════════════════════════════════════════════════════════════
 # DEPENDENCY VALIDATION
@@ -62,6 +67,13 @@ try:
 except ImportError:
     PANDAS_AVAILABLE = False
 
+try:
+    import pyarrow
+    import pyarrow.ipc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 try:
     import numpy as np
 except ImportError:
@@ -90,6 +102,12 @@ try:
 except ImportError:
     PSUTIL_AVAILABLE = False
 
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
 # ══════════════════════════════════════════════════════════════════════════════
 # NEXUS THEME CONFIGURATION (Titanium-Void Palette)
 # ══════════════════════════════════════════════════════════════════════════════
@@ -417,6 +435,31 @@ def safe_float(value: Any, default: float = 0.0) -> float:
         return default
 
 
+BALANCE_NULL_SENTINELS = ["", "-", "N/A", "null", "NULL", "None", "nan", "NaN"]
+
+
+def parse_float_expr(col_name: str, dtype: pl.DataType) -> pl.Expr:
+    """
+    Columnar float parse: null for sentinels, blanks and unparseable values;
+    Thai number formatting (commas, Thai digits) is normalized before the cast.
+    """
+    if dtype.is_numeric():
+        return pl.col(col_name).cast(pl.Float64)
+    
+    s = pl.col(col_name).cast(pl.Utf8).str.strip_chars()
+    return (
+        pl.when(s.is_in(BALANCE_NULL_SENTINELS))
+        .then(None)
+        .otherwise(s.str.replace_all(",", "", literal=True).str.replace_many(THAI_DIGITS, ASCII_DIGITS))
+        .cast(pl.Float64, strict=False)
+    )
+
+
+def safe_float_expr(col_name: str, dtype: pl.DataType, default: float = 0.0) -> pl.Expr:
+    """Columnar safe_float: whatever parse_float_expr cannot parse (or NaN) maps to default."""
+    return parse_float_expr(col_name, dtype).fill_nan(default).fill_null(default)
+
+
 def safe_int(value: Any, default: int = 0) -> int:
     """Safe integer conversion."""
     try:
@@ -514,6 +557,176 @@ def parse_date_dsl2_buddhist(date_str: Any) -> Optional[datetime]:
         return None
 
 
+THAI_DIGITS = ["๐", "๑", "๒", "๓", "๔", "๕", "๖", "๗", "๘", "๙"]
+ASCII_DIGITS = [str(d) for d in range(10)]
+
+
+def parse_date_dsl2_buddhist_expr(col_name: str) -> pl.Expr:
+    """
+    Columnar equivalent of parse_date_dsl2_buddhist: DD/MM/YYYY (BE) -> pl.Date.
+    Same validation (day 1-31, month 1-12, Gregorian year 1900-2100, real
+    calendar date) and null semantics, evaluated as one Polars expression.
+    """
+    parts = (
+        pl.col(col_name)
+        .cast(pl.Utf8)
+        .str.replace_many(THAI_DIGITS, ASCII_DIGITS)
+        .str.extract_groups(r"^\s*(\d+)\s*/\s*(\d+)\s*/\s*(\d+)\s*$")
+    )
+    day = parts.struct.field("1").cast(pl.Int64, strict=False)
+    month = parts.struct.field("2").cast(pl.Int64, strict=False)
+    year = parts.struct.field("3").cast(pl.Int64, strict=False) - 543
+
+    in_range = day.is_between(1, 31) & month.is_between(1, 12) & year.is_between(1900, 2100)
+
+    return (
+        pl.when(in_range)
+        .then(pl.format("{}-{}-{}", year, month, day))
+        .otherwise(None)
+        .str.to_date("%Y-%m-%d", strict=False)
+    )
+
+
+# Candidate formats in the same priority order as the scalar parsers
+DSL1_DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%Y/%m/%d"]
+PS_DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%Y/%m/%d", "%m/%d/%Y"]
+
+DATE_FORMAT_SAMPLE_ROWS = 10000
+
+DATE_NULL_SENTINELS = ["", "-", "null", "NULL"]
+
+
+def clean_date_dsl1_expr(col_name: str) -> pl.Expr:
+    """Strip sentinels and the redundant ' 00:00:00' / time suffix, as parse_date_dsl1 does."""
+    s = pl.col(col_name).cast(pl.Utf8).str.strip_chars()
+    s = pl.when(s.is_in(DATE_NULL_SENTINELS)).then(None).otherwise(s)
+    return (
+        pl.when(s.str.contains(" 00:00:00", literal=True))
+        .then(s.str.replace_all(" 00:00:00", "", literal=True))
+        .when(s.str.contains(" ", literal=True))
+        .then(s.str.split(" ").list.first())
+        .otherwise(s)
+    )
+
+
+def clean_date_payment_schedule_expr(col_name: str) -> pl.Expr:
+    """Strip sentinels and any time portion, as parse_date_payment_schedule does."""
+    s = pl.col(col_name).cast(pl.Utf8).str.strip_chars()
+    s = pl.when(s.is_in(DATE_NULL_SENTINELS)).then(None).otherwise(s)
+    return pl.when(s.str.contains(" ", literal=True)).then(s.str.split(" ").list.first()).otherwise(s)
+
+
+def infer_date_formats(sample: pl.Series, candidates: List[str]) -> List[str]:
+    """
+    Pick the candidate formats a sample of cleaned date strings actually uses.
+    
+    Priority order is kept, so ambiguous values (05/01/2023) resolve exactly as
+    in the scalar parsers. A homogeneous file yields a single format and thus a
+    single str.to_date pass; an empty sample keeps every candidate.
+    """
+    remaining = sample.drop_nulls()
+    if remaining.len() == 0:
+        return list(candidates)
+    
+    chosen = []
+    for fmt in candidates:
+        parsed = remaining.str.to_date(fmt, strict=False)
+        if parsed.null_count() < remaining.len():
+            chosen.append(fmt)
+            remaining = remaining.filter(parsed.is_null())
+            if remaining.len() == 0:
+                break
+    
+    return chosen or list(candidates)
+
+
+def parse_dates_expr(cleaned: pl.Expr, formats: List[str]) -> pl.Expr:
+    """Vectorized multi-format parse: first format that matches wins (coalesce)."""
+    if len(formats) == 1:
+        return cleaned.str.to_date(formats[0], strict=False)
+    return pl.coalesce([cleaned.str.to_date(fmt, strict=False) for fmt in formats])
+
+
+def sample_date_formats(
+    lf: pl.LazyFrame,
+    raw_col: str,
+    cleaner: Callable[[str], pl.Expr],
+    candidates: List[str],
+    source_name: str
+) -> List[str]:
+    """Infer the date format(s) of one file from a head sample ([] without raw_col)."""
+    if raw_col not in lf.collect_schema().names():
+        return []
+    
+    sample = lf.select(cleaner(raw_col)).head(DATE_FORMAT_SAMPLE_ROWS).collect().to_series()
+    formats = infer_date_formats(sample, candidates)
+    log_info(f"{raw_col} format(s) in {source_name}: {', '.join(formats)}")
+    return formats
+
+
+def attach_parsed_dates(
+    lf: pl.LazyFrame,
+    raw_col: str,
+    date_col: str,
+    cleaner: Callable[[str], pl.Expr],
+    candidates: List[str],
+    source_name: str,
+    formats: Optional[List[str]] = None
+) -> pl.LazyFrame:
+    """
+    Add a native Date column parsed with the file's date format(s), sampled
+    here unless already inferred (sample_date_formats).
+    """
+    if raw_col not in lf.collect_schema().names():
+        return lf.with_columns(pl.lit(None, dtype=pl.Date).alias(date_col))
+    
+    if formats is None:
+        formats = sample_date_formats(lf, raw_col, cleaner, candidates, source_name)
+    
+    return lf.with_columns(parse_dates_expr(cleaner(raw_col), formats).alias(date_col))
+
+
+def ensure_parsed_dates(
+    df: Union[pl.DataFrame, pl.LazyFrame],
+    raw_col: str,
+    date_col: str,
+    cleaner: Callable[[str], pl.Expr],
+    candidates: List[str]
+) -> Union[pl.DataFrame, pl.LazyFrame]:
+    """
+    Guarantee a native Date column parsed from raw_col.
+    
+    Rows whose value did not match the format(s) inferred from their file's
+    sample are re-parsed with every candidate format; when the inference held
+    (the normal case) this costs a single counting pass. A Datetime left
+    behind by a pandas round-trip is cast back to Date. On a LazyFrame the
+    repair is planned unconditionally instead of checked up front.
+    """
+    schema = df.collect_schema()
+    
+    if raw_col not in schema:
+        if date_col in schema:
+            return df
+        return df.with_columns(pl.lit(None, dtype=pl.Date).alias(date_col))
+    
+    if date_col not in schema:
+        return df.with_columns(parse_dates_expr(cleaner(raw_col), candidates).alias(date_col))
+    
+    if schema[date_col] != pl.Date:
+        df = df.with_columns(pl.col(date_col).cast(pl.Date))
+    
+    unparsed = pl.col(date_col).is_null() & cleaner(raw_col).is_not_null()
+    if isinstance(df, pl.LazyFrame) or df.select(unparsed.any()).item():
+        df = df.with_columns(
+            pl.when(unparsed)
+            .then(parse_dates_expr(cleaner(raw_col), candidates))
+            .otherwise(pl.col(date_col))
+            .alias(date_col)
+        )
+    
+    return df
+
+
 def parse_date_payment_schedule(date_str: Any) -> Optional[datetime]:
     """
     Parse Payment Schedule date format.
@@ -563,6 +776,114 @@ def detect_header_row_index(file_path: Path, encoding: str, target_columns: List
         return 0
 
 
+def map_required_columns(available_cols: List[str], required_cols: List[str]) -> Dict[str, str]:
+    """
+    Map required column names to the actual header names in a file.
+    Falls back to substring matching for headers with stray prefixes/suffixes.
+    """
+    col_mapping = {}
+    for req_col in required_cols:
+        if req_col in available_cols:
+            col_mapping[req_col] = req_col
+        else:
+            for avail_col in available_cols:
+                if req_col in avail_col or avail_col in req_col:
+                    col_mapping[req_col] = avail_col
+                    break
+    return col_mapping
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# THAI TRANSCODING: NATIVE POLARS INGEST FOR TIS-620 / CP874
+# ══════════════════════════════════════════════════════════════════════════════
+
+# Polars' CSV parser only understands UTF-8; everything else is transcoded first
+POLARS_NATIVE_ENCODINGS = ("utf-8", "utf-8-sig")
+
+TRANSCODE_CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def transcode_to_utf8(file_path: Path, encoding: str, work_dir: Path = None,
+                      chunk_size: int = TRANSCODE_CHUNK_BYTES) -> Path:
+    """
+    Stream-transcode a Thai-encoded file (TIS-620/CP874/ISO-8859-11) to a UTF-8 temp file
+    in work_dir (the system temp folder when None).
+    Uses an incremental decoder so only one chunk is held in memory at a time.
+    Undecodable bytes become U+FFFD and are counted in a warning, since an
+    account number containing one will not join.
+    The caller owns the returned path and must unlink it.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    fd, tmp_name = tempfile.mkstemp(prefix=f"{file_path.stem}.", suffix=".utf8.csv", dir=work_dir)
+    replaced = 0
+
+    try:
+        with open(file_path, "rb") as src, os.fdopen(fd, "wb") as dst:
+            for chunk in iter(lambda: src.read(chunk_size), b""):
+                text = decoder.decode(chunk)
+                replaced += text.count("\ufffd")
+                dst.write(text.encode("utf-8"))
+            text = decoder.decode(b"", final=True)
+            replaced += text.count("\ufffd")
+            dst.write(text.encode("utf-8"))
+    except Exception:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+    if replaced:
+        log_warn(f"{file_path.name}: {replaced:,} undecodable {encoding} byte sequence(s) replaced with U+FFFD")
+
+    return Path(tmp_name)
+
+
+def read_csv_polars_any_encoding(
+    file_path: Path,
+    encoding: str,
+    required_cols: List[str],
+    key_col: str,
+    header_row_idx: int = 0,
+    work_dir: Path = None
+) -> Optional[pl.DataFrame]:
+    """
+    Read the required columns of a CSV on the multi-threaded Polars parser,
+    whatever its encoding or header offset.
+
+    Non-UTF-8 files are streamed through transcode_to_utf8() and the header
+    offset is applied via skip_rows. All columns are read as Utf8 so account
+    numbers keep their leading zeros. Returns None if key_col is not present.
+    """
+    if encoding in POLARS_NATIVE_ENCODINGS:
+        source = file_path
+        tmp_path = None
+    else:
+        tmp_path = transcode_to_utf8(file_path, encoding, work_dir)
+        source = tmp_path
+
+    try:
+        lf = pl.scan_csv(
+            source,
+            skip_rows=header_row_idx,
+            infer_schema=False,
+            ignore_errors=True,
+            truncate_ragged_lines=True,
+            null_values=["", "null", "NULL", "N/A"],
+            low_memory=True,
+        )
+
+        col_mapping = map_required_columns(lf.collect_schema().names(), required_cols)
+        if key_col not in col_mapping:
+            return None
+
+        return lf.select([
+            pl.col(col_mapping[c]).alias(c) for c in required_cols if c in col_mapping
+        ]).with_columns(
+            pl.col(key_col).str.strip_chars()
+        ).collect()
+    finally:
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # FILE DISCOVERY & PARALLEL I/O
 # ══════════════════════════════════════════════════════════════════════════════
@@ -582,6 +903,53 @@ def discover_files(folder: Path, patterns: List[str] = None) -> List[Path]:
     return sorted(files, key=lambda p: p.name)
 
 
+def run_file_tasks(
+    task: Callable[..., Any],
+    files: List[Path],
+    workers: int = 1,
+    task_args: Tuple = (),
+    progress_callback=None
+) -> List[Any]:
+    """
+    Run task(file_path, *task_args) for every file in a bounded process pool.
+
+    Results are returned in the order of files regardless of completion order,
+    so downstream concatenation stays deterministic. Failed files yield None.
+    workers <= 1 runs serially in-process.
+    """
+    results: List[Any] = [None] * len(files)
+
+    if workers <= 1 or len(files) <= 1:
+        for idx, file_path in enumerate(files):
+            try:
+                results[idx] = task(file_path, *task_args)
+            except Exception as e:
+                log_warn(f"Failed to load {file_path.name}: {e}")
+            if progress_callback:
+                progress_callback()
+        return results
+
+    pool_size = min(workers, len(files))
+    log_flux(f"Dispatching {len(files)} file(s) to {pool_size} worker process(es)...")
+
+    # spawn (not fork): forking after Polars has started its thread pool can deadlock
+    with ProcessPoolExecutor(max_workers=pool_size, mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = {
+            executor.submit(task, file_path, *task_args): idx
+            for idx, file_path in enumerate(files)
+        }
+        for future in as_completed(futures):
+            idx = futures[future]
+            try:
+                results[idx] = future.result()
+            except Exception as e:
+                log_warn(f"Failed to load {files[idx].name}: {e}")
+            if progress_callback:
+                progress_callback()
+
+    return results
+
+
 def get_file_hash(file_path: Path, chunk_size: int = 8192) -> str:
     """Calculate SHA-256 hash of file for manifest."""
     sha256 = hashlib.sha256()
@@ -591,20 +959,150 @@ def get_file_hash(file_path: Path, chunk_size: int = 8192) -> str:
     return sha256.hexdigest()[:16]
 
 
+# Hashing multi-GB inputs is expensive; memoize per (path, size, mtime) so the
+# ingest cache and the manifest share a single pass over each file.
+_fingerprint_memo: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+
+def file_fingerprint(file_path: Path) -> Dict[str, Any]:
+    """Return size, mtime and short SHA-256 digest identifying a file's content."""
+    stat = file_path.stat()
+    memo_key = (str(file_path.absolute()), stat.st_size, stat.st_mtime_ns)
+
+    if memo_key not in _fingerprint_memo:
+        _fingerprint_memo[memo_key] = {
+            "name": file_path.name,
+            "size_bytes": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash_sha256_short": get_file_hash(file_path, chunk_size=1024 * 1024),
+        }
+
+    return _fingerprint_memo[memo_key]
+
+
+def remember_fingerprint(file_path: Path, fingerprint: Dict[str, Any]) -> None:
+    """Seed the memo with a fingerprint computed in a worker process."""
+    memo_key = (str(file_path.absolute()), fingerprint["size_bytes"], fingerprint["mtime_ns"])
+    _fingerprint_memo[memo_key] = fingerprint
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# STREAMING ENGINE: BOUNDED-MEMORY EXECUTION
+# ══════════════════════════════════════════════════════════════════════════════
+
+# Rough in-flight bytes per row of the projected reconcile columns
+STREAMING_ROW_BYTES = 512
+
+# Morsels buffered per thread between pipeline operators
+STREAMING_BUFFERED_MORSELS = 4
+
+STREAMING_MIN_CHUNK_ROWS = 10_000
+STREAMING_MAX_CHUNK_ROWS = 1_000_000
+
+
+def collect_engine(streaming: bool) -> str:
+    """Polars engine used to execute reconcile plans."""
+    return "streaming" if streaming else "auto"
+
+
+def configure_streaming(memory_limit_gb: Optional[float]) -> None:
+    """
+    Size streaming morsels so the rows in flight across all threads stay
+    within memory_limit_gb. Join build sides are still held in memory, which
+    is why every reconcile plan projects down to keys and compared columns.
+    """
+    if memory_limit_gb is None:
+        log_info("Streaming engine: Polars default chunk size")
+        return
+    
+    budget_bytes = memory_limit_gb * 1024 ** 3
+    per_chunk_row = STREAMING_ROW_BYTES * pl.thread_pool_size() * STREAMING_BUFFERED_MORSELS
+    chunk_rows = int(budget_bytes / per_chunk_row)
+    chunk_rows = max(STREAMING_MIN_CHUNK_ROWS, min(STREAMING_MAX_CHUNK_ROWS, chunk_rows))
+    
+    pl.Config.set_streaming_chunk_size(chunk_rows)
+    log_info(f"Streaming engine: {chunk_rows:,}-row chunks for a {memory_limit_gb:g} GB ceiling")
+
+
+def frame_height(frame: Union[pl.DataFrame, pl.LazyFrame], streaming: bool = False) -> int:
+    """Row count of an eager frame, or of a lazy one via a count-only query."""
+    if isinstance(frame, pl.DataFrame):
+        return frame.height
+    return frame.select(pl.len()).collect(engine=collect_engine(streaming)).item()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# INGEST CACHE: CONTENT-ADDRESSED PARQUET
+# ══════════════════════════════════════════════════════════════════════════════
+
+# Bump whenever the projected/normalized schema written by a loader changes
+INGEST_CACHE_VERSION = 5
+
+
+def ingest_cache_path(cache_dir: Path, dataset: str, file_path: Path) -> Path:
+    """Resolve the Parquet cache entry for a source file, keyed by its fingerprint."""
+    fp = file_fingerprint(file_path)
+    key_material = f"v{INGEST_CACHE_VERSION}|{dataset}|{fp['size_bytes']}|{fp['mtime_ns']}|{fp['hash_sha256_short']}"
+    key = hashlib.sha256(key_material.encode("utf-8")).hexdigest()[:24]
+    return cache_dir / dataset / f"{file_path.stem}.{key}.parquet"
+
+
+def cached_ingest(
+    cache_dir: Optional[Path],
+    dataset: str,
+    file_path: Path,
+    build: Callable[[], Union[pl.LazyFrame, pl.DataFrame, None]]
+) -> Optional[pl.LazyFrame]:
+    """
+    Return a LazyFrame for one source file, served from the Parquet cache when possible.
+
+    On a miss, build() parses the CSV and its result is persisted as Parquet
+    before being scanned back. Without a cache_dir this is a pass-through.
+    """
+    if cache_dir is None:
+        frame = build()
+        if frame is None:
+            return None
+        return frame.lazy()
+
+    cache_path = ingest_cache_path(cache_dir, dataset, file_path)
+    if cache_path.exists():
+        log_info(f"Ingest cache hit for {file_path.name}")
+        return pl.scan_parquet(cache_path)
+
+    frame = build()
+    if frame is None:
+        return None
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".parquet.tmp")
+    if isinstance(frame, pl.LazyFrame):
+        frame.sink_parquet(tmp_path)
+    else:
+        frame.write_parquet(tmp_path)
+    os.replace(tmp_path, cache_path)
+    log_write(f"Ingest cache stored for {file_path.name}")
+
+    return pl.scan_parquet(cache_path)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # DSL2 PRE-PROCESSING: DEDUPLICATION & CONFLICT DETECTION
 # ══════════════════════════════════════════════════════════════════════════════
 
 class DSL2PreProcessingResult:
-    """Container for DSL2 pre-processing results."""
+    """
+    Container for DSL2 pre-processing results. The deduplicated frame itself
+    is returned separately, so staging it leaves no heap copy behind and this
+    stays small enough to checkpoint.
+    """
     
     def __init__(self):
         self.original_rows: int = 0
         self.deduplicated_rows: int = 0
         self.duplicates_removed: int = 0
         self.conflict_accounts: int = 0
-        self.conflict_records: List[Dict] = []
-        self.deduplicated_data: pl.DataFrame = None
+        self.conflict_records: pl.DataFrame = pl.DataFrame()
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -616,12 +1114,26 @@ class DSL2PreProcessingResult:
         }
 
 
-def preprocess_dsl2_with_source_tracking(folder: Path, progress_callback=None) -> Tuple[pl.DataFrame, DSL2PreProcessingResult]:
+def preprocess_dsl2_with_source_tracking(
+    folder: Path,
+    progress_callback=None,
+    cache_dir: Optional[Path] = None,
+    workers: int = 1,
+    streaming: bool = False,
+    row_col: Optional[str] = None,
+    work_dir: Optional[Path] = None
+) -> Tuple[pl.DataFrame, DSL2PreProcessingResult]:
     """
     Load DSL2 files with source file tracking, then perform:
     1. Deduplication: Remove exact duplicates (same เลขบัญชี, วันที่เริ่มชำระหนี้, ยอดหนี้เงินกู้)
     2. Conflict Detection: Identify same เลขบัญชี with different values
     
+    Both steps and the row counts run as one lazy plan over the file scans
+    (on the streaming engine with streaming=True); only the deduplicated
+    data and the conflict records are materialized. With row_col set, rows
+    carry their stable per-file order (with_file_order) through the dedup.
+    Thai-encoded files are transcoded to UTF-8 in work_dir.
+    
     Returns:
         Tuple of (deduplicated DataFrame, PreProcessingResult)
     """
@@ -636,224 +1148,676 @@ def preprocess_dsl2_with_source_tracking(folder: Path, progress_callback=None) -
     
     log_recon(f"Discovered {len(files)} file(s) in DSL2 folder")
     
-    required_cols = ["เลขบัญชี", "วันที่เริ่มชำระหนี้", "ยอดหนี้เงินกู้"]
-    
-    all_records = []
-    
-    for file_path in files:
-        file_start = time.time()
-        encoding = detect_encoding(file_path)
-        log_flux(f"Loading {file_path.name} with encoding: {encoding}")
-        
-        header_row_idx = detect_header_row_index(file_path, encoding, required_cols)
-        
-        try:
-            df = pd.read_csv(
-                file_path,
-                encoding=encoding,
-                skiprows=header_row_idx,
-                dtype={"เลขบัญชี": str},
-                low_memory=False,
-                on_bad_lines="skip"
-            )
-            
-            available_cols = df.columns.tolist()
-            
-            # Map columns
-            col_mapping = {}
-            for req_col in required_cols:
-                if req_col in available_cols:
-                    col_mapping[req_col] = req_col
-                else:
-                    for avail_col in available_cols:
-                        if req_col in avail_col or avail_col in req_col:
-                            col_mapping[req_col] = avail_col
-                            break
-            
-            if "เลขบัญชี" not in col_mapping:
-                log_warn(f"Column เลขบัญชี not found in {file_path.name}")
-                continue
-            
-            # Select and rename columns
-            df_selected = df[[col_mapping[c] for c in required_cols if c in col_mapping]].copy()
-            df_selected.columns = [c for c in required_cols if c in col_mapping]
-            
-            # Add source file column
-            df_selected["_SOURCE_FILE"] = file_path.name
-            
-            # Ensure ACC_NO is string
-            df_selected["เลขบัญชี"] = df_selected["เลขบัญชี"].astype(str).str.strip()
-            
-            all_records.append(df_selected)
-            
-            file_elapsed = time.time() - file_start
-            log_secure(f"Loaded {file_path.name} ({len(df_selected):,} rows) [{file_elapsed:.2f}s]")
-            
-            if progress_callback:
-                progress_callback()
-                
-        except Exception as e:
-            log_warn(f"Failed to load {file_path.name}: {e}")
-            continue
+    sources = [
+        (file_path, lf.with_columns(pl.lit(file_path.name).alias("_SOURCE_FILE")))
+        for file_path, lf in with_file_order(ingest_files("dsl2", files, cache_dir, workers, progress_callback, work_dir), files, row_col)
+    ]
     
-    if not all_records:
+    if not sources:
         raise ValueError("No valid DSL2 files could be loaded")
     
-    # Combine all records
-    combined_df = pd.concat(all_records, ignore_index=True)
-    result.original_rows = len(combined_df)
-    log_info(f"Combined DSL2 data: {result.original_rows:,} rows")
+    # Balances are compared by parsed value (100 and 100.00 are equal). Text
+    # that does not parse keys on itself, so it stays distinct from 0, from
+    # a blank balance and from other text.
+    combined = pl.concat([lf for _, lf in sources], how="diagonal")
+    balance_key = parse_float_expr("ยอดหนี้เงินกู้", combined.collect_schema()["ยอดหนี้เงินกู้"])
+    combined = combined.with_columns([
+        balance_key.alias("_BAL_KEY"),
+        pl.when(balance_key.is_null()).then(pl.col("ยอดหนี้เงินกู้").cast(pl.Utf8).str.strip_chars()).alias("_BAL_TEXT"),
+    ])
     
-    # Step 1: Identify conflicts (same เลขบัญชี with different values)
-    start_timer("detect_conflicts")
-    log_flux("Detecting conflicts (same ACC with different DATE/BALANCE)...")
+    # Conflicts: one aggregation counting distinct (date, balance) pairs per account
+    conflict_accounts = (
+        combined
+        .filter(pl.col("เลขบัญชี").is_not_null())
+        .group_by("เลขบัญชี")
+        .agg(pl.struct(["วันที่เริ่มชำระหนี้", "_BAL_KEY", "_BAL_TEXT"]).n_unique().alias("_PAIRS"))
+        .filter(pl.col("_PAIRS") > 1)
+        .select("เลขบัญชี")
+    )
     
-    # Group by เลขบัญชี and check for variations
-    grouped = combined_df.groupby("เลขบัญชี")
+    # Every row of a conflicting account, grouped by account in key order
+    conflict_records = (
+        combined
+        .join(conflict_accounts, on="เลขบัญชี", how="semi")
+        .select(["เลขบัญชี", "วันที่เริ่มชำระหนี้", "ยอดหนี้เงินกู้", "_SOURCE_FILE"])
+        .sort("เลขบัญชี", maintain_order=True)
+    )
     
-    conflict_records = []
-    conflict_acc_nos = set()
+    # Deduplication: first occurrence of each combination, in source order
+    dedup_cols = ["เลขบัญชี", "วันที่เริ่มชำระหนี้", "_BAL_KEY", "_BAL_TEXT"]
+    deduplicated = combined.unique(subset=dedup_cols, keep="first", maintain_order=True).drop(["_SOURCE_FILE", "_BAL_KEY", "_BAL_TEXT"])
     
-    for acc_no, group in grouped:
-        if len(group) > 1:
-            # Check if there are different values for date or balance
-            unique_combinations = group[["วันที่เริ่มชำระหนี้", "ยอดหนี้เงินกู้"]].drop_duplicates()
-            
-            if len(unique_combinations) > 1:
-                # This account has conflicts
-                conflict_acc_nos.add(acc_no)
-                
-                for _, row in group.iterrows():
-                    conflict_records.append({
-                        "เลขบัญชี": acc_no,
-                        "วันที่เริ่มชำระหนี้": row.get("วันที่เริ่มชำระหนี้", ""),
-                        "ยอดหนี้เงินกู้": row.get("ยอดหนี้เงินกู้", ""),
-                        "_SOURCE_FILE": row.get("_SOURCE_FILE", ""),
-                    })
+    start_timer("detect_conflicts")
+    start_timer("deduplicate")
+    log_flux("Detecting conflicts (same ACC with different DATE/BALANCE) and removing exact duplicates...")
     
-    result.conflict_accounts = len(conflict_acc_nos)
-    result.conflict_records = conflict_records
+    *file_rows, conflict_count, conflicts, deduplicated_df = pl.collect_all([
+        *[lf.select(pl.len()) for _, lf in sources],
+        conflict_accounts.select(pl.len()),
+        conflict_records,
+        deduplicated,
+    ], engine=collect_engine(streaming))
     
-    log_info(f"Detected {result.conflict_accounts:,} accounts with conflicts ({len(conflict_records):,} records)", "detect_conflicts")
+    for (file_path, _), rows in zip(sources, file_rows):
+        log_secure(f"Loaded {file_path.name} ({rows.item():,} rows)")
     
-    # Step 2: Deduplicate exact duplicates
-    start_timer("deduplicate")
-    log_flux("Removing exact duplicates...")
+    result.original_rows = sum(rows.item() for rows in file_rows)
+    log_info(f"Combined DSL2 data: {result.original_rows:,} rows")
     
-    # Keep first occurrence of each unique combination
-    dedup_cols = ["เลขบัญชี", "วันที่เริ่มชำระหนี้", "ยอดหนี้เงินกู้"]
-    deduplicated_df = combined_df.drop_duplicates(subset=dedup_cols, keep="first")
+    result.conflict_accounts = conflict_count.item()
+    result.conflict_records = conflicts
     
-    result.deduplicated_rows = len(deduplicated_df)
+    log_info(f"Detected {result.conflict_accounts:,} accounts with conflicts ({conflicts.height:,} records)", "detect_conflicts")
+    
+    result.deduplicated_rows = deduplicated_df.height
     result.duplicates_removed = result.original_rows - result.deduplicated_rows
     
     log_secure(f"Deduplication complete: {result.duplicates_removed:,} duplicates removed", "deduplicate")
     log_info(f"Deduplicated DSL2 data: {result.deduplicated_rows:,} rows")
     
-    # Convert to Polars for subsequent processing
-    # Remove source file column for main processing (keep it for reference)
-    deduplicated_for_processing = deduplicated_df.drop(columns=["_SOURCE_FILE"])
-    result.deduplicated_data = pl.from_pandas(deduplicated_for_processing)
-    
     log_secure(f"DSL2 pre-processing complete", "preprocess_dsl2")
     
-    return result.deduplicated_data, result
+    return deduplicated_df, result
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 # DATA LOADING: POLARS-FIRST STRATEGY WITH PANDAS FALLBACK
 # ══════════════════════════════════════════════════════════════════════════════
 
-def load_dsl1_polars(folder: Path, progress_callback=None) -> pl.LazyFrame:
+DSL1_REQUIRED_COLS = ["ACC_NO", "GROUP_FLAG", "FIRST_PAYMENT_DATE", "PRE_BALANCE", "EXACT_PRE_BALANCE"]
+DSL2_REQUIRED_COLS = ["เลขบัญชี", "วันที่เริ่มชำระหนี้", "ยอดหนี้เงินกู้"]
+PS_REQUIRED_COLS = ["ACC_NO", "DUE_PAYMENT_DATE", "CAPITAL_REMAIN"]
+
+# Normalized join key shared by every reconciliation
+ACC_KEY_COL = "ACC_NO_NORM"
+
+
+def account_key_expr(source_col: str) -> pl.Expr:
+    """Normalized account key: trimmed, leading zeros removed."""
+    return pl.col(source_col).str.strip_chars().str.strip_chars_start("0").alias(ACC_KEY_COL)
+
+
+def ensure_account_key(
+    df: Union[pl.DataFrame, pl.LazyFrame],
+    source_col: str
+) -> Union[pl.DataFrame, pl.LazyFrame]:
     """
-    Load DSL1 files using Polars for maximum performance.
-    DSL1: ~7.43M rows, 7GB, YYYY-MM-DD 00:00:00 format
-    
-    Extracts required columns:
-    - ACC_NO (string, immutable identifier)
-    - GROUP_FLAG (for filtering)
-    - FIRST_PAYMENT_DATE
-    - PRE_BALANCE
-    - EXACT_PRE_BALANCE (new column for comparison)
+    Add the normalized account key unless the loader already computed it.
+    Loaders attach it at ingest (and it is persisted in the Parquet cache),
+    so reconciliations normally reuse the precomputed column.
     """
-    start_timer("load_dsl1")
-    files = discover_files(folder)
-    if not files:
-        raise FileNotFoundError(f"No data files found in {folder}")
-    
-    log_recon(f"Discovered {len(files)} file(s) in DSL1 folder")
-    
-    # Define schema for required columns
-    required_cols = ["ACC_NO", "GROUP_FLAG", "FIRST_PAYMENT_DATE", "PRE_BALANCE", "EXACT_PRE_BALANCE"]
-    
-    lazy_frames = []
-    
-    for file_path in files:
-        file_start = time.time()
-        encoding = detect_encoding(file_path)
-        log_flux(f"Loading {file_path.name} with encoding: {encoding}")
-        
-        try:
-            polars_encoding = "utf8" if encoding in ["utf-8", "utf-8-sig"] else "utf8"
-            
-            lf = pl.scan_csv(
-                file_path,
-                encoding=polars_encoding,
-                ignore_errors=True,
-                null_values=["", "null", "NULL", "N/A", "-"],
-                infer_schema_length=10000,
-                low_memory=True,
-            )
-            
-            available_cols = lf.collect_schema().names()
-            select_cols = [c for c in required_cols if c in available_cols]
-            
-            if "ACC_NO" not in select_cols:
-                log_fatal(f"Critical column ACC_NO missing in {file_path.name}")
-                continue
-            
-            if "GROUP_FLAG" not in select_cols:
-                log_warn(f"GROUP_FLAG column missing in {file_path.name}, will include all records")
-            
-            lf = lf.select(select_cols)
-            
-            # Cast ACC_NO to string
-            lf = lf.with_columns([
-                pl.col("ACC_NO").cast(pl.Utf8).alias("ACC_NO")
-            ])
-            
-            lazy_frames.append(lf)
-            
-            file_elapsed = time.time() - file_start
-            log_flux(f"Prepared {file_path.name} [{file_elapsed:.2f}s]")
-            
-            if progress_callback:
-                progress_callback()
-                
-        except Exception as e:
-            log_warn(f"Polars failed for {file_path.name}: {e}, trying fallback...")
-            continue
-    
-    if not lazy_frames:
-        raise ValueError("No valid DSL1 files could be loaded")
+    if ACC_KEY_COL in df.collect_schema():
+        return df
+    return df.with_columns(account_key_expr(source_col))
+
+
+# Parsed DSL2 start date (Gregorian pl.Date), computed once per DSL2 load
+DSL2_DATE_COL = "DATE_DSL2"
+
+
+def ensure_dsl2_dates(df: Union[pl.DataFrame, pl.LazyFrame]) -> Union[pl.DataFrame, pl.LazyFrame]:
+    """
+    Attach the parsed Buddhist Era start date as a native Date column unless
+    the loader already did. A Datetime left behind by a pandas round-trip is
+    cast back to Date.
+    """
+    schema = df.collect_schema()
     
-    combined = pl.concat(lazy_frames)
+    if DSL2_DATE_COL in schema:
+        if schema[DSL2_DATE_COL] != pl.Date:
+            return df.with_columns(pl.col(DSL2_DATE_COL).cast(pl.Date))
+        return df
     
-    log_secure(f"DSL1 LazyFrame prepared", "load_dsl1")
+    if "วันที่เริ่มชำระหนี้" not in schema:
+        return df.with_columns(pl.lit(None, dtype=pl.Date).alias(DSL2_DATE_COL))
     
-    return combined
+    return df.with_columns(parse_date_dsl2_buddhist_expr("วันที่เริ่มชำระหนี้").alias(DSL2_DATE_COL))
 
 
-def load_dsl2_polars(folder: Path, progress_callback=None) -> pl.LazyFrame:
-    """
-    Load DSL2 files using Polars.
+# Parsed DSL1 / Payment Schedule dates (pl.Date), inferred per file at ingest
+DSL1_DATE_COL = "DATE_DSL1"
+PS_DATE_COL = "DATE_PS"
+
+
+def attach_dsl1_dates(lf: pl.LazyFrame, source_name: str, formats: Optional[List[str]] = None) -> pl.LazyFrame:
+    """Add DATE_DSL1 parsed with the format(s) inferred for this file."""
+    return attach_parsed_dates(lf, "FIRST_PAYMENT_DATE", DSL1_DATE_COL, clean_date_dsl1_expr, DSL1_DATE_FORMATS, source_name, formats)
+
+
+def attach_ps_dates(lf: pl.LazyFrame, source_name: str, formats: Optional[List[str]] = None) -> pl.LazyFrame:
+    """Add DATE_PS parsed with the format(s) inferred for this file."""
+    return attach_parsed_dates(lf, "DUE_PAYMENT_DATE", PS_DATE_COL, clean_date_payment_schedule_expr, PS_DATE_FORMATS, source_name, formats)
+
+
+def ensure_dsl1_dates(df: Union[pl.DataFrame, pl.LazyFrame]) -> Union[pl.DataFrame, pl.LazyFrame]:
+    """Complete DATE_DSL1 (see ensure_parsed_dates)."""
+    return ensure_parsed_dates(df, "FIRST_PAYMENT_DATE", DSL1_DATE_COL, clean_date_dsl1_expr, DSL1_DATE_FORMATS)
+
+
+def ensure_ps_dates(df: Union[pl.DataFrame, pl.LazyFrame]) -> Union[pl.DataFrame, pl.LazyFrame]:
+    """Complete DATE_PS (see ensure_parsed_dates)."""
+    return ensure_parsed_dates(df, "DUE_PAYMENT_DATE", PS_DATE_COL, clean_date_payment_schedule_expr, PS_DATE_FORMATS)
+
+
+# Raw balance column -> parsed Float64 column, attached once at load
+DSL1_BALANCE_COLS = {"PRE_BALANCE": "BAL_DSL1", "EXACT_PRE_BALANCE": "EXACT_BAL"}
+DSL2_BALANCE_COLS = {"ยอดหนี้เงินกู้": "BAL_DSL2"}
+PS_BALANCE_COLS = {"CAPITAL_REMAIN": "BAL_PS"}
+
+
+def ensure_balances(
+    frame: Union[pl.LazyFrame, pl.DataFrame],
+    balance_cols: Dict[str, str]
+) -> Union[pl.LazyFrame, pl.DataFrame]:
+    """
+    Add the parsed Float64 balance for every raw balance column present,
+    unless it is already there. Raw columns are kept as read.
+    """
+    schema = frame.collect_schema()
+    exprs = [
+        safe_float_expr(raw_col, schema[raw_col]).alias(bal_col)
+        for raw_col, bal_col in balance_cols.items()
+        if raw_col in schema and bal_col not in schema
+    ]
+    return frame.with_columns(exprs) if exprs else frame
+
+
+# Fixed-width integer join key (see encode_account_keys)
+ACC_KEY_INT_COL = "ACC_KEY_U64"
+
+# Canonical numeric keys live below 2**63; dictionary ids for the rest start here
+DICT_KEY_BASE = 1 << 63
+
+
+def encode_account_keys(
+    *frames: Optional[Union[pl.DataFrame, pl.LazyFrame]],
+    streaming: bool = False
+) -> List[Optional[Union[pl.DataFrame, pl.LazyFrame]]]:
+    """
+    Add a UInt64 join key to every frame, encoded consistently across frames.
+    
+    Normalized keys that are canonical integers (the normal case) map to their
+    own value. Anything else (alphanumeric, empty, or 20+ digits) falls back to
+    its string key: the distinct fallback strings across all frames are
+    dictionary-encoded to ids >= 2**63, so equal strings still get equal ids.
+    Joins on the result match exactly the rows a join on ACC_NO_NORM would.
+    None entries are passed through unchanged; LazyFrames stay lazy (only the
+    small set of fallback keys is collected).
+    """
+    as_int = pl.col(ACC_KEY_COL).cast(pl.UInt64, strict=False)
+    numeric_key = (
+        pl.when((as_int < DICT_KEY_BASE) & (as_int.cast(pl.Utf8) == pl.col(ACC_KEY_COL)))
+        .then(as_int)
+        .otherwise(None)
+        .alias(ACC_KEY_INT_COL)
+    )
+    
+    encoded = [df.with_columns(numeric_key) if df is not None else None for df in frames]
+    
+    fallback_keys = pl.concat([
+        df.lazy().filter(pl.col(ACC_KEY_INT_COL).is_null() & pl.col(ACC_KEY_COL).is_not_null()).select(ACC_KEY_COL)
+        for df in encoded if df is not None
+    ]).unique().sort(ACC_KEY_COL).collect(engine=collect_engine(streaming))
+    
+    if fallback_keys.height == 0:
+        return encoded
+    
+    log_info(f"Dictionary-encoding {fallback_keys.height:,} non-numeric account key(s)")
+    
+    dict_ids = [DICT_KEY_BASE + i for i in range(fallback_keys.height)]
+    fallback_expr = (
+        pl.when(pl.col(ACC_KEY_INT_COL).is_null() & pl.col(ACC_KEY_COL).is_not_null())
+        .then(pl.col(ACC_KEY_COL).replace_strict(fallback_keys[ACC_KEY_COL].to_list(), dict_ids, default=None, return_dtype=pl.UInt64))
+        .otherwise(pl.col(ACC_KEY_INT_COL))
+        .alias(ACC_KEY_INT_COL)
+    )
+    
+    return [df.with_columns(fallback_expr) if df is not None else None for df in encoded]
+
+
+def join_key_for(*frames: Union[pl.DataFrame, pl.LazyFrame]) -> str:
+    """Join on the UInt64 key when every frame carries it, otherwise on ACC_NO_NORM."""
+    if all(ACC_KEY_INT_COL in df.collect_schema() for df in frames):
+        return ACC_KEY_INT_COL
+    return ACC_KEY_COL
+
+
+def scan_csv_source(file_path: Path, encoding: str) -> pl.LazyFrame:
+    """Lazy Polars scan of a DSL1 / Payment Schedule CSV."""
+    polars_encoding = "utf8" if encoding in ["utf-8", "utf-8-sig"] else "utf8"
+    
+    return pl.scan_csv(
+        file_path,
+        encoding=polars_encoding,
+        ignore_errors=True,
+        null_values=["", "null", "NULL", "N/A", "-"],
+        infer_schema_length=10000,
+        low_memory=True,
+    )
+
+
+def probe_dsl1_file(file_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Inspect one DSL1 file for scan_dsl1_file(): its encoding, the columns to
+    project and the inferred date format(s). None if ACC_NO is missing.
+    """
+    encoding = detect_encoding(file_path)
+    log_flux(f"Loading {file_path.name} with encoding: {encoding}")
+    
+    lf = scan_csv_source(file_path, encoding)
+    
+    available_cols = lf.collect_schema().names()
+    select_cols = [c for c in DSL1_REQUIRED_COLS if c in available_cols]
+    
+    if "ACC_NO" not in select_cols:
+        log_fatal(f"Critical column ACC_NO missing in {file_path.name}")
+        return None
+    
+    if "GROUP_FLAG" not in select_cols:
+        log_warn(f"GROUP_FLAG column missing in {file_path.name}, will include all records")
+    
+    return {
+        "encoding": encoding,
+        "columns": select_cols,
+        "date_formats": sample_date_formats(lf, "FIRST_PAYMENT_DATE", clean_date_dsl1_expr, DSL1_DATE_FORMATS, file_path.name),
+    }
+
+
+def scan_dsl1_file(file_path: Path, probe: Optional[Dict[str, Any]] = None) -> Optional[pl.LazyFrame]:
+    """
+    Scan a single DSL1 file and project the required columns (None if ACC_NO
+    is missing). probe is probe_dsl1_file()'s result when an ingest worker
+    already ran it.
+    """
+    if probe is None:
+        probe = probe_dsl1_file(file_path)
+        if probe is None:
+            return None
+    
+    lf = scan_csv_source(file_path, probe["encoding"]).select(probe["columns"])
+    
+    # Cast ACC_NO to string and attach the normalized join key and parsed date once
+    lf = lf.with_columns([
+        pl.col("ACC_NO").cast(pl.Utf8).alias("ACC_NO")
+    ]).with_columns(account_key_expr("ACC_NO"))
+    
+    return ensure_balances(attach_dsl1_dates(lf, file_path.name, probe["date_formats"]), DSL1_BALANCE_COLS)
+
+
+def read_dsl2_file(file_path: Path, work_dir: Optional[Path] = None) -> Optional[pl.DataFrame]:
+    """
+    Read a single DSL2 file (Thai encoding, offset header) on the Polars parser.
+    Thai-encoded files are transcoded into work_dir (see transcode_to_utf8).
+    """
+    encoding = detect_encoding(file_path)
+    log_flux(f"Loading {file_path.name} with encoding: {encoding}")
+    
+    header_row_idx = detect_header_row_index(file_path, encoding, DSL2_REQUIRED_COLS)
+    
+    df = read_csv_polars_any_encoding(
+        file_path,
+        encoding,
+        DSL2_REQUIRED_COLS,
+        key_col="เลขบัญชี",
+        header_row_idx=header_row_idx,
+        work_dir=work_dir,
+    )
+    
+    if df is None:
+        log_warn(f"Column เลขบัญชี not found in {file_path.name}")
+        return None
+    
+    df = ensure_dsl2_dates(df.with_columns(account_key_expr("เลขบัญชี")))
+    return ensure_balances(df, DSL2_BALANCE_COLS)
+
+
+def probe_payment_schedule_file(file_path: Path) -> Optional[Union[Dict[str, Any], pl.DataFrame]]:
+    """
+    Inspect one Payment Schedule file for scan_payment_schedule_file(): its
+    encoding, the columns to project and the inferred date format(s), or the
+    whole file read via pandas when Polars cannot parse it. None if ACC_NO
+    is missing.
+    """
+    encoding = detect_encoding(file_path)
+    log_flux(f"Loading {file_path.name} with encoding: {encoding}")
+    
+    try:
+        lf = scan_csv_source(file_path, encoding)
+        
+        available_cols = lf.collect_schema().names()
+        select_cols = [c for c in PS_REQUIRED_COLS if c in available_cols]
+        
+        if "ACC_NO" not in select_cols:
+            log_fatal(f"Critical column ACC_NO missing in {file_path.name}")
+            return None
+        
+        return {
+            "encoding": encoding,
+            "columns": select_cols,
+            "date_formats": sample_date_formats(
+                lf, "DUE_PAYMENT_DATE", clean_date_payment_schedule_expr, PS_DATE_FORMATS, file_path.name
+            ),
+        }
+        
+    except Exception as e:
+        log_warn(f"Polars failed for {file_path.name}: {e}")
+        # Try pandas fallback
+        try:
+            df = pd.read_csv(
+                file_path,
+                encoding=encoding,
+                dtype={"ACC_NO": PANDAS_STRING_DTYPE},
+                low_memory=True,
+                on_bad_lines="skip",
+                **PANDAS_READ_OPTIONS
+            )
+            
+            available = [c for c in PS_REQUIRED_COLS if c in df.columns]
+            if "ACC_NO" in available:
+                log_secure(f"Loaded {file_path.name} via pandas fallback")
+                lf = pandas_to_polars(df[available]).lazy().with_columns(account_key_expr("ACC_NO"))
+                return ensure_balances(attach_ps_dates(lf, file_path.name), PS_BALANCE_COLS).collect()
+        except Exception as e2:
+            log_warn(f"Both Polars and Pandas failed for {file_path.name}: {e2}")
+        
+        return None
+
+
+def scan_payment_schedule_file(
+    file_path: Path,
+    probe: Optional[Union[Dict[str, Any], pl.DataFrame]] = None
+) -> Optional[Union[pl.LazyFrame, pl.DataFrame]]:
+    """
+    Scan a single Payment Schedule file, falling back to pandas if Polars
+    cannot parse it. probe is probe_payment_schedule_file()'s result when an
+    ingest worker already ran it.
+    """
+    if probe is None:
+        probe = probe_payment_schedule_file(file_path)
+        if probe is None:
+            return None
+    
+    if isinstance(probe, pl.DataFrame):
+        return probe
+    
+    lf = scan_csv_source(file_path, probe["encoding"]).select(probe["columns"])
+    
+    lf = lf.with_columns([
+        pl.col("ACC_NO").cast(pl.Utf8).alias("ACC_NO")
+    ]).with_columns(account_key_expr("ACC_NO"))
+    
+    return ensure_balances(attach_ps_dates(lf, file_path.name, probe["date_formats"]), PS_BALANCE_COLS)
+
+
+# Per-file builders used by ingest_files() and its worker processes
+INGEST_BUILDERS: Dict[str, Callable[[Path], Any]] = {
+    "dsl1": scan_dsl1_file,
+    "dsl2": read_dsl2_file,
+    "payment_schedule": scan_payment_schedule_file,
+}
+
+# Per-file inspection of the lazily scanned datasets, run in the ingest
+# workers; the parent then only builds the scan (builder(file_path, probe=...))
+INGEST_PROBES: Dict[str, Callable[[Path], Any]] = {
+    "dsl1": probe_dsl1_file,
+    "payment_schedule": probe_payment_schedule_file,
+}
+
+# Datasets whose builder transcodes to a UTF-8 copy (and so takes a work_dir)
+TRANSCODED_INGEST_DATASETS = ("dsl2",)
+
+
+def ingest_builder(dataset: str, work_dir: Optional[Path] = None) -> Callable[[Path], Any]:
+    """Per-file builder for a dataset, with work_dir bound for transcoding builders."""
+    build = INGEST_BUILDERS[dataset]
+    if work_dir is not None and dataset in TRANSCODED_INGEST_DATASETS:
+        return lambda file_path: build(file_path, work_dir=work_dir)
+    return build
+
+
+def ingest_file_task(
+    file_path: Path,
+    dataset: str,
+    cache_dir: Optional[Path],
+    work_dir: Optional[Path] = None
+) -> Tuple[Any, Optional[Dict[str, Any]]]:
+    """
+    Worker entry point for ingest_files(): parse one source file in a child process.
+    Returns (payload, fingerprint) where payload is the Parquet cache path when
+    caching, the probe result for a lazily scanned dataset (INGEST_PROBES),
+    otherwise the parsed DataFrame.
+    """
+    build = ingest_builder(dataset, work_dir)
+    
+    if cache_dir is None and dataset in INGEST_PROBES:
+        return INGEST_PROBES[dataset](file_path), None
+    
+    if cache_dir is None:
+        frame = build(file_path)
+        if isinstance(frame, pl.LazyFrame):
+            frame = frame.collect()
+        return frame, None
+    
+    lf = cached_ingest(cache_dir, dataset, file_path, lambda: build(file_path))
+    payload = ingest_cache_path(cache_dir, dataset, file_path) if lf is not None else None
+    return payload, file_fingerprint(file_path)
+
+
+def ingest_files(
+    dataset: str,
+    files: List[Path],
+    cache_dir: Optional[Path] = None,
+    workers: int = 1,
+    progress_callback=None,
+    work_dir: Optional[Path] = None
+) -> List[Tuple[Path, pl.LazyFrame]]:
+    """
+    Load every file of a dataset, returning (file, LazyFrame) pairs in file order.
+    
+    The per-file work is spread across a bounded process pool: parsing (DSL2
+    always; DSL1/PS when they are being written to the ingest cache),
+    otherwise the DSL1/PS probing (encoding detection and schema).
+    Only the lazy scans are built in-process, where Polars parallelizes the
+    eventual collect. Transcoded UTF-8 copies of Thai-encoded files are
+    written to work_dir.
+    """
+    build = ingest_builder(dataset, work_dir)
+    parallel = workers > 1 and len(files) > 1
+    
+    frames = []
+    
+    if not parallel:
+        for file_path in files:
+            file_start = time.time()
+            
+            try:
+                lf = cached_ingest(cache_dir, dataset, file_path, lambda: build(file_path))
+            except Exception as e:
+                log_warn(f"Failed to load {file_path.name}: {e}")
+                continue
+            
+            if lf is None:
+                continue
+            
+            frames.append((file_path, lf))
+            
+            file_elapsed = time.time() - file_start
+            log_flux(f"Prepared {file_path.name} [{file_elapsed:.2f}s]")
+            
+            if progress_callback:
+                progress_callback()
+        
+        return frames
+    
+    outputs = run_file_tasks(ingest_file_task, files, workers, (dataset, cache_dir, work_dir), progress_callback)
+    
+    for file_path, output in zip(files, outputs):
+        if output is None:
+            continue
+        
+        payload, fingerprint = output
+        if fingerprint:
+            remember_fingerprint(file_path, fingerprint)
+        
+        if payload is None:
+            continue
+        
+        if isinstance(payload, Path):
+            frames.append((file_path, pl.scan_parquet(payload)))
+        elif isinstance(payload, dict):
+            frames.append((file_path, build(file_path, probe=payload).lazy()))
+        else:
+            frames.append((file_path, payload.lazy()))
+    
+    return frames
+
+
+# Bits of a stable row-order value holding the row's position within its file
+FILE_RANK_SHIFT = 32
+
+
+def with_file_order(
+    sources: List[Tuple[Path, pl.LazyFrame]],
+    files: List[Path],
+    row_col: Optional[str]
+) -> List[Tuple[Path, pl.LazyFrame]]:
+    """
+    Tag every ingested (file, LazyFrame) pair with a stable row-order column:
+    the file's rank among the discovered files above FILE_RANK_SHIFT and the
+    row's position within the file below it. The value never depends on the
+    other files' row counts, so per-account results can be carried across
+    runs (see reconcile_incremental). Without row_col sources pass through.
+    """
+    if row_col is None:
+        return sources
+    
+    rank = {file_path: i for i, file_path in enumerate(files)}
+    return [
+        (file_path, lf.with_row_index(row_col).with_columns(
+            (pl.col(row_col).cast(pl.UInt64) + (rank[file_path] << FILE_RANK_SHIFT)).alias(row_col)
+        ))
+        for file_path, lf in sources
+    ]
+
+
+def load_dsl1_polars(
+    folder: Path,
+    progress_callback=None,
+    cache_dir: Optional[Path] = None,
+    workers: int = 1,
+    row_col: Optional[str] = None
+) -> pl.LazyFrame:
+    """
+    Load DSL1 files using Polars for maximum performance.
+    DSL1: ~7.43M rows, 7GB, YYYY-MM-DD 00:00:00 format
+    
+    Extracts required columns:
+    - ACC_NO (string, immutable identifier)
+    - GROUP_FLAG (for filtering)
+    - FIRST_PAYMENT_DATE
+    - PRE_BALANCE
+    - EXACT_PRE_BALANCE (new column for comparison)
+    
+    With cache_dir set, unchanged files are served from the Parquet ingest cache.
+    With row_col set, rows carry their stable per-file order (with_file_order).
+    """
+    start_timer("load_dsl1")
+    files = discover_files(folder)
+    if not files:
+        raise FileNotFoundError(f"No data files found in {folder}")
+    
+    log_recon(f"Discovered {len(files)} file(s) in DSL1 folder")
+    
+    lazy_frames = [
+        lf for _, lf in with_file_order(ingest_files("dsl1", files, cache_dir, workers, progress_callback), files, row_col)
+    ]
+    
+    if not lazy_frames:
+        raise ValueError("No valid DSL1 files could be loaded")
+    
+    combined = pl.concat(lazy_frames)
+    
+    log_secure(f"DSL1 LazyFrame prepared", "load_dsl1")
+    
+    return combined
+
+
+def filter_group_flag(dsl1: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Apply the GROUP_FLAG = 1 predicate to a DSL1 LazyFrame.
+    Applied before collect() so Polars pushes it down into the CSV/Parquet scan
+    and excluded rows are never materialized.
+    """
+    if "GROUP_FLAG" not in dsl1.collect_schema().names():
+        log_warn("GROUP_FLAG column not found, using all DSL1 records")
+        return dsl1
+    
+    return dsl1.filter(pl.col("GROUP_FLAG").cast(pl.Int64, strict=False) == 1)
+
+
+def collect_dsl1_filtered(dsl1: pl.LazyFrame) -> Tuple[pl.DataFrame, int]:
+    """
+    Materialize only the GROUP_FLAG = 1 rows of DSL1.
+    
+    Returns:
+        Tuple of (filtered DataFrame, total DSL1 row count before the filter)
+    """
+    start_timer("filter_group_flag")
+    log_flux("Materializing DSL1 with GROUP_FLAG = 1 pushed into the scan...")
+    
+    # Row count and filtered rows in one streaming query: the file scans are
+    # shared and the unfiltered rows are never held
+    total_rows, filtered = pl.collect_all(
+        [dsl1.select(pl.len()), filter_group_flag(dsl1)],
+        engine=collect_engine(True)
+    )
+    total_rows = total_rows.item()
+    filtered = ensure_account_key(filtered, "ACC_NO")
+    filtered = ensure_balances(ensure_dsl1_dates(filtered), DSL1_BALANCE_COLS)
+    
+    log_secure(f"DSL1 filtered to {filtered.height:,} of {total_rows:,} rows (GROUP_FLAG = 1)", "filter_group_flag")
+    
+    return filtered, total_rows
+
+
+def stream_dsl1_filtered(dsl1: pl.LazyFrame) -> Tuple[pl.LazyFrame, int]:
+    """
+    Streaming counterpart of collect_dsl1_filtered(): the GROUP_FLAG = 1
+    filter and normalization stay in the lazy plan and only the total row
+    count is executed.
+    
+    Returns:
+        Tuple of (filtered LazyFrame, total DSL1 row count before the filter)
+    """
+    total_rows = frame_height(dsl1, streaming=True)
+    filtered = ensure_account_key(filter_group_flag(dsl1), "ACC_NO")
+    filtered = ensure_balances(ensure_dsl1_dates(filtered), DSL1_BALANCE_COLS)
+    
+    log_secure(f"DSL1 scan planned: {total_rows:,} rows, GROUP_FLAG = 1 applied while streaming")
+    
+    return filtered, total_rows
+
+
+def load_dsl2_polars(
+    folder: Path,
+    progress_callback=None,
+    cache_dir: Optional[Path] = None,
+    workers: int = 1,
+    work_dir: Optional[Path] = None
+) -> pl.LazyFrame:
+    """
+    Load DSL2 files using Polars.
     DSL2: ~4M rows, 1-1.5GB, Buddhist Era dates (DD/MM/YYYY BE)
     Header is in the SECOND row (index 1), not the first row.
+    Thai-encoded files are transcoded to UTF-8 (in work_dir) and parsed natively by Polars.
     
     Extracts required columns:
     - เลขบัญชี (ACC_NO equivalent)
     - วันที่เริ่มชำระหนี้ (FIRST_PAYMENT_DATE equivalent)
     - ยอดหนี้เงินกู้ (PRE_BALANCE equivalent)
+    
+    With cache_dir set, unchanged files are served from the Parquet ingest cache.
     """
     start_timer("load_dsl2")
     files = discover_files(folder)
@@ -862,116 +1826,27 @@ def load_dsl2_polars(folder: Path, progress_callback=None) -> pl.LazyFrame:
     
     log_recon(f"Discovered {len(files)} file(s) in DSL2 folder")
     
-    required_cols = ["เลขบัญชี", "วันที่เริ่มชำระหนี้", "ยอดหนี้เงินกู้"]
-    
-    lazy_frames = []
-    
-    for file_path in files:
-        file_start = time.time()
-        encoding = detect_encoding(file_path)
-        log_flux(f"Loading {file_path.name} with encoding: {encoding}")
-        
-        header_row_idx = detect_header_row_index(file_path, encoding, required_cols)
-        
-        try:
-            if header_row_idx > 0 or encoding in THAI_ENCODING_CHAIN:
-                df = pd.read_csv(
-                    file_path,
-                    encoding=encoding,
-                    skiprows=header_row_idx,
-                    dtype={"เลขบัญชี": str},
-                    low_memory=False,
-                    on_bad_lines="skip"
-                )
-                
-                available_cols = df.columns.tolist()
-                
-                col_mapping = {}
-                for req_col in required_cols:
-                    if req_col in available_cols:
-                        col_mapping[req_col] = req_col
-                    else:
-                        for avail_col in available_cols:
-                            if req_col in avail_col or avail_col in req_col:
-                                col_mapping[req_col] = avail_col
-                                break
-                
-                if "เลขบัญชี" not in col_mapping:
-                    log_warn(f"Column เลขบัญชี not found in {file_path.name}")
-                    continue
-                
-                df_selected = df[[col_mapping[c] for c in required_cols if c in col_mapping]].copy()
-                df_selected.columns = [c for c in required_cols if c in col_mapping]
-                
-                df_selected["เลขบัญชี"] = df_selected["เลขบัญชี"].astype(str)
-                
-                lf = pl.from_pandas(df_selected).lazy()
-                
-                lazy_frames.append(lf)
-                
-                file_elapsed = time.time() - file_start
-                log_secure(f"Loaded {file_path.name} via pandas ({len(df_selected):,} rows) [{file_elapsed:.2f}s]")
-                
-            else:
-                lf = pl.scan_csv(
-                    file_path,
-                    encoding="utf8",
-                    ignore_errors=True,
-                    null_values=["", "null", "NULL", "N/A", "-"],
-                    infer_schema_length=10000,
-                    low_memory=True,
-                )
-                
-                available_cols = lf.collect_schema().names()
-                
-                col_mapping = {}
-                for req_col in required_cols:
-                    if req_col in available_cols:
-                        col_mapping[req_col] = req_col
-                    else:
-                        for avail_col in available_cols:
-                            if req_col in avail_col or avail_col in req_col:
-                                col_mapping[req_col] = avail_col
-                                break
-                
-                if "เลขบัญชี" not in col_mapping:
-                    log_warn(f"Column เลขบัญชี not found in {file_path.name}")
-                    continue
-                
-                select_exprs = []
-                for req_col in required_cols:
-                    if req_col in col_mapping:
-                        select_exprs.append(pl.col(col_mapping[req_col]).alias(req_col))
-                
-                lf = lf.select(select_exprs)
-                
-                lf = lf.with_columns([
-                    pl.col("เลขบัญชี").cast(pl.Utf8).alias("เลขบัญชี")
-                ])
-                
-                lazy_frames.append(lf)
-                
-                file_elapsed = time.time() - file_start
-                log_flux(f"Prepared {file_path.name} [{file_elapsed:.2f}s]")
-            
-            if progress_callback:
-                progress_callback()
-                
-        except Exception as e:
-            log_warn(f"Failed to load {file_path.name}: {e}")
-            continue
+    lazy_frames = [
+        lf for _, lf in ingest_files("dsl2", files, cache_dir, workers, progress_callback, work_dir)
+    ]
     
     if not lazy_frames:
         raise ValueError("No valid DSL2 files could be loaded")
     
-    combined = pl.concat(lazy_frames)
+    combined = pl.concat(lazy_frames, how="diagonal")
     
     log_secure(f"DSL2 LazyFrame prepared", "load_dsl2")
     
     return combined
 
 
-def load_payment_schedule_polars(folder: Path, progress_callback=None) -> pl.LazyFrame:
+def load_payment_schedule_polars(
+    folder: Path,
+    progress_callback=None,
+    cache_dir: Optional[Path] = None,
+    workers: int = 1,
+    row_col: Optional[str] = None
+) -> pl.LazyFrame:
     """
     Load Payment Schedule files using Polars.
     Payment Schedule: ~5.9M rows
@@ -980,6 +1855,9 @@ def load_payment_schedule_polars(folder: Path, progress_callback=None) -> pl.Laz
     - ACC_NO (Join Key)
     - DUE_PAYMENT_DATE
     - CAPITAL_REMAIN
+    
+    With cache_dir set, unchanged files are served from the Parquet ingest cache.
+    With row_col set, rows carry their stable per-file order (with_file_order).
     """
     start_timer("load_payment_schedule")
     files = discover_files(folder)
@@ -988,110 +1866,119 @@ def load_payment_schedule_polars(folder: Path, progress_callback=None) -> pl.Laz
     
     log_recon(f"Discovered {len(files)} file(s) in Payment Schedule folder")
     
-    required_cols = ["ACC_NO", "DUE_PAYMENT_DATE", "CAPITAL_REMAIN"]
+    lazy_frames = [
+        lf for _, lf in with_file_order(ingest_files("payment_schedule", files, cache_dir, workers, progress_callback), files, row_col)
+    ]
+    
+    if not lazy_frames:
+        raise ValueError("No valid Payment Schedule files could be loaded")
     
-    lazy_frames = []
+    combined = pl.concat(lazy_frames)
     
-    for file_path in files:
-        file_start = time.time()
-        encoding = detect_encoding(file_path)
-        log_flux(f"Loading {file_path.name} with encoding: {encoding}")
-        
+    log_secure(f"Payment Schedule LazyFrame prepared", "load_payment_schedule")
+    
+    return combined
+
+
+# pandas reads into Arrow-backed columns when pyarrow is installed, so the
+# handoff to Polars reuses the Arrow buffers instead of copying object-dtype
+# strings (the Thai text columns dominate peak memory otherwise)
+PANDAS_STRING_DTYPE = "string[pyarrow]" if PYARROW_AVAILABLE else str
+PANDAS_READ_OPTIONS = {"dtype_backend": "pyarrow"} if PYARROW_AVAILABLE else {}
+
+
+def pandas_to_polars(df: pd.DataFrame) -> pl.DataFrame:
+    """Hand a pandas frame to Polars; Arrow-backed columns are taken over without a copy."""
+    return pl.from_pandas(df, rechunk=False)
+
+
+def read_dsl1_file_pandas(file_path: Path) -> Optional[pd.DataFrame]:
+    """Read a single DSL1 file with pandas, walking the encoding chain."""
+    file_start = time.time()
+    encoding = detect_encoding(file_path)
+    
+    for enc in [encoding] + ENCODING_CHAIN:
         try:
-            polars_encoding = "utf8" if encoding in ["utf-8", "utf-8-sig"] else "utf8"
-            
-            lf = pl.scan_csv(
+            df = pd.read_csv(
                 file_path,
-                encoding=polars_encoding,
-                ignore_errors=True,
-                null_values=["", "null", "NULL", "N/A", "-"],
-                infer_schema_length=10000,
+                encoding=enc,
+                usecols=lambda c: c in DSL1_REQUIRED_COLS,
+                dtype={"ACC_NO": PANDAS_STRING_DTYPE},
                 low_memory=True,
+                on_bad_lines="skip",
+                **PANDAS_READ_OPTIONS
             )
-            
-            available_cols = lf.collect_schema().names()
-            select_cols = [c for c in required_cols if c in available_cols]
-            
-            if "ACC_NO" not in select_cols:
-                log_fatal(f"Critical column ACC_NO missing in {file_path.name}")
-                continue
-            
-            lf = lf.select(select_cols)
-            
-            lf = lf.with_columns([
-                pl.col("ACC_NO").cast(pl.Utf8).alias("ACC_NO")
-            ])
-            
-            lazy_frames.append(lf)
-            
             file_elapsed = time.time() - file_start
-            log_flux(f"Prepared {file_path.name} [{file_elapsed:.2f}s]")
-            
-            if progress_callback:
-                progress_callback()
-                
-        except Exception as e:
-            log_warn(f"Polars failed for {file_path.name}: {e}")
-            # Try pandas fallback
-            try:
-                df = pd.read_csv(
-                    file_path,
-                    encoding=encoding,
-                    dtype={"ACC_NO": str},
-                    low_memory=True,
-                    on_bad_lines="skip"
-                )
-                
-                available = [c for c in required_cols if c in df.columns]
-                if "ACC_NO" in available:
-                    df = df[available].copy()
-                    df["ACC_NO"] = df["ACC_NO"].astype(str)
-                    lf = pl.from_pandas(df).lazy()
-                    lazy_frames.append(lf)
-                    log_secure(f"Loaded {file_path.name} via pandas fallback")
-            except Exception as e2:
-                log_warn(f"Both Polars and Pandas failed for {file_path.name}: {e2}")
-                continue
+            log_secure(f"Loaded {file_path.name} with pandas ({enc}) [{file_elapsed:.2f}s]")
+            return df
+        except Exception:
+            continue
     
-    if not lazy_frames:
-        raise ValueError("No valid Payment Schedule files could be loaded")
+    return None
+
+
+def read_dsl2_file_pandas(file_path: Path) -> Optional[pd.DataFrame]:
+    """Read a single DSL2 file with pandas, walking the Thai encoding chain."""
+    file_start = time.time()
+    encoding = detect_encoding(file_path)
     
-    combined = pl.concat(lazy_frames)
+    header_row_idx = detect_header_row_index(file_path, encoding, DSL2_REQUIRED_COLS)
     
-    log_secure(f"Payment Schedule LazyFrame prepared", "load_payment_schedule")
+    for enc in THAI_ENCODING_CHAIN:
+        try:
+            df = pd.read_csv(
+                file_path,
+                encoding=enc,
+                skiprows=header_row_idx,
+                dtype={"เลขบัญชี": PANDAS_STRING_DTYPE},
+                low_memory=True,
+                on_bad_lines="skip",
+                **PANDAS_READ_OPTIONS
+            )
+            
+            available = [c for c in DSL2_REQUIRED_COLS if c in df.columns]
+            if "เลขบัญชี" in available:
+                df = df[available]
+                file_elapsed = time.time() - file_start
+                log_secure(f"Loaded {file_path.name} with pandas ({enc}, {len(df):,} rows) [{file_elapsed:.2f}s]")
+                return df
+        except Exception:
+            continue
     
-    return combined
+    return None
 
 
-def load_dsl1_pandas_fallback(folder: Path) -> pd.DataFrame:
+def read_payment_schedule_file_pandas(file_path: Path) -> Optional[pd.DataFrame]:
+    """Read a single Payment Schedule file with pandas, walking the encoding chain."""
+    file_start = time.time()
+    encoding = detect_encoding(file_path)
+    
+    for enc in [encoding] + ENCODING_CHAIN:
+        try:
+            df = pd.read_csv(
+                file_path,
+                encoding=enc,
+                usecols=lambda c: c in PS_REQUIRED_COLS,
+                dtype={"ACC_NO": PANDAS_STRING_DTYPE},
+                low_memory=True,
+                on_bad_lines="skip",
+                **PANDAS_READ_OPTIONS
+            )
+            file_elapsed = time.time() - file_start
+            log_secure(f"Loaded {file_path.name} with pandas ({enc}) [{file_elapsed:.2f}s]")
+            return df
+        except Exception:
+            continue
+    
+    return None
+
+
+def load_dsl1_pandas_fallback(folder: Path, workers: int = 1) -> pd.DataFrame:
     """Pandas fallback for DSL1 when Polars fails."""
     start_timer("load_dsl1_pandas")
     
     files = discover_files(folder)
-    dfs = []
-    
-    required_cols = ["ACC_NO", "GROUP_FLAG", "FIRST_PAYMENT_DATE", "PRE_BALANCE", "EXACT_PRE_BALANCE"]
-    
-    for file_path in files:
-        file_start = time.time()
-        encoding = detect_encoding(file_path)
-        
-        for enc in [encoding] + ENCODING_CHAIN:
-            try:
-                df = pd.read_csv(
-                    file_path,
-                    encoding=enc,
-                    usecols=lambda c: c in required_cols,
-                    dtype={"ACC_NO": str},
-                    low_memory=True,
-                    on_bad_lines="skip"
-                )
-                dfs.append(df)
-                file_elapsed = time.time() - file_start
-                log_secure(f"Loaded {file_path.name} with pandas ({enc}) [{file_elapsed:.2f}s]")
-                break
-            except Exception:
-                continue
+    dfs = [df for df in run_file_tasks(read_dsl1_file_pandas, files, workers) if df is not None]
     
     if not dfs:
         raise ValueError("No valid DSL1 files could be loaded with pandas")
@@ -1102,41 +1989,12 @@ def load_dsl1_pandas_fallback(folder: Path) -> pd.DataFrame:
     return result
 
 
-def load_dsl2_pandas_fallback(folder: Path) -> pd.DataFrame:
+def load_dsl2_pandas_fallback(folder: Path, workers: int = 1) -> pd.DataFrame:
     """Pandas fallback for DSL2 with Thai encoding handling."""
     start_timer("load_dsl2_pandas")
     
     files = discover_files(folder)
-    dfs = []
-    
-    required_cols = ["เลขบัญชี", "วันที่เริ่มชำระหนี้", "ยอดหนี้เงินกู้"]
-    
-    for file_path in files:
-        file_start = time.time()
-        encoding = detect_encoding(file_path)
-        
-        header_row_idx = detect_header_row_index(file_path, encoding, required_cols)
-        
-        for enc in THAI_ENCODING_CHAIN:
-            try:
-                df = pd.read_csv(
-                    file_path,
-                    encoding=enc,
-                    skiprows=header_row_idx,
-                    dtype={"เลขบัญชี": str},
-                    low_memory=True,
-                    on_bad_lines="skip"
-                )
-                
-                available = [c for c in required_cols if c in df.columns]
-                if "เลขบัญชี" in available:
-                    df = df[available].copy()
-                    dfs.append(df)
-                    file_elapsed = time.time() - file_start
-                    log_secure(f"Loaded {file_path.name} with pandas ({enc}, {len(df):,} rows) [{file_elapsed:.2f}s]")
-                    break
-            except Exception:
-                continue
+    dfs = [df for df in run_file_tasks(read_dsl2_file_pandas, files, workers) if df is not None]
     
     if not dfs:
         raise ValueError("No valid DSL2 files could be loaded with pandas")
@@ -1147,35 +2005,12 @@ def load_dsl2_pandas_fallback(folder: Path) -> pd.DataFrame:
     return result
 
 
-def load_payment_schedule_pandas_fallback(folder: Path) -> pd.DataFrame:
+def load_payment_schedule_pandas_fallback(folder: Path, workers: int = 1) -> pd.DataFrame:
     """Pandas fallback for Payment Schedule."""
     start_timer("load_ps_pandas")
     
     files = discover_files(folder)
-    dfs = []
-    
-    required_cols = ["ACC_NO", "DUE_PAYMENT_DATE", "CAPITAL_REMAIN"]
-    
-    for file_path in files:
-        file_start = time.time()
-        encoding = detect_encoding(file_path)
-        
-        for enc in [encoding] + ENCODING_CHAIN:
-            try:
-                df = pd.read_csv(
-                    file_path,
-                    encoding=enc,
-                    usecols=lambda c: c in required_cols,
-                    dtype={"ACC_NO": str},
-                    low_memory=True,
-                    on_bad_lines="skip"
-                )
-                dfs.append(df)
-                file_elapsed = time.time() - file_start
-                log_secure(f"Loaded {file_path.name} with pandas ({enc}) [{file_elapsed:.2f}s]")
-                break
-            except Exception:
-                continue
+    dfs = [df for df in run_file_tasks(read_payment_schedule_file_pandas, files, workers) if df is not None]
     
     if not dfs:
         raise ValueError("No valid Payment Schedule files could be loaded with pandas")
@@ -1198,7 +2033,7 @@ class ReconciliationResult:
         self.total_dsl1_filtered_rows: int = 0  # After GROUP_FLAG = 1 filter
         self.total_dsl2_rows: int = 0
         self.matched_rows: int = 0
-        self.unmatched_dsl1: int = 0
+        self.unmatched_dsl1: int = 0  # Distinct accounts, as listed in UNMATCHED_DSL1_FILE
         self.unmatched_dsl2: int = 0
         
         # Discrepancy counts
@@ -1213,7 +2048,7 @@ class ReconciliationResult:
         
         # แยกหนี้ (Debt Separation) detection
         self.debt_separation_cases: int = 0
-        self.debt_separation_records: List[Dict] = []
+        self.debt_separation_records: pl.DataFrame = pl.DataFrame()
         
         # Error margin statistics
         self.balance_errors: np.ndarray = np.array([])
@@ -1221,8 +2056,14 @@ class ReconciliationResult:
         self.exact_vs_dsl2_errors: np.ndarray = np.array([])
         self.exact_vs_pre_errors: np.ndarray = np.array([])
         
+        # Summary statistics from the fused aggregation (None: no error values)
+        self.error_stats: Dict[str, Optional[Dict[str, float]]] = {}
+        
         # Detailed error records
-        self.error_records: List[Dict] = []
+        self.error_records: pl.DataFrame = pl.DataFrame()
+        
+        # Source row order of each record sample (used to merge partitions)
+        self.record_order: Dict[str, pl.DataFrame] = {}
         
         # Timing
         self.start_time: float = 0
@@ -1249,6 +2090,8 @@ class ReconciliationResult:
     
     @property
     def balance_error_stats(self) -> Dict[str, float]:
+        if self.error_stats.get("balance"):
+            return self.error_stats["balance"]
         if self.balance_errors.size == 0:
             return {"mean": 0, "median": 0, "std": 0, "min": 0, "max": 0, "p95": 0, "p99": 0}
         
@@ -1265,6 +2108,8 @@ class ReconciliationResult:
     
     @property
     def date_diff_stats(self) -> Dict[str, float]:
+        if self.error_stats.get("date_diff"):
+            return self.error_stats["date_diff"]
         if self.date_diff_days.size == 0:
             return {"mean": 0, "median": 0, "std": 0, "min": 0, "max": 0}
         
@@ -1314,7 +2159,7 @@ class PaymentScheduleResult:
         self.total_ps_rows: int = 0
         self.total_dsl2_rows: int = 0
         self.matched_rows: int = 0
-        self.unmatched_ps: int = 0
+        self.unmatched_ps: int = 0  # Distinct accounts, as listed in UNMATCHED_PS_FILE
         self.unmatched_dsl2: int = 0
         
         # Discrepancy counts
@@ -1327,8 +2172,17 @@ class PaymentScheduleResult:
         self.balance_errors: np.ndarray = np.array([])
         self.date_diff_days: np.ndarray = np.array([])
         
+        # Summary statistics from the fused aggregation (None: no error values)
+        self.error_stats: Dict[str, Optional[Dict[str, float]]] = {}
+        
         # Detailed error records
-        self.error_records: List[Dict] = []
+        self.error_records: pl.DataFrame = pl.DataFrame()
+        
+        # Source row order of each record sample (used to merge partitions)
+        self.record_order: Dict[str, pl.DataFrame] = {}
+        
+        # Installments compared per DSL2 row (see PS_MATCH_MODES)
+        self.match_mode: str = "all"
         
         # Timing
         self.start_time: float = 0
@@ -1348,6 +2202,8 @@ class PaymentScheduleResult:
     
     @property
     def balance_error_stats(self) -> Dict[str, float]:
+        if self.error_stats.get("balance"):
+            return self.error_stats["balance"]
         if self.balance_errors.size == 0:
             return {"mean": 0, "median": 0, "std": 0, "min": 0, "max": 0, "p95": 0, "p99": 0}
         
@@ -1368,6 +2224,7 @@ class PaymentScheduleResult:
     
     def to_dict(self) -> Dict[str, Any]:
         return {
+            "match_mode": self.match_mode,
             "total_ps_rows": self.total_ps_rows,
             "total_dsl2_rows": self.total_dsl2_rows,
             "matched_rows": self.matched_rows,
@@ -1400,7 +2257,7 @@ class ThreeWayReconciliationResult:
         
         # Perfect matches (all dates and balances match across all three)
         self.perfect_matches: int = 0
-        self.perfect_match_records: List[Dict] = []
+        self.perfect_match_records: pl.DataFrame = pl.DataFrame()
         
         # Discrepancy counts
         self.date_mismatches: int = 0
@@ -1408,7 +2265,10 @@ class ThreeWayReconciliationResult:
         self.both_mismatches: int = 0
         
         # Detailed records
-        self.discrepancy_records: List[Dict] = []
+        self.discrepancy_records: pl.DataFrame = pl.DataFrame()
+        
+        # Source row order of each record sample (used to merge partitions)
+        self.record_order: Dict[str, pl.DataFrame] = {}
         
         # Timing
         self.start_time: float = 0
@@ -1463,9 +2323,10 @@ class CombinedReconciliationResult:
         self.dsl2_preprocessing: DSL2PreProcessingResult = DSL2PreProcessingResult()
         self.generated_at: str = datetime.now().isoformat()
         self.version: str = "4.0.0"
+        self.incremental: Optional[Dict[str, Any]] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        stats = {
             "version": self.version,
             "generated_at": self.generated_at,
             "dsl2_preprocessing": self.dsl2_preprocessing.to_dict(),
@@ -1473,24 +2334,281 @@ class CombinedReconciliationResult:
             "ps_vs_dsl2": self.ps_vs_dsl2.to_dict(),
             "three_way": self.three_way.to_dict(),
         }
+        if self.incremental is not None:
+            stats["incremental"] = self.incremental
+        return stats
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 # RECONCILIATION ENGINE
 # ══════════════════════════════════════════════════════════════════════════════
 
+def dates_in_range_expr(*date_cols: str) -> pl.Expr:
+    """True when every date is present with a year in 1900-2100 (rejects entry errors like 2336)."""
+    return pl.all_horizontal([
+        pl.col(c).dt.year().is_between(1900, 2100).fill_null(False) for c in date_cols
+    ])
+
+
+def date_diff_days_expr(valid: pl.Expr, later_col: str, earlier_col: str) -> pl.Expr:
+    """Absolute day difference between two Date columns, 0 where the dates are not valid."""
+    diff = (pl.col(later_col) - pl.col(earlier_col)).dt.total_days().abs()
+    return pl.when(valid).then(diff).otherwise(0)
+
+
+# Source row-order columns, added when sources are hash-partitioned (by the
+# loaders already for incremental runs, see with_file_order)
+ROW_DSL1_COL = "_ROW_DSL1"
+ROW_DSL2_COL = "_ROW_DSL2"
+ROW_PS_COL = "_ROW_PS"
+
+
+def present_order_cols(lf: pl.LazyFrame, order_cols: List[str]) -> List[str]:
+    """order_cols when the plan carries all of them (partitioned runs), else []."""
+    schema = lf.collect_schema()
+    return order_cols if all(c in schema for c in order_cols) else []
+
+
+def with_row_order(lf: pl.LazyFrame, row_col: str) -> pl.LazyFrame:
+    """lf with its source row-order column, numbering the rows if it is not there yet."""
+    return lf if row_col in lf.collect_schema() else lf.with_row_index(row_col)
+
+
+def record_sample(
+    lf: pl.LazyFrame,
+    record_exprs: List[pl.Expr],
+    order_cols: List[str],
+    n: int
+) -> pl.LazyFrame:
+    """
+    First n rows formatted as detailed records (plus the row-order columns of
+    partitioned runs). Formatting runs inside the plan, so only the capped
+    sample is materialized and no per-row Python is involved.
+    """
+    return lf.head(n).select([*order_cols, *record_exprs])
+
+
+def store_records(result: Any, name: str, sample: pl.DataFrame, order_cols: List[str]) -> None:
+    """Store a record sample on result.<name>, keeping its row order in result.record_order."""
+    setattr(result, name, sample.drop(order_cols))
+    if order_cols:
+        result.record_order[name] = sample.select(order_cols)
+
+
+# Reports listing the accounts missing from DSL2
+UNMATCHED_DSL1_FILE = "unmatched_dsl1_accounts.csv"
+UNMATCHED_PS_FILE = "unmatched_ps_accounts.csv"
+
+
+def unmatched_accounts(
+    lf: Union[pl.DataFrame, pl.LazyFrame],
+    other: Union[pl.DataFrame, pl.LazyFrame],
+    join_key: str,
+    row_col: str
+) -> pl.LazyFrame:
+    """
+    Rows of lf whose account key never occurs in other: a key-only anti-join
+    carrying just the raw ACC_NO (and the row-order column when partitioned).
+    """
+    lf = lf.lazy()
+    keep = [join_key, "ACC_NO", *present_order_cols(lf, [row_col])]
+    return lf.select(keep).join(other.lazy().select(join_key), on=join_key, how="anti")
+
+
+def sink_account_list(unmatched: pl.LazyFrame, join_key: str, path: Path) -> pl.LazyFrame:
+    """
+    Lazy sink of the distinct accounts in unmatched, in source order, so the
+    full list never has to fit in memory: Parquet for partition
+    intermediates, UTF-8-SIG CSV for reports.
+    """
+    accounts = unmatched.unique(subset=join_key, keep="first", maintain_order=True).drop(join_key)
+    if path.suffix == ".parquet":
+        return accounts.sink_parquet(path, lazy=True)
+    return accounts.sink_csv(path, include_bom=True, lazy=True)
+
+
+# Keys each two-way stage matched, with every source's row count per key
+# (intersected by the three-way stage instead of re-scanning the sources)
+MATCHED_KEYS_FILES = {
+    "dsl1_vs_dsl2": "matched_keys_dsl1_dsl2.parquet",
+    "ps_vs_dsl2": "matched_keys_ps_dsl2.parquet",
+}
+
+
+def sink_matched_keys(
+    left: Union[pl.DataFrame, pl.LazyFrame],
+    right: Union[pl.DataFrame, pl.LazyFrame],
+    join_key: str,
+    left_rows: str,
+    path: Path
+) -> pl.LazyFrame:
+    """
+    Lazy Parquet sink of the keys present in both sources, with the rows
+    each side holds per key (left_rows, ROWS_DSL2 for the DSL2 side).
+    """
+    def key_rows(lf: Union[pl.DataFrame, pl.LazyFrame], name: str) -> pl.LazyFrame:
+        return lf.lazy().group_by(join_key).agg(pl.len().alias(name))
+    
+    return key_rows(left, left_rows).join(key_rows(right, "ROWS_DSL2"), on=join_key, how="inner").sink_parquet(path, lazy=True)
+
+
+def read_matched_keys(paths: Optional[Tuple[Path, Path]], join_key: str) -> Optional[pl.DataFrame]:
+    """
+    Keys matched by both two-way stages (DSL1 vs DSL2, PS vs DSL2), with
+    ROWS_DSL1, ROWS_DSL2 and ROWS_PS per key. None when a file is missing
+    or was keyed on another column.
+    """
+    if not paths or not all(path.exists() for path in paths):
+        return None
+    dsl1_keys, ps_keys = (pl.scan_parquet(path) for path in paths)
+    if any(join_key not in lf.collect_schema() for lf in (dsl1_keys, ps_keys)):
+        return None
+    return dsl1_keys.join(ps_keys.drop("ROWS_DSL2"), on=join_key, how="inner").collect()
+
+
+# Uncapped per-account outcomes of each comparison (the input of the diff mode)
+ACCOUNT_OUTCOME_FILES = {
+    "dsl1_vs_dsl2": "account_outcomes_dsl1_dsl2.parquet",
+    "ps_vs_dsl2": "account_outcomes_ps_dsl2.parquet",
+    "three_way": "account_outcomes_three_way.parquet",
+}
+
+
+def outcome_status_expr() -> pl.Expr:
+    """Account status from its mismatch counts: perfect, date, balance or both."""
+    date_bad, bal_bad = pl.col("DATE_MISMATCHES") > 0, pl.col("BALANCE_MISMATCHES") > 0
+    return (
+        pl.when(date_bad & bal_bad).then(pl.lit("both"))
+        .when(date_bad).then(pl.lit("date"))
+        .when(bal_bad).then(pl.lit("balance"))
+        .otherwise(pl.lit("perfect"))
+        .alias("STATUS")
+    )
+
+
+def account_outcomes(
+    matched: pl.LazyFrame,
+    acc_col: str,
+    date_ok: pl.Expr,
+    bal_ok: pl.Expr,
+    bal_diff: Optional[pl.Expr] = None
+) -> pl.LazyFrame:
+    """
+    One row per account of the matched rows: its row count, the rows that
+    disagree on date / balance, the largest absolute balance difference and
+    the resulting status. Unlike the record samples this is not capped; it
+    is sorted by account key so two runs can be diffed by key (diff_runs).
+    """
+    max_diff = bal_diff.abs().max() if bal_diff is not None else pl.lit(None, dtype=pl.Float64)
+    return (
+        matched
+        .group_by(ACC_KEY_COL)
+        .agg([
+            pl.col(acc_col).cast(pl.Utf8).min().alias("ACC_NO"),
+            pl.len().cast(pl.Int64).alias("ROWS"),
+            (~date_ok).sum().cast(pl.Int64).alias("DATE_MISMATCHES"),
+            (~bal_ok).sum().cast(pl.Int64).alias("BALANCE_MISMATCHES"),
+            max_diff.alias("MAX_ABS_BAL_DIFF"),
+        ])
+        .with_columns(outcome_status_expr())
+        .sort(ACC_KEY_COL)
+    )
+
+
+def iso_date_expr(date_col: str) -> pl.Expr:
+    """Date column as YYYY-MM-DD text (Nexus Protocol), empty when missing."""
+    return pl.col(date_col).dt.strftime("%Y-%m-%d").fill_null("")
+
+
+def dsl2_raw_date_expr() -> pl.Expr:
+    """DSL2 start date as written in the source; missing renders as 'nan' as in earlier reports."""
+    return pl.col("วันที่เริ่มชำระหนี้").cast(pl.Utf8).fill_null("nan").alias("DATE_DSL2")
+
+
+def balance_diff_pct_expr(diff_col: str, base_col: str, other_col: str) -> pl.Expr:
+    """|diff| as a percentage of |base|; 100 when only the base is zero, 0 when both are."""
+    return (
+        pl.when(pl.col(base_col) != 0)
+        .then(pl.col(diff_col).abs() / pl.col(base_col).abs() * 100)
+        .when(pl.col(other_col) != 0)
+        .then(100.0)
+        .otherwise(0.0)
+    )
+
+
+def match_category_exprs(date_ok: pl.Expr, bal_ok: pl.Expr, scope: Optional[pl.Expr] = None) -> List[pl.Expr]:
+    """Counts of the four date/balance match categories among rows in scope (default: all rows)."""
+    if scope is None:
+        scope = pl.lit(True)
+    return [
+        (scope & ~date_ok & bal_ok).sum().alias("date_only"),
+        (scope & date_ok & ~bal_ok).sum().alias("bal_only"),
+        (scope & ~date_ok & ~bal_ok).sum().alias("both"),
+        (scope & date_ok & bal_ok).sum().alias("perfect"),
+    ]
+
+
+def error_stats_exprs(values: pl.Expr, name: str, percentiles: bool = True) -> List[pl.Expr]:
+    """
+    The error values (as one list) and their summary statistics, computed in
+    the same aggregation as the counts. Matches the numpy fallback of the
+    result containers (population std, linear percentiles).
+    """
+    exprs = [
+        values.implode().alias(name),
+        values.mean().alias(f"{name}_mean"),
+        values.median().alias(f"{name}_median"),
+        values.std(ddof=0).alias(f"{name}_std"),
+        values.min().alias(f"{name}_min"),
+        values.max().alias(f"{name}_max"),
+    ]
+    if percentiles:
+        exprs += [
+            values.quantile(0.95, interpolation="linear").alias(f"{name}_p95"),
+            values.quantile(0.99, interpolation="linear").alias(f"{name}_p99"),
+        ]
+    return exprs
+
+
+def read_error_stats(summary: pl.DataFrame, name: str) -> Tuple[np.ndarray, Optional[Dict[str, float]]]:
+    """Unpack one error_stats_exprs() group: (values, stats or None when there are no values)."""
+    values = summary[name].explode().drop_nulls().to_numpy()
+    if values.size == 0:
+        return values, None
+    prefix = f"{name}_"
+    stats = {
+        col[len(prefix):]: float(summary[col].item())
+        for col in summary.columns
+        if col.startswith(prefix)
+    }
+    return values, stats
+
+
 def reconcile_dsl1_vs_dsl2(
     dsl1_data: pl.DataFrame,
     dsl2_data: pl.DataFrame,
     balance_tolerance: float = 0.01,
     max_error_records: int = 100000,
     progress: Progress = None,
-    task_id = None
+    task_id = None,
+    dsl1_prefiltered: bool = False,
+    dsl1_total_rows: Optional[int] = None,
+    streaming: bool = False,
+    unmatched_path: Optional[Path] = None,
+    outcomes_path: Optional[Path] = None,
+    matched_keys_path: Optional[Path] = None
 ) -> ReconciliationResult:
     """
     Perform vectorized reconciliation between DSL1 and DSL2 datasets.
     
     IMPORTANT: Only ACC_NO with GROUP_FLAG = 1 are included from DSL1.
+    Pass dsl1_prefiltered=True (with dsl1_total_rows) when dsl1_data comes from
+    collect_dsl1_filtered() so the filter is not re-applied. With streaming=True
+    the inputs may be LazyFrames and the plan runs on Polars' streaming engine.
+    DSL1 accounts missing from DSL2 are counted, and listed in unmatched_path
+    when one is given; outcomes_path receives the per-account outcomes
+    (account_outcomes) and matched_keys_path the matched keys for the
+    three-way stage (sink_matched_keys).
     
     Comparison Logic:
     - Join on ACC_NO = เลขบัญชี (WHERE GROUP_FLAG = 1)
@@ -1506,8 +2624,8 @@ def reconcile_dsl1_vs_dsl2(
     log_flux("Starting DSL1 vs DSL2 vectorized reconciliation...")
     
     # Record original row counts
-    result.total_dsl1_rows = len(dsl1_data)
-    result.total_dsl2_rows = len(dsl2_data)
+    result.total_dsl1_rows = dsl1_total_rows if dsl1_total_rows is not None else frame_height(dsl1_data, streaming)
+    result.total_dsl2_rows = frame_height(dsl2_data, streaming)
     
     log_info(f"DSL1 total rows (before filter): {result.total_dsl1_rows:,}")
     log_info(f"DSL2 rows: {result.total_dsl2_rows:,}")
@@ -1521,213 +2639,187 @@ def reconcile_dsl1_vs_dsl2(
         if progress and task_id:
             progress.update(task_id, completed=int(current_step / total_steps * 100))
     
-    # Filter DSL1 by GROUP_FLAG = 1
-    start_timer("filter_group_flag")
-    log_flux("Filtering DSL1 by GROUP_FLAG = 1...")
-    
-    if "GROUP_FLAG" in dsl1_data.columns:
-        # Convert GROUP_FLAG to numeric for comparison
-        dsl1_filtered = dsl1_data.filter(
-            (pl.col("GROUP_FLAG").cast(pl.Int64, strict=False) == 1) |
-            (pl.col("GROUP_FLAG").cast(pl.Utf8) == "1")
-        )
-        result.total_dsl1_filtered_rows = len(dsl1_filtered)
-        log_secure(f"DSL1 filtered to {result.total_dsl1_filtered_rows:,} rows (GROUP_FLAG = 1)", "filter_group_flag")
-    else:
-        log_warn("GROUP_FLAG column not found, using all DSL1 records")
+    # Filter DSL1 by GROUP_FLAG = 1 (unless already pushed into the scan)
+    if dsl1_prefiltered:
         dsl1_filtered = dsl1_data
-        result.total_dsl1_filtered_rows = len(dsl1_filtered)
+    else:
+        start_timer("filter_group_flag")
+        log_flux("Filtering DSL1 by GROUP_FLAG = 1...")
+        dsl1_filtered = filter_group_flag(dsl1_data.lazy())
+        if not streaming:
+            dsl1_filtered = dsl1_filtered.collect()
+            log_secure(f"DSL1 filtered to {len(dsl1_filtered):,} rows (GROUP_FLAG = 1)", "filter_group_flag")
+    
+    result.total_dsl1_filtered_rows = frame_height(dsl1_filtered, streaming)
     
     update_progress()
     
-    # Normalize account numbers for joining
+    # Normalized account keys (precomputed at load; only added here if missing)
     start_timer("normalize")
-    log_flux("Normalizing account numbers...")
     
-    dsl1_normalized = dsl1_filtered.with_columns([
-        pl.col("ACC_NO").str.strip_chars().str.replace_all(r"^0+", "").alias("ACC_NO_NORM")
-    ])
-    
-    dsl2_normalized = dsl2_data.with_columns([
-        pl.col("เลขบัญชี").str.strip_chars().str.replace_all(r"^0+", "").alias("ACC_NO_NORM")
-    ])
+    dsl1_normalized = ensure_dsl1_dates(ensure_account_key(dsl1_filtered, "ACC_NO"))
+    dsl1_normalized = ensure_balances(dsl1_normalized, DSL1_BALANCE_COLS)
+    dsl2_normalized = ensure_dsl2_dates(ensure_account_key(dsl2_data, "เลขบัญชี"))
+    dsl2_normalized = ensure_balances(dsl2_normalized, DSL2_BALANCE_COLS)
     
-    log_info("Account numbers normalized", "normalize")
+    log_info("Account keys ready", "normalize")
     update_progress()
     
-    # Perform left join (DSL2 as base)
+    # Build the lazy plan: left join (DSL2 as base) -> comparisons -> counts and samples
     start_timer("join")
-    log_flux("Performing join operation...")
+    log_flux("Building join and comparison plan...")
     
-    joined = dsl2_normalized.join(
-        dsl1_normalized,
-        on="ACC_NO_NORM",
+    join_key = join_key_for(dsl2_normalized, dsl1_normalized)
+    joined = dsl2_normalized.lazy().join(
+        dsl1_normalized.lazy(),
+        on=join_key,
         how="left",
-        suffix="_dsl1"
+        suffix="_dsl1",
+        maintain_order="left_right"
+    )
+    
+    # EXACT_PRE_BALANCE falls back to PRE_BALANCE when the column is absent
+    exact_bal = pl.col("EXACT_BAL") if "EXACT_BAL" in dsl1_normalized.collect_schema() else pl.col("BAL_DSL1")
+    valid_dates = pl.col("DATE_DSL1").is_not_null() & pl.col("DATE_DSL2").is_not_null()
+    
+    # Comparison columns over every joined row; unmatched rows drop out of
+    # the aggregation through in_matched and out of the samples by filter
+    in_matched = pl.col("ACC_NO").is_not_null()
+    compared = (
+        joined
+        .with_columns(exact_bal.alias("EXACT_BAL"))
+        .with_columns([
+            valid_dates.alias("DATES_VALID"),
+            (valid_dates & (pl.col("DATE_DSL1") == pl.col("DATE_DSL2"))).fill_null(False).alias("DATE_MATCH"),
+            date_diff_days_expr(valid_dates, "DATE_DSL2", "DATE_DSL1").alias("DATE_DIFF_DAYS"),
+            (pl.col("BAL_DSL2") - pl.col("BAL_DSL1")).alias("BAL_DIFF"),
+            (pl.col("BAL_DSL2") - pl.col("EXACT_BAL")).alias("EXACT_VS_DSL2_DIFF"),
+            (pl.col("BAL_DSL1") - pl.col("EXACT_BAL")).alias("EXACT_VS_PRE_DIFF"),
+            # แยกหนี้ Detection: PRE_BALANCE < EXACT_PRE_BALANCE
+            (pl.col("BAL_DSL1") < pl.col("EXACT_BAL")).alias("IS_DEBT_SEPARATION"),
+        ])
+        .with_columns([
+            balance_diff_pct_expr("BAL_DIFF", "BAL_DSL1", "BAL_DSL2").alias("BAL_DIFF_PCT"),
+            (pl.col("BAL_DIFF").abs() <= balance_tolerance).alias("BAL_MATCH"),
+            (pl.col("EXACT_VS_DSL2_DIFF").abs() <= balance_tolerance).alias("EXACT_VS_DSL2_MATCH"),
+            (pl.col("EXACT_VS_PRE_DIFF").abs() <= balance_tolerance).alias("EXACT_VS_PRE_MATCH"),
+        ])
     )
+    matched = compared.filter(in_matched)
+    
+    date_ok, bal_ok = pl.col("DATE_MATCH"), pl.col("BAL_MATCH")
+    is_error = ~date_ok | ~bal_ok
+    in_errors = in_matched & is_error
     
-    log_info("Join operation complete", "join")
+    log_info("Plan ready", "join")
     update_progress()
     
-    result.matched_rows = joined.filter(pl.col("ACC_NO").is_not_null()).height
-    result.unmatched_dsl2 = joined.filter(pl.col("ACC_NO").is_null()).height
+    # Execute every output of the plan together so the join runs once
+    start_timer("calc_discrepancies")
+    log_flux(f"Executing join, fused discrepancy aggregation and error samples (max {max_error_records:,})...")
+    
+    error_record = [
+        pl.col("เลขบัญชี").cast(pl.Utf8).alias("ACC_NO"),
+        iso_date_expr("DATE_DSL1").alias("DATE_DSL1"),
+        dsl2_raw_date_expr(),
+        pl.col("DATE_MATCH"),
+        pl.col("DATE_DIFF_DAYS").cast(pl.Int64),
+        pl.col("BAL_DSL1"),
+        pl.col("BAL_DSL2"),
+        pl.col("BAL_MATCH"),
+        pl.col("BAL_DIFF"),
+        pl.col("BAL_DIFF_PCT").round(4),
+        pl.col("EXACT_BAL"),
+        pl.col("EXACT_VS_DSL2_DIFF"),
+        pl.col("EXACT_VS_PRE_DIFF"),
+        pl.col("IS_DEBT_SEPARATION"),
+    ]
+    debt_record = [
+        pl.col("เลขบัญชี").cast(pl.Utf8).alias("ACC_NO"),
+        pl.col("BAL_DSL1").alias("PRE_BALANCE"),
+        pl.col("EXACT_BAL").alias("EXACT_PRE_BALANCE"),
+        pl.col("EXACT_VS_PRE_DIFF").alias("DIFFERENCE"),
+        pl.col("BAL_DSL2").alias("DSL2_BALANCE"),
+        pl.lit("แยกหนี้ - PRE_BALANCE < EXACT_PRE_BALANCE").alias("REMARK"),
+    ]
+    order_cols = present_order_cols(matched, [ROW_DSL2_COL, ROW_DSL1_COL])
+    
+    # DSL1 (GROUP_FLAG = 1) accounts with no DSL2 row, and the uncapped per-account outcomes
+    unmatched = unmatched_accounts(dsl1_normalized, dsl2_normalized, join_key, ROW_DSL1_COL)
+    report_sinks = [sink_account_list(unmatched, join_key, unmatched_path)] if unmatched_path else []
+    if outcomes_path:
+        report_sinks.append(
+            account_outcomes(matched, "เลขบัญชี", date_ok, bal_ok, pl.col("BAL_DIFF")).sink_parquet(outcomes_path, lazy=True)
+        )
+    if matched_keys_path:
+        report_sinks.append(sink_matched_keys(dsl1_normalized, dsl2_normalized, join_key, "ROWS_DSL1", matched_keys_path))
+    
+    # One aggregation over the joined rows: every count, error array and statistic
+    summary, error_sample, debt_sample, unmatched_count, *_ = pl.collect_all([
+        compared.select([
+            in_matched.sum().alias("matched"),
+            (~in_matched).sum().alias("unmatched"),
+            *match_category_exprs(date_ok, bal_ok, in_matched),
+            (in_matched & ~pl.col("EXACT_VS_DSL2_MATCH")).sum().alias("exact_vs_dsl2"),
+            (in_matched & ~pl.col("EXACT_VS_PRE_MATCH")).sum().alias("exact_vs_pre"),
+            (in_matched & pl.col("IS_DEBT_SEPARATION")).sum().alias("debt_separation"),
+            *error_stats_exprs(pl.col("BAL_DIFF").filter(in_errors), "balance_errors"),
+            *error_stats_exprs(
+                pl.col("DATE_DIFF_DAYS").filter(in_errors & pl.col("DATES_VALID")), "date_diff_days", percentiles=False
+            ),
+            pl.col("EXACT_VS_DSL2_DIFF").filter(in_matched & ~pl.col("EXACT_VS_DSL2_MATCH")).implode(),
+            pl.col("EXACT_VS_PRE_DIFF").filter(in_matched & ~pl.col("EXACT_VS_PRE_MATCH")).implode(),
+        ]),
+        record_sample(matched.filter(is_error), error_record, order_cols, max_error_records),
+        record_sample(matched.filter(pl.col("IS_DEBT_SEPARATION")), debt_record, order_cols, max_error_records),
+        unmatched.select(pl.col(join_key).n_unique()),
+        *report_sinks,
+    ], engine=collect_engine(streaming))
+    update_progress()
+    
+    result.matched_rows = summary["matched"].item()
+    result.unmatched_dsl2 = summary["unmatched"].item()
+    result.unmatched_dsl1 = unmatched_count.item()
     
     log_info(f"Matched rows: {result.matched_rows:,}")
     log_info(f"Unmatched DSL2 rows: {result.unmatched_dsl2:,}")
+    log_info(f"Unmatched DSL1 accounts: {result.unmatched_dsl1:,}")
     update_progress()
     
-    # Filter to matched rows only for comparison
-    matched = joined.filter(pl.col("ACC_NO").is_not_null())
-    
-    if matched.height == 0:
+    if result.matched_rows == 0:
         log_warn("No matching records found between datasets!")
         result.end_time = time.time()
         return result
     
-    # Convert to pandas for complex date parsing
-    start_timer("parse_dates")
-    log_flux("Parsing and comparing dates...")
-    
-    matched_pd = matched.to_pandas()
-    update_progress()
-    
-    # Vectorized date parsing for DSL1
-    log_info("Parsing DSL1 dates...")
-    matched_pd["DATE_DSL1"] = matched_pd["FIRST_PAYMENT_DATE"].apply(parse_date_dsl1)
-    update_progress()
-    
-    log_info("Parsing DSL2 dates (Buddhist Era conversion)...")
-    matched_pd["DATE_DSL2"] = matched_pd["วันที่เริ่มชำระหนี้"].apply(parse_date_dsl2_buddhist)
-    
-    log_info("Date parsing complete", "parse_dates")
-    update_progress()
-    
-    # Parse balances
-    start_timer("parse_balances")
-    log_flux("Parsing and comparing balances...")
-    
-    matched_pd["BAL_DSL1"] = matched_pd["PRE_BALANCE"].apply(safe_float)
-    matched_pd["BAL_DSL2"] = matched_pd["ยอดหนี้เงินกู้"].apply(safe_float)
-    
-    # Parse EXACT_PRE_BALANCE if available
-    if "EXACT_PRE_BALANCE" in matched_pd.columns:
-        matched_pd["EXACT_BAL"] = matched_pd["EXACT_PRE_BALANCE"].apply(safe_float)
-    else:
-        matched_pd["EXACT_BAL"] = matched_pd["BAL_DSL1"]  # Fallback
-    
-    log_info("Balance parsing complete", "parse_balances")
-    update_progress()
-    
-    # Calculate discrepancies
-    start_timer("calc_discrepancies")
-    log_flux("Calculating discrepancies...")
-    
-    # Date comparison
-    valid_dates_mask = matched_pd["DATE_DSL1"].notna() & matched_pd["DATE_DSL2"].notna()
-    matched_pd["DATE_MATCH"] = False
-    matched_pd.loc[valid_dates_mask, "DATE_MATCH"] = (
-        matched_pd.loc[valid_dates_mask, "DATE_DSL1"] == matched_pd.loc[valid_dates_mask, "DATE_DSL2"]
-    )
-    
-    # Calculate date difference in days
-    matched_pd["DATE_DIFF_DAYS"] = 0
-    matched_pd.loc[valid_dates_mask, "DATE_DIFF_DAYS"] = (
-        (matched_pd.loc[valid_dates_mask, "DATE_DSL2"] - matched_pd.loc[valid_dates_mask, "DATE_DSL1"])
-        .apply(lambda x: abs(x.days) if x else 0)
-    )
-    
-    # Balance comparison: PRE_BALANCE vs ยอดหนี้เงินกู้
-    matched_pd["BAL_DIFF"] = matched_pd["BAL_DSL2"] - matched_pd["BAL_DSL1"]
-    matched_pd["BAL_DIFF_ABS"] = matched_pd["BAL_DIFF"].abs()
-    matched_pd["BAL_DIFF_PCT"] = np.where(
-        matched_pd["BAL_DSL1"] != 0,
-        (matched_pd["BAL_DIFF_ABS"] / matched_pd["BAL_DSL1"].abs()) * 100,
-        np.where(matched_pd["BAL_DSL2"] != 0, 100, 0)
-    )
-    matched_pd["BAL_MATCH"] = matched_pd["BAL_DIFF_ABS"] <= balance_tolerance
-    
-    # EXACT_PRE_BALANCE vs ยอดหนี้เงินกู้
-    matched_pd["EXACT_VS_DSL2_DIFF"] = matched_pd["BAL_DSL2"] - matched_pd["EXACT_BAL"]
-    matched_pd["EXACT_VS_DSL2_MATCH"] = matched_pd["EXACT_VS_DSL2_DIFF"].abs() <= balance_tolerance
-    
-    # EXACT_PRE_BALANCE vs PRE_BALANCE (แยกหนี้ Detection)
-    matched_pd["EXACT_VS_PRE_DIFF"] = matched_pd["BAL_DSL1"] - matched_pd["EXACT_BAL"]
-    matched_pd["EXACT_VS_PRE_MATCH"] = matched_pd["EXACT_VS_PRE_DIFF"].abs() <= balance_tolerance
-    
-    # แยกหนี้ Detection: PRE_BALANCE < EXACT_PRE_BALANCE
-    matched_pd["IS_DEBT_SEPARATION"] = matched_pd["BAL_DSL1"] < matched_pd["EXACT_BAL"]
-    
-    log_info("Discrepancy calculation complete", "calc_discrepancies")
-    update_progress()
-    
     # Categorize discrepancies
-    date_only_mismatch = ~matched_pd["DATE_MATCH"] & matched_pd["BAL_MATCH"]
-    bal_only_mismatch = matched_pd["DATE_MATCH"] & ~matched_pd["BAL_MATCH"]
-    both_mismatch = ~matched_pd["DATE_MATCH"] & ~matched_pd["BAL_MATCH"]
-    perfect_match = matched_pd["DATE_MATCH"] & matched_pd["BAL_MATCH"]
-    
-    result.date_mismatches = int(date_only_mismatch.sum())
-    result.balance_mismatches = int(bal_only_mismatch.sum())
-    result.both_mismatches = int(both_mismatch.sum())
-    result.perfect_matches = int(perfect_match.sum())
+    result.date_mismatches = summary["date_only"].item()
+    result.balance_mismatches = summary["bal_only"].item()
+    result.both_mismatches = summary["both"].item()
+    result.perfect_matches = summary["perfect"].item()
     
     # EXACT_PRE_BALANCE comparison counts
-    result.exact_vs_dsl2_mismatches = int((~matched_pd["EXACT_VS_DSL2_MATCH"]).sum())
-    result.exact_vs_pre_mismatches = int((~matched_pd["EXACT_VS_PRE_MATCH"]).sum())
+    result.exact_vs_dsl2_mismatches = summary["exact_vs_dsl2"].item()
+    result.exact_vs_pre_mismatches = summary["exact_vs_pre"].item()
     
     # แยกหนี้ cases
-    result.debt_separation_cases = int(matched_pd["IS_DEBT_SEPARATION"].sum())
+    result.debt_separation_cases = summary["debt_separation"].item()
     
-    # Collect error statistics
-    error_mask = ~matched_pd["DATE_MATCH"] | ~matched_pd["BAL_MATCH"]
-    error_rows = matched_pd[error_mask]
+    # Error statistics
+    result.balance_errors, result.error_stats["balance"] = read_error_stats(summary, "balance_errors")
+    result.date_diff_days, result.error_stats["date_diff"] = read_error_stats(summary, "date_diff_days")
+    result.date_diff_days = result.date_diff_days.astype(int)
     
-    result.balance_errors = error_rows["BAL_DIFF"].values
-    if valid_dates_mask.any():
-        result.date_diff_days = error_rows.loc[valid_dates_mask & error_mask, "DATE_DIFF_DAYS"].values.astype(int)
-    else:
-        result.date_diff_days = np.array([])
+    result.exact_vs_dsl2_errors = summary["EXACT_VS_DSL2_DIFF"].explode().drop_nulls().to_numpy()
+    result.exact_vs_pre_errors = summary["EXACT_VS_PRE_DIFF"].explode().drop_nulls().to_numpy()
     
-    result.exact_vs_dsl2_errors = matched_pd[~matched_pd["EXACT_VS_DSL2_MATCH"]]["EXACT_VS_DSL2_DIFF"].values
-    result.exact_vs_pre_errors = matched_pd[~matched_pd["EXACT_VS_PRE_MATCH"]]["EXACT_VS_PRE_DIFF"].values
+    log_info("Discrepancy calculation complete", "calc_discrepancies")
+    update_progress()
     
-    # Collect detailed error records
+    # Detailed error and แยกหนี้ records arrive formatted from the plan
     start_timer("collect_errors")
-    log_flux(f"Collecting error records (max {max_error_records:,})...")
-    
-    error_sample = error_rows.head(max_error_records)
-    
-    for _, row in error_sample.iterrows():
-        record = {
-            "ACC_NO": str(row.get("เลขบัญชี", "")),
-            "DATE_DSL1": format_date_iso(row.get("DATE_DSL1", "")),
-            "DATE_DSL2": str(row.get("วันที่เริ่มชำระหนี้", "")),
-            "DATE_MATCH": bool(row.get("DATE_MATCH", False)),
-            "DATE_DIFF_DAYS": int(row.get("DATE_DIFF_DAYS", 0)),
-            "BAL_DSL1": float(row.get("BAL_DSL1", 0)),
-            "BAL_DSL2": float(row.get("BAL_DSL2", 0)),
-            "BAL_MATCH": bool(row.get("BAL_MATCH", False)),
-            "BAL_DIFF": float(row.get("BAL_DIFF", 0)),
-            "BAL_DIFF_PCT": round(float(row.get("BAL_DIFF_PCT", 0)), 4),
-            "EXACT_BAL": float(row.get("EXACT_BAL", 0)),
-            "EXACT_VS_DSL2_DIFF": float(row.get("EXACT_VS_DSL2_DIFF", 0)),
-            "EXACT_VS_PRE_DIFF": float(row.get("EXACT_VS_PRE_DIFF", 0)),
-            "IS_DEBT_SEPARATION": bool(row.get("IS_DEBT_SEPARATION", False)),
-        }
-        result.error_records.append(record)
-    
-    # Collect แยกหนี้ records separately
-    debt_sep_rows = matched_pd[matched_pd["IS_DEBT_SEPARATION"]].head(max_error_records)
-    for _, row in debt_sep_rows.iterrows():
-        record = {
-            "ACC_NO": str(row.get("เลขบัญชี", "")),
-            "PRE_BALANCE": float(row.get("BAL_DSL1", 0)),
-            "EXACT_PRE_BALANCE": float(row.get("EXACT_BAL", 0)),
-            "DIFFERENCE": float(row.get("EXACT_VS_PRE_DIFF", 0)),
-            "DSL2_BALANCE": float(row.get("BAL_DSL2", 0)),
-            "REMARK": "แยกหนี้ - PRE_BALANCE < EXACT_PRE_BALANCE",
-        }
-        result.debt_separation_records.append(record)
+    
+    store_records(result, "error_records", error_sample, order_cols)
+    store_records(result, "debt_separation_records", debt_sample, order_cols)
     
     log_info(f"Collected {len(result.error_records):,} error records", "collect_errors")
     log_info(f"Collected {len(result.debt_separation_records):,} แยกหนี้ records")
@@ -1740,13 +2832,52 @@ def reconcile_dsl1_vs_dsl2(
     return result
 
 
+# Payment Schedule rows compared per DSL2 row: every installment, or the one
+# picked by an as-of join on the due date
+PS_MATCH_MODES = ["all", "asof"]
+ASOF_DATE_COL = "_ASOF_DATE"
+
+
+def join_ps_installments_asof(dsl2_lf: pl.LazyFrame, ps_lf: pl.LazyFrame, join_key: str) -> pl.LazyFrame:
+    """
+    Left-join each DSL2 row to a single Payment Schedule installment of its
+    account: the first DUE_PAYMENT_DATE on or after the DSL2 start date, or
+    the last installment when every one falls before it. A missing DSL2 date
+    picks the first installment; undated installments are taken last.
+    Rows come back in DSL2 order.
+    """
+    left = (
+        with_row_order(dsl2_lf, ROW_DSL2_COL)
+        .with_columns(pl.col("DATE_DSL2").fill_null(date.min).alias(ASOF_DATE_COL))
+        .sort(ASOF_DATE_COL)
+    )
+    right = ps_lf.with_columns(pl.col("DATE_PS").fill_null(date.max).alias(ASOF_DATE_COL)).sort(ASOF_DATE_COL)
+    
+    def asof(lf: pl.LazyFrame, strategy: str) -> pl.LazyFrame:
+        # Both sides are sorted on the as-of date above
+        return lf.join_asof(
+            right, on=ASOF_DATE_COL, by=join_key, strategy=strategy, suffix="_ps", check_sortedness=False
+        )
+    
+    forward = asof(left, "forward")
+    found = pl.col("ACC_NO").is_not_null()
+    backward = asof(forward.filter(~found).select(left.collect_schema().names()), "backward")
+    
+    return pl.concat([forward.filter(found), backward]).sort(ROW_DSL2_COL).drop(ASOF_DATE_COL)
+
+
 def reconcile_ps_vs_dsl2(
     ps_data: pl.DataFrame,
     dsl2_data: pl.DataFrame,
     balance_tolerance: float = 0.01,
     max_error_records: int = 100000,
     progress: Progress = None,
-    task_id = None
+    task_id = None,
+    streaming: bool = False,
+    ps_match: str = "all",
+    unmatched_path: Optional[Path] = None,
+    outcomes_path: Optional[Path] = None,
+    matched_keys_path: Optional[Path] = None
 ) -> PaymentScheduleResult:
     """
     Perform vectorized reconciliation between Payment Schedule and DSL2 datasets.
@@ -1755,15 +2886,25 @@ def reconcile_ps_vs_dsl2(
     - Join on ACC_NO = เลขบัญชี
     - Compare DUE_PAYMENT_DATE vs วันที่เริ่มชำระหนี้
     - Compare CAPITAL_REMAIN vs ยอดหนี้เงินกู้
+    
+    ps_match="all" compares every installment of an account; "asof" compares
+    only the installment picked by join_ps_installments_asof(), so each DSL2
+    row matches at most once. With streaming=True the inputs may be
+    LazyFrames and the plan runs on Polars' streaming engine. PS accounts
+    missing from DSL2 are counted, and listed in unmatched_path when one is
+    given; outcomes_path receives the per-account outcomes (account_outcomes)
+    and matched_keys_path the matched keys for the three-way stage
+    (sink_matched_keys).
     """
     result = PaymentScheduleResult()
     result.start_time = time.time()
+    result.match_mode = ps_match
     
     start_timer("reconcile_ps_dsl2")
     log_flux("Starting Payment Schedule vs DSL2 vectorized reconciliation...")
     
-    result.total_ps_rows = len(ps_data)
-    result.total_dsl2_rows = len(dsl2_data)
+    result.total_ps_rows = frame_height(ps_data, streaming)
+    result.total_dsl2_rows = frame_height(dsl2_data, streaming)
     
     log_info(f"Payment Schedule rows: {result.total_ps_rows:,}")
     log_info(f"DSL2 rows: {result.total_dsl2_rows:,}")
@@ -1777,168 +2918,135 @@ def reconcile_ps_vs_dsl2(
         if progress and task_id:
             progress.update(task_id, completed=int(current_step / total_steps * 100))
     
-    # Normalize account numbers
+    # Normalized account keys (precomputed at load; only added here if missing)
     start_timer("normalize_ps")
-    log_flux("Normalizing account numbers...")
-    
-    ps_normalized = ps_data.with_columns([
-        pl.col("ACC_NO").str.strip_chars().str.replace_all(r"^0+", "").alias("ACC_NO_NORM")
-    ])
     
-    dsl2_normalized = dsl2_data.with_columns([
-        pl.col("เลขบัญชี").str.strip_chars().str.replace_all(r"^0+", "").alias("ACC_NO_NORM")
-    ])
+    ps_normalized = ensure_ps_dates(ensure_account_key(ps_data, "ACC_NO"))
+    ps_normalized = ensure_balances(ps_normalized, PS_BALANCE_COLS)
+    dsl2_normalized = ensure_dsl2_dates(ensure_account_key(dsl2_data, "เลขบัญชี"))
+    dsl2_normalized = ensure_balances(dsl2_normalized, DSL2_BALANCE_COLS)
     
-    log_info("Account numbers normalized", "normalize_ps")
+    log_info("Account keys ready", "normalize_ps")
     update_progress()
     
-    # Perform left join (DSL2 as base)
+    # Build the lazy plan: left join (DSL2 as base) -> comparisons -> counts and samples
     start_timer("join_ps")
-    log_flux("Performing join operation...")
-    
-    joined = dsl2_normalized.join(
-        ps_normalized,
-        on="ACC_NO_NORM",
-        how="left",
-        suffix="_ps"
-    )
-    
-    log_info("Join operation complete", "join_ps")
-    update_progress()
-    
-    result.matched_rows = joined.filter(pl.col("ACC_NO").is_not_null()).height
-    result.unmatched_dsl2 = joined.filter(pl.col("ACC_NO").is_null()).height
-    
-    log_info(f"Matched rows: {result.matched_rows:,}")
-    log_info(f"Unmatched DSL2 rows: {result.unmatched_dsl2:,}")
-    update_progress()
+    join_key = join_key_for(dsl2_normalized, ps_normalized)
     
-    matched = joined.filter(pl.col("ACC_NO").is_not_null())
+    if ps_match == "asof":
+        log_flux("Building as-of installment join and comparison plan...")
+        joined = join_ps_installments_asof(dsl2_normalized.lazy(), ps_normalized.lazy(), join_key)
+    else:
+        log_flux("Building join and comparison plan...")
+        joined = dsl2_normalized.lazy().join(
+            ps_normalized.lazy(),
+            on=join_key,
+            how="left",
+            suffix="_ps",
+            maintain_order="left_right"
+        )
     
-    if matched.height == 0:
-        log_warn("No matching records found between Payment Schedule and DSL2!")
-        result.end_time = time.time()
-        return result
+    # Filter out dates with unreasonable years (data entry errors like year 2336)
+    valid_dates = dates_in_range_expr("DATE_PS", "DATE_DSL2")
+    
+    # Comparison columns over every joined row (see reconcile_dsl1_vs_dsl2)
+    in_matched = pl.col("ACC_NO").is_not_null()
+    compared = (
+        joined
+        .with_columns([
+            valid_dates.alias("DATES_VALID"),
+            (valid_dates & (pl.col("DATE_PS") == pl.col("DATE_DSL2"))).fill_null(False).alias("DATE_MATCH"),
+            date_diff_days_expr(valid_dates, "DATE_DSL2", "DATE_PS").alias("DATE_DIFF_DAYS"),
+            (pl.col("BAL_DSL2") - pl.col("BAL_PS")).alias("BAL_DIFF"),
+        ])
+        .with_columns([
+            balance_diff_pct_expr("BAL_DIFF", "BAL_PS", "BAL_DSL2").alias("BAL_DIFF_PCT"),
+            (pl.col("BAL_DIFF").abs() <= balance_tolerance).alias("BAL_MATCH"),
+        ])
+    )
+    matched = compared.filter(in_matched)
     
-    # Convert to pandas for date parsing
-    start_timer("parse_dates_ps")
-    log_flux("Parsing and comparing dates...")
+    date_ok, bal_ok = pl.col("DATE_MATCH"), pl.col("BAL_MATCH")
+    is_error = ~date_ok | ~bal_ok
+    in_errors = in_matched & is_error
     
-    matched_pd = matched.to_pandas()
+    log_info("Plan ready", "join_ps")
     update_progress()
     
-    # Parse dates
-    log_info("Parsing Payment Schedule dates...")
-    matched_pd["DATE_PS"] = matched_pd["DUE_PAYMENT_DATE"].apply(parse_date_payment_schedule)
-    
-    log_info("Parsing DSL2 dates (Buddhist Era conversion)...")
-    matched_pd["DATE_DSL2"] = matched_pd["วันที่เริ่มชำระหนี้"].apply(parse_date_dsl2_buddhist)
-    
-    log_info("Date parsing complete", "parse_dates_ps")
+    # Execute every output of the plan together so the join runs once
+    start_timer("calc_discrepancies_ps")
+    log_flux(f"Executing join, fused discrepancy aggregation and error samples (max {max_error_records:,})...")
+    
+    error_record = [
+        pl.col("เลขบัญชี").cast(pl.Utf8).alias("ACC_NO"),
+        iso_date_expr("DATE_PS").alias("DATE_PS"),
+        dsl2_raw_date_expr(),
+        pl.col("DATE_MATCH"),
+        pl.col("DATE_DIFF_DAYS").cast(pl.Int64),
+        pl.col("BAL_PS"),
+        pl.col("BAL_DSL2"),
+        pl.col("BAL_MATCH"),
+        pl.col("BAL_DIFF"),
+        pl.col("BAL_DIFF_PCT").round(4),
+    ]
+    order_cols = present_order_cols(matched, [ROW_DSL2_COL, ROW_PS_COL])
+    
+    # PS accounts with no DSL2 row, and the uncapped per-account outcomes
+    unmatched = unmatched_accounts(ps_normalized, dsl2_normalized, join_key, ROW_PS_COL)
+    report_sinks = [sink_account_list(unmatched, join_key, unmatched_path)] if unmatched_path else []
+    if outcomes_path:
+        report_sinks.append(
+            account_outcomes(matched, "เลขบัญชี", date_ok, bal_ok, pl.col("BAL_DIFF")).sink_parquet(outcomes_path, lazy=True)
+        )
+    if matched_keys_path:
+        report_sinks.append(sink_matched_keys(ps_normalized, dsl2_normalized, join_key, "ROWS_PS", matched_keys_path))
+    
+    # One aggregation over the joined rows: every count, error array and statistic
+    summary, error_sample, unmatched_count, *_ = pl.collect_all([
+        compared.select([
+            in_matched.sum().alias("matched"),
+            (~in_matched).sum().alias("unmatched"),
+            *match_category_exprs(date_ok, bal_ok, in_matched),
+            *error_stats_exprs(pl.col("BAL_DIFF").filter(in_errors), "balance_errors"),
+            pl.col("DATE_DIFF_DAYS").filter(in_errors & pl.col("DATES_VALID")).implode().alias("date_diff_days"),
+        ]),
+        record_sample(matched.filter(is_error), error_record, order_cols, max_error_records),
+        unmatched.select(pl.col(join_key).n_unique()),
+        *report_sinks,
+    ], engine=collect_engine(streaming))
     update_progress()
     
-    # Parse balances
-    start_timer("parse_balances_ps")
-    log_flux("Parsing and comparing balances...")
-    
-    matched_pd["BAL_PS"] = matched_pd["CAPITAL_REMAIN"].apply(safe_float)
-    matched_pd["BAL_DSL2"] = matched_pd["ยอดหนี้เงินกู้"].apply(safe_float)
+    result.matched_rows = summary["matched"].item()
+    result.unmatched_dsl2 = summary["unmatched"].item()
+    result.unmatched_ps = unmatched_count.item()
     
-    log_info("Balance parsing complete", "parse_balances_ps")
+    log_info(f"Matched rows: {result.matched_rows:,}")
+    log_info(f"Unmatched DSL2 rows: {result.unmatched_dsl2:,}")
+    log_info(f"Unmatched Payment Schedule accounts: {result.unmatched_ps:,}")
     update_progress()
     
-    # Calculate discrepancies
-    start_timer("calc_discrepancies_ps")
-    log_flux("Calculating discrepancies...")
-    
-    # Date comparison
-    # Filter out dates with unreasonable years (data entry errors like year 2336)
-    def is_valid_date_range(dt):
-        if pd.isna(dt):
-            return False
-        try:
-            year = dt.year if hasattr(dt, 'year') else pd.Timestamp(dt).year
-            return 1900 <= year <= 2100
-        except:
-            return False
+    if result.matched_rows == 0:
+        log_warn("No matching records found between Payment Schedule and DSL2!")
+        result.end_time = time.time()
+        return result
     
-    valid_dates_mask = (
-        matched_pd["DATE_PS"].notna() & 
-        matched_pd["DATE_DSL2"].notna() &
-        matched_pd["DATE_PS"].apply(is_valid_date_range) &
-        matched_pd["DATE_DSL2"].apply(is_valid_date_range)
-    )
-    matched_pd["DATE_MATCH"] = False
-    matched_pd.loc[valid_dates_mask, "DATE_MATCH"] = (
-        matched_pd.loc[valid_dates_mask, "DATE_PS"] == matched_pd.loc[valid_dates_mask, "DATE_DSL2"]
-    )
+    # Categorize discrepancies
+    result.date_mismatches = summary["date_only"].item()
+    result.balance_mismatches = summary["bal_only"].item()
+    result.both_mismatches = summary["both"].item()
+    result.perfect_matches = summary["perfect"].item()
     
-    matched_pd["DATE_DIFF_DAYS"] = 0
-    try:
-        # Convert to datetime64 for vectorized operations (avoids PerformanceWarning)
-        date_ps_valid = pd.to_datetime(matched_pd.loc[valid_dates_mask, "DATE_PS"], errors='coerce')
-        date_dsl2_valid = pd.to_datetime(matched_pd.loc[valid_dates_mask, "DATE_DSL2"], errors='coerce')
-        
-        # Vectorized date difference calculation
-        date_diff = (date_dsl2_valid - date_ps_valid).dt.days.abs().fillna(0).astype(int)
-        matched_pd.loc[valid_dates_mask, "DATE_DIFF_DAYS"] = date_diff.values
-    except Exception as e:
-        log_warn(f"Date difference calculation error (likely out-of-range dates): {e}")
-    
-    # Balance comparison
-    matched_pd["BAL_DIFF"] = matched_pd["BAL_DSL2"] - matched_pd["BAL_PS"]
-    matched_pd["BAL_DIFF_ABS"] = matched_pd["BAL_DIFF"].abs()
-    matched_pd["BAL_DIFF_PCT"] = np.where(
-        matched_pd["BAL_PS"] != 0,
-        (matched_pd["BAL_DIFF_ABS"] / matched_pd["BAL_PS"].abs()) * 100,
-        np.where(matched_pd["BAL_DSL2"] != 0, 100, 0)
-    )
-    matched_pd["BAL_MATCH"] = matched_pd["BAL_DIFF_ABS"] <= balance_tolerance
+    # Error statistics
+    result.balance_errors, result.error_stats["balance"] = read_error_stats(summary, "balance_errors")
+    result.date_diff_days = summary["date_diff_days"].explode().drop_nulls().to_numpy().astype(int)
     
     log_info("Discrepancy calculation complete", "calc_discrepancies_ps")
     update_progress()
     
-    # Categorize discrepancies
-    date_only_mismatch = ~matched_pd["DATE_MATCH"] & matched_pd["BAL_MATCH"]
-    bal_only_mismatch = matched_pd["DATE_MATCH"] & ~matched_pd["BAL_MATCH"]
-    both_mismatch = ~matched_pd["DATE_MATCH"] & ~matched_pd["BAL_MATCH"]
-    perfect_match = matched_pd["DATE_MATCH"] & matched_pd["BAL_MATCH"]
-    
-    result.date_mismatches = int(date_only_mismatch.sum())
-    result.balance_mismatches = int(bal_only_mismatch.sum())
-    result.both_mismatches = int(both_mismatch.sum())
-    result.perfect_matches = int(perfect_match.sum())
-    
-    # Collect error statistics
-    error_mask = ~matched_pd["DATE_MATCH"] | ~matched_pd["BAL_MATCH"]
-    error_rows = matched_pd[error_mask]
-    
-    result.balance_errors = error_rows["BAL_DIFF"].values
-    if valid_dates_mask.any():
-        result.date_diff_days = error_rows.loc[valid_dates_mask & error_mask, "DATE_DIFF_DAYS"].values.astype(int)
-    else:
-        result.date_diff_days = np.array([])
-    
-    # Collect detailed error records
+    # Detailed error records arrive formatted from the plan
     start_timer("collect_errors_ps")
-    log_flux(f"Collecting error records (max {max_error_records:,})...")
-    
-    error_sample = error_rows.head(max_error_records)
-    
-    for _, row in error_sample.iterrows():
-        record = {
-            "ACC_NO": str(row.get("เลขบัญชี", "")),
-            "DATE_PS": format_date_iso(row.get("DATE_PS", "")),
-            "DATE_DSL2": str(row.get("วันที่เริ่มชำระหนี้", "")),
-            "DATE_MATCH": bool(row.get("DATE_MATCH", False)),
-            "DATE_DIFF_DAYS": int(row.get("DATE_DIFF_DAYS", 0)),
-            "BAL_PS": float(row.get("BAL_PS", 0)),
-            "BAL_DSL2": float(row.get("BAL_DSL2", 0)),
-            "BAL_MATCH": bool(row.get("BAL_MATCH", False)),
-            "BAL_DIFF": float(row.get("BAL_DIFF", 0)),
-            "BAL_DIFF_PCT": round(float(row.get("BAL_DIFF_PCT", 0)), 4),
-        }
-        result.error_records.append(record)
+    
+    store_records(result, "error_records", error_sample, order_cols)
     
     log_info(f"Collected {len(result.error_records):,} error records", "collect_errors_ps")
     update_progress()
@@ -1957,7 +3065,11 @@ def reconcile_three_way(
     balance_tolerance: float = 0.01,
     max_records: int = 100000,
     progress: Progress = None,
-    task_id = None
+    task_id = None,
+    dsl1_prefiltered: bool = False,
+    streaming: bool = False,
+    outcomes_path: Optional[Path] = None,
+    matched_keys: Optional[Tuple[Path, Path]] = None
 ) -> ThreeWayReconciliationResult:
     """
     Perform three-way reconciliation between DSL1, DSL2, and Payment Schedule.
@@ -1968,6 +3080,12 @@ def reconcile_three_way(
     - Compare PRE_BALANCE ↔ EXACT_PRE_BALANCE ↔ ยอดหนี้เงินกู้ ↔ CAPITAL_REMAIN
     
     Perfect Match: All dates equal AND all balances equal across all three sources.
+    
+    With streaming=True the inputs may be LazyFrames and the plan runs on
+    Polars' streaming engine. outcomes_path receives the per-account
+    outcomes (account_outcomes). matched_keys are the two-way stages'
+    matched_keys_path files: their intersection gives the common keys and
+    the join order without another pass over the sources.
     """
     result = ThreeWayReconciliationResult()
     result.start_time = time.time()
@@ -1984,63 +3102,166 @@ def reconcile_three_way(
         if progress and task_id:
             progress.update(task_id, completed=int(current_step / total_steps * 100))
     
-    # Filter DSL1 by GROUP_FLAG = 1
-    log_flux("Filtering DSL1 by GROUP_FLAG = 1...")
-    
-    if "GROUP_FLAG" in dsl1_data.columns:
-        dsl1_filtered = dsl1_data.filter(
-            (pl.col("GROUP_FLAG").cast(pl.Int64, strict=False) == 1) |
-            (pl.col("GROUP_FLAG").cast(pl.Utf8) == "1")
-        )
-    else:
+    # Filter DSL1 by GROUP_FLAG = 1 (unless already pushed into the scan)
+    if dsl1_prefiltered:
         dsl1_filtered = dsl1_data
+    else:
+        log_flux("Filtering DSL1 by GROUP_FLAG = 1...")
+        dsl1_filtered = filter_group_flag(dsl1_data.lazy())
+        if not streaming:
+            dsl1_filtered = dsl1_filtered.collect()
     
-    result.total_dsl1_filtered_rows = len(dsl1_filtered)
-    result.total_dsl2_rows = len(dsl2_data)
-    result.total_ps_rows = len(ps_data)
-    
-    log_info(f"DSL1 filtered rows: {result.total_dsl1_filtered_rows:,}")
-    log_info(f"DSL2 rows: {result.total_dsl2_rows:,}")
-    log_info(f"Payment Schedule rows: {result.total_ps_rows:,}")
     update_progress()
     
-    # Normalize account numbers
-    log_flux("Normalizing account numbers for three-way join...")
+    # Normalized account keys (precomputed at load; only added here if missing)
+    dsl1_normalized = ensure_dsl1_dates(ensure_account_key(dsl1_filtered, "ACC_NO"))
+    dsl1_normalized = ensure_balances(dsl1_normalized, DSL1_BALANCE_COLS)
+    dsl2_normalized = ensure_dsl2_dates(ensure_account_key(dsl2_data, "เลขบัญชี"))
+    dsl2_normalized = ensure_balances(dsl2_normalized, DSL2_BALANCE_COLS)
+    ps_normalized = ensure_ps_dates(ensure_account_key(ps_data, "ACC_NO"))
+    ps_normalized = ensure_balances(ps_normalized, PS_BALANCE_COLS)
     
-    dsl1_normalized = dsl1_filtered.with_columns([
-        pl.col("ACC_NO").str.strip_chars().str.replace_all(r"^0+", "").alias("ACC_NO_NORM")
-    ])
+    update_progress()
     
-    dsl2_normalized = dsl2_data.with_columns([
-        pl.col("เลขบัญชี").str.strip_chars().str.replace_all(r"^0+", "").alias("ACC_NO_NORM")
-    ])
+    # Build the lazy plan: key intersection -> ordered inner joins -> comparisons -> counts and samples
+    log_flux("Building three-way join and comparison plan...")
+    
+    join_key = join_key_for(dsl1_normalized, dsl2_normalized, ps_normalized)
+    
+    # EXACT_PRE_BALANCE falls back to PRE_BALANCE when the column is absent
+    has_exact = "EXACT_BAL" in dsl1_normalized.collect_schema()
+    exact_bal = pl.col("EXACT_BAL") if has_exact else pl.col("BAL_DSL1")
+    
+    # Narrow each source to the columns the comparison needs (no name clashes,
+    # so the joins can run in any order). Row-order columns pin the record
+    # samples to DSL1 ⋈ DSL2 ⋈ PS order whichever join runs first.
+    sources = {
+        "DSL1": with_row_order(dsl1_normalized.lazy(), ROW_DSL1_COL).select(
+            [join_key, "ACC_NO", "DATE_DSL1", "BAL_DSL1", *(["EXACT_BAL"] if has_exact else []), ROW_DSL1_COL]
+            + ([ACC_KEY_COL] if outcomes_path and join_key != ACC_KEY_COL else [])
+        ),
+        "DSL2": with_row_order(dsl2_normalized.lazy(), ROW_DSL2_COL).select(
+            [join_key, "วันที่เริ่มชำระหนี้", "DATE_DSL2", "BAL_DSL2", ROW_DSL2_COL]
+        ),
+        "PS": with_row_order(ps_normalized.lazy(), ROW_PS_COL).select(
+            [join_key, "DATE_PS", "BAL_PS", ROW_PS_COL]
+        ),
+    }
     
-    ps_normalized = ps_data.with_columns([
-        pl.col("ACC_NO").str.strip_chars().str.replace_all(r"^0+", "").alias("ACC_NO_NORM")
-    ])
+    # Keys present in all three sources: the intersection of the keys the
+    # two-way stages matched, with the rows each source keeps per key
+    start_timer("three_way_keys")
+    key_counts = read_matched_keys(matched_keys, join_key)
     
-    update_progress()
+    if key_counts is not None:
+        common_keys = key_counts.select(join_key).lazy()
+        reduced_rows = {name: key_counts[f"ROWS_{name}"].sum() for name in sources}
+        
+        # Join the two smallest reduced sources first: for a shared key the
+        # intermediate result grows with the product of their row counts
+        join_order = sorted(sources, key=lambda name: reduced_rows[name])
+        log_info(
+            "Three-way join order: " + " ⋈ ".join(f"{name} ({reduced_rows[name]:,})" for name in join_order),
+            "three_way_keys"
+        )
+    else:
+        # Without them, semi-join the key columns inside the plan
+        key_frames = {name: lf.select(join_key) for name, lf in sources.items()}
+        common_keys = (
+            key_frames["DSL1"].unique()
+            .join(key_frames["DSL2"], on=join_key, how="semi")
+            .join(key_frames["PS"], on=join_key, how="semi")
+        )
+        join_order = list(sources)
+        log_info("Three-way join order: " + " ⋈ ".join(join_order), "three_way_keys")
     
-    # Perform three-way join
-    log_flux("Performing three-way join...")
+    reduced = {name: lf.join(common_keys, on=join_key, how="semi") for name, lf in sources.items()}
+    joined_all = reduced[join_order[0]]
+    for name in join_order[1:]:
+        joined_all = joined_all.join(reduced[name], on=join_key, how="inner")
     
-    # First join DSL1 with DSL2
-    joined_dsl1_dsl2 = dsl1_normalized.join(
-        dsl2_normalized,
-        on="ACC_NO_NORM",
-        how="inner",
-        suffix="_dsl2"
-    )
+    valid_dates = dates_in_range_expr("DATE_DSL1", "DATE_DSL2", "DATE_PS")
     
-    # Then join with Payment Schedule
-    joined_all = joined_dsl1_dsl2.join(
-        ps_normalized,
-        on="ACC_NO_NORM",
-        how="inner",
-        suffix="_ps"
+    # Balance equality check (all four balance fields must match within tolerance)
+    # PRE_BALANCE ↔ EXACT_PRE_BALANCE ↔ ยอดหนี้เงินกู้ ↔ CAPITAL_REMAIN
+    compared = (
+        joined_all
+        .with_columns([
+            pl.col("BAL_DSL1").alias("BAL_DSL1_PRE"),
+            exact_bal.alias("BAL_DSL1_EXACT"),
+        ])
+        .with_columns([
+            (
+                valid_dates
+                & (pl.col("DATE_DSL1") == pl.col("DATE_DSL2"))
+                & (pl.col("DATE_DSL2") == pl.col("DATE_PS"))
+            ).fill_null(False).alias("ALL_DATES_MATCH"),
+            (
+                ((pl.col("BAL_DSL1_PRE") - pl.col("BAL_DSL1_EXACT")).abs() <= balance_tolerance)
+                & ((pl.col("BAL_DSL1_EXACT") - pl.col("BAL_DSL2")).abs() <= balance_tolerance)
+                & ((pl.col("BAL_DSL2") - pl.col("BAL_PS")).abs() <= balance_tolerance)
+            ).alias("ALL_BALANCES_MATCH"),
+        ])
+        .with_columns(
+            # Perfect match: all dates AND all balances match
+            (pl.col("ALL_DATES_MATCH") & pl.col("ALL_BALANCES_MATCH")).alias("PERFECT_MATCH")
+        )
     )
     
-    result.matched_all_three = len(joined_all)
+    dates_ok, bals_ok = pl.col("ALL_DATES_MATCH"), pl.col("ALL_BALANCES_MATCH")
+    update_progress()
+    
+    # Execute every output of the plan together so the joins run once
+    log_flux(f"Executing three-way join, counts and record samples (max {max_records:,})...")
+    
+    perfect_record = [
+        pl.col("ACC_NO").cast(pl.Utf8),
+        iso_date_expr("DATE_DSL1").alias("DATE_DSL1"),
+        dsl2_raw_date_expr(),
+        iso_date_expr("DATE_PS").alias("DATE_PS"),
+        pl.col("BAL_DSL1_PRE"),
+        pl.col("BAL_DSL1_EXACT"),
+        pl.col("BAL_DSL2"),
+        pl.col("BAL_PS"),
+    ]
+    discrepancy_record = [
+        pl.col("ACC_NO").cast(pl.Utf8),
+        iso_date_expr("DATE_DSL1").alias("DATE_DSL1"),
+        dsl2_raw_date_expr(),
+        iso_date_expr("DATE_PS").alias("DATE_PS"),
+        pl.col("ALL_DATES_MATCH"),
+        pl.col("BAL_DSL1_PRE"),
+        pl.col("BAL_DSL1_EXACT"),
+        pl.col("BAL_DSL2"),
+        pl.col("BAL_PS"),
+        pl.col("ALL_BALANCES_MATCH"),
+    ]
+    order_cols = [ROW_DSL1_COL, ROW_DSL2_COL, ROW_PS_COL]
+    
+    outcome_sinks = [
+        account_outcomes(compared, "ACC_NO", dates_ok, bals_ok).sink_parquet(outcomes_path, lazy=True)
+    ] if outcomes_path else []
+    
+    totals, counts, perfect_rows, discrepancy_rows, *_ = pl.collect_all([
+        pl.concat([lf.select(pl.len().alias(name)) for name, lf in sources.items()], how="horizontal"),
+        compared.select([
+            pl.len().alias("matched"),
+            *match_category_exprs(dates_ok, bals_ok),
+        ]),
+        record_sample(compared.filter(pl.col("PERFECT_MATCH")).sort(order_cols), perfect_record, order_cols, max_records),
+        record_sample(compared.filter(~pl.col("PERFECT_MATCH")).sort(order_cols), discrepancy_record, order_cols, max_records),
+        *outcome_sinks,
+    ], engine=collect_engine(streaming))
+    
+    result.total_dsl1_filtered_rows = totals["DSL1"].item()
+    result.total_dsl2_rows = totals["DSL2"].item()
+    result.total_ps_rows = totals["PS"].item()
+    
+    log_info(f"DSL1 filtered rows: {result.total_dsl1_filtered_rows:,}")
+    log_info(f"DSL2 rows: {result.total_dsl2_rows:,}")
+    log_info(f"Payment Schedule rows: {result.total_ps_rows:,}")
+    
+    result.matched_all_three = counts["matched"].item()
     log_info(f"Records matched in all three sources: {result.matched_all_three:,}")
     update_progress()
     
@@ -2049,134 +3270,1271 @@ def reconcile_three_way(
         result.end_time = time.time()
         return result
     
-    # Convert to pandas for date parsing
-    log_flux("Parsing dates and balances...")
+    # Count results
+    result.perfect_matches = counts["perfect"].item()
+    result.date_mismatches = counts["date_only"].item()
+    result.balance_mismatches = counts["bal_only"].item()
+    result.both_mismatches = counts["both"].item()
+    
+    log_info(f"Perfect matches (all dates & balances equal): {result.perfect_matches:,}")
+    log_info(f"Date mismatches only: {result.date_mismatches:,}")
+    log_info(f"Balance mismatches only: {result.balance_mismatches:,}")
+    log_info(f"Both mismatched: {result.both_mismatches:,}")
     
-    joined_pd = joined_all.to_pandas()
     update_progress()
     
-    # Parse all dates
-    joined_pd["DATE_DSL1"] = joined_pd["FIRST_PAYMENT_DATE"].apply(parse_date_dsl1)
-    joined_pd["DATE_DSL2"] = joined_pd["วันที่เริ่มชำระหนี้"].apply(parse_date_dsl2_buddhist)
-    joined_pd["DATE_PS"] = joined_pd["DUE_PAYMENT_DATE"].apply(parse_date_payment_schedule)
+    # Perfect match and discrepancy records arrive formatted from the plan
+    store_records(result, "perfect_match_records", perfect_rows, order_cols)
+    store_records(result, "discrepancy_records", discrepancy_rows, order_cols)
+    
+    log_info(f"Collected {len(result.perfect_match_records):,} perfect match records")
+    log_info(f"Collected {len(result.discrepancy_records):,} discrepancy records")
     
     update_progress()
     
-    # Parse all balances
-    joined_pd["BAL_DSL1_PRE"] = joined_pd["PRE_BALANCE"].apply(safe_float)
+    result.end_time = time.time()
+    
+    log_secure(f"Three-Way Reconciliation complete", "reconcile_three_way")
+    
+    return result
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ARROW IPC STAGING: MEMORY-MAPPED INTERMEDIATES
+# ══════════════════════════════════════════════════════════════════════════════
+
+# Loaded, normalized sources live here (under the output's _tmp folder) while
+# the reconciliations run
+STAGE_DIR_NAME = "stage"
+
+
+def read_ipc_mapped(path: Path) -> pl.DataFrame:
+    """
+    Uncompressed Arrow IPC file as a DataFrame backed by a memory map of the
+    file: pages are read on first touch, can be dropped again by the OS, and
+    are shared with every other process mapping the same file. Without
+    pyarrow the file is read into memory instead.
+    """
+    if not PYARROW_AVAILABLE:
+        return pl.read_ipc(path)
+    table = pyarrow.ipc.open_file(pyarrow.memory_map(str(path))).read_all()
+    return pl.from_arrow(table, rechunk=False)
+
+
+def stage_frame(
+    frame: Union[pl.DataFrame, pl.LazyFrame],
+    path: Path,
+    streaming: bool = False
+) -> Union[pl.DataFrame, pl.LazyFrame]:
+    """
+    Write a loaded, normalized frame to path as uncompressed Arrow IPC
+    (Feather v2) and return it backed by that file instead of the heap.
     
-    if "EXACT_PRE_BALANCE" in joined_pd.columns:
-        joined_pd["BAL_DSL1_EXACT"] = joined_pd["EXACT_PRE_BALANCE"].apply(safe_float)
+    LazyFrames are sunk, DataFrames written. Either comes back through
+    open_staged (an IPC scan for streaming runs, memory-mapped otherwise), so
+    later stages read the parsed, normalized rows instead of re-parsing the
+    source CSVs.
+    """
+    if isinstance(frame, pl.LazyFrame):
+        frame.sink_ipc(path, engine=collect_engine(streaming))
     else:
-        joined_pd["BAL_DSL1_EXACT"] = joined_pd["BAL_DSL1_PRE"]
+        frame.write_ipc(path)
+    log_info(f"Staged {path.name} as Arrow IPC ({path.stat().st_size / (1024 ** 2):,.1f} MB)")
+    return open_staged(path, streaming)
+
+
+def open_staged(path: Path, streaming: bool = False) -> Union[pl.DataFrame, pl.LazyFrame]:
+    """A staged IPC file: scanned lazily for streaming runs, memory-mapped otherwise."""
+    return pl.scan_ipc(path) if streaming else read_ipc_mapped(path)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# STAGE CHECKPOINTS: RESUMABLE RUNS
+# ══════════════════════════════════════════════════════════════════════════════
+
+# Completion markers and pickled stage outputs, next to the staged sources
+CHECKPOINT_DIR_NAME = "checkpoints"
+
+
+def folder_fingerprint(folder: Optional[Path]) -> List[Dict[str, Any]]:
+    """Content fingerprints of the data files in folder (empty without a folder)."""
+    if folder is None:
+        return []
+    return [file_fingerprint(file_path) for file_path in discover_files(folder)]
+
+
+def stage_fingerprint(*parts: Any) -> str:
+    """Short digest of a stage's inputs: upstream fingerprints, source files and parameters."""
+    material = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:24]
+
+
+class StageCheckpoints:
+    """
+    Checkpoints of the pipeline stages in work_dir.
+    
+    Every stage writes its outputs first and its completion marker
+    (checkpoints/<stage>.json, carrying the stage's input fingerprint) last,
+    so a run that dies mid-stage leaves that stage incomplete. With resume,
+    a stage whose marker matches its current fingerprint is skipped and its
+    outputs are read back; without it, earlier checkpoints are discarded.
+    """
     
-    joined_pd["BAL_DSL2"] = joined_pd["ยอดหนี้เงินกู้"].apply(safe_float)
-    joined_pd["BAL_PS"] = joined_pd["CAPITAL_REMAIN"].apply(safe_float)
+    def __init__(self, work_dir: Path, resume: bool = False):
+        self.dir = work_dir / CHECKPOINT_DIR_NAME
+        self.stage_dir = work_dir / STAGE_DIR_NAME
+        self.resume = resume
+        if not resume:
+            self.clear()
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.stage_dir.mkdir(parents=True, exist_ok=True)
+    
+    def clear(self) -> None:
+        """Remove every checkpoint and staged source."""
+        shutil.rmtree(self.dir, ignore_errors=True)
+        shutil.rmtree(self.stage_dir, ignore_errors=True)
+    
+    def completed(self, stage: str, fingerprint: str) -> bool:
+        """True when resuming and stage last completed with the same fingerprint."""
+        marker = self.dir / f"{stage}.json"
+        if not self.resume or not marker.exists():
+            return False
+        with open(marker, "r", encoding="utf-8") as f:
+            done = json.load(f).get("fingerprint") == fingerprint
+        if done:
+            log_secure(f"Resuming: stage '{stage}' already complete, reusing its checkpoint")
+        return done
+    
+    def mark(self, stage: str, fingerprint: str) -> None:
+        """Write the completion marker of stage (atomically, after its outputs)."""
+        marker = self.dir / f"{stage}.json"
+        tmp_marker = marker.with_suffix(".json.tmp")
+        with open(tmp_marker, "w", encoding="utf-8") as f:
+            json.dump({"stage": stage, "fingerprint": fingerprint, "completed_at": datetime.now().isoformat()}, f)
+        os.replace(tmp_marker, marker)
+    
+    def run(self, stage: str, fingerprint: str, compute: Callable[[], Any]) -> Any:
+        """compute()'s result, read back from the stage's pickle when it is already complete."""
+        path = self.dir / f"{stage}.pkl"
+        if self.completed(stage, fingerprint):
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        
+        value = compute()
+        with open(path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.mark(stage, fingerprint)
+        return value
+    
+    def run_source(
+        self,
+        stage: str,
+        fingerprint: str,
+        load: Callable[[], Tuple[Optional[Union[pl.DataFrame, pl.LazyFrame]], Any]],
+        streaming: bool = False
+    ) -> Tuple[Optional[Union[pl.DataFrame, pl.LazyFrame]], Any]:
+        """
+        Source stage: load() returns (frame, metadata). The frame is staged as
+        Arrow IPC (stage_frame) and the metadata pickled; a completed stage is
+        reopened from both. A load that yields no frame is not checkpointed.
+        """
+        frame_path = self.stage_dir / f"{stage}.arrow"
+        meta_path = self.dir / f"{stage}.pkl"
+        if self.completed(stage, fingerprint):
+            with open(meta_path, "rb") as f:
+                return open_staged(frame_path, streaming), pickle.load(f)
+        
+        frame, meta = load()
+        if frame is None:
+            return None, meta
+        
+        frame = stage_frame(frame, frame_path, streaming)
+        with open(meta_path, "wb") as f:
+            pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.mark(stage, fingerprint)
+        return frame, meta
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PARTITIONED RECONCILIATION: HASH BUCKETS ACROSS PROCESSES
+# ══════════════════════════════════════════════════════════════════════════════
+
+PARTITION_COL = "_PARTITION"
+PARTITION_HASH_SEED = 0
+
+
+def partition_expr(partitions: int) -> pl.Expr:
+    """Hash bucket (0..partitions-1) of the normalized account key."""
+    return (pl.col(ACC_KEY_COL).hash(PARTITION_HASH_SEED) % partitions).alias(PARTITION_COL)
+
+
+def partition_dir(work_dir: Path, bucket: int) -> Path:
+    """Directory of one hash bucket."""
+    return work_dir / f"part-{bucket:03d}"
+
+
+def write_partitions(
+    sources: Dict[str, Tuple[Union[pl.DataFrame, pl.LazyFrame], str]],
+    partitions: int,
+    work_dir: Path,
+    streaming: bool = False,
+    buckets: Optional[List[int]] = None
+) -> List[Path]:
+    """
+    Hash-bucket every source by normalized account key into
+    work_dir/part-NNN/<name>.arrow (uncompressed Arrow IPC, memory-mapped
+    by the workers).
+    
+    Equal keys land in the same bucket in every source, so each bucket
+    reconciles independently. A source row-order column is added first
+    (unless the loader already attached one) so partition samples can be
+    merged back in global order.
+    
+    Each bucket gets its own filtered sink, and all sinks run as one
+    collect_all. Polars' common-subplan elimination (on by default) turns
+    the bucketed source into one shared CACHE node: explain_all shows a
+    single scan per source, on both engines. Without streaming that cache
+    holds the whole bucketed source until its sinks are written.
+    
+    Args:
+        sources: name -> (frame, row-order column)
+        buckets: write only these buckets (default: all)
+    """
+    part_dirs = {
+        i: partition_dir(work_dir, i)
+        for i in (range(partitions) if buckets is None else buckets)
+    }
+    for part_dir in part_dirs.values():
+        part_dir.mkdir(parents=True, exist_ok=True)
+    
+    sinks = []
+    for name, (frame, row_col) in sources.items():
+        bucketed = with_row_order(frame.lazy(), row_col).with_columns(partition_expr(partitions))
+        sinks.extend(
+            bucketed.filter(pl.col(PARTITION_COL) == i).drop(PARTITION_COL).sink_ipc(part_dir / f"{name}.arrow", lazy=True)
+            for i, part_dir in part_dirs.items()
+        )
     
-    update_progress()
+    pl.collect_all(sinks, engine=collect_engine(streaming))
     
-    # Calculate date matches
-    log_flux("Calculating three-way matches...")
+    return list(part_dirs.values())
+
+
+def reconcile_partition_task(
+    part_dir: Path,
+    balance_tolerance: float,
+    max_records: int,
+    streaming: bool,
+    ps_match: str,
+    list_unmatched: bool
+) -> Tuple[ReconciliationResult, PaymentScheduleResult, ThreeWayReconciliationResult]:
+    """
+    Worker: run every reconciliation on one hash partition written by
+    write_partitions(). With list_unmatched the unmatched account lists and
+    the per-account outcomes are written next to the partition (see
+    merge_partition_reports()).
+    """
+    read = pl.scan_ipc if streaming else read_ipc_mapped
+    
+    dsl1 = read(part_dir / "dsl1.arrow")
+    dsl2 = read(part_dir / "dsl2.arrow")
+    
+    dsl1_result = reconcile_dsl1_vs_dsl2(
+        dsl1, dsl2,
+        balance_tolerance=balance_tolerance,
+        max_error_records=max_records,
+        dsl1_prefiltered=True,
+        streaming=streaming,
+        unmatched_path=part_dir / "unmatched_dsl1.parquet" if list_unmatched else None,
+        outcomes_path=part_dir / ACCOUNT_OUTCOME_FILES["dsl1_vs_dsl2"] if list_unmatched else None,
+        matched_keys_path=part_dir / MATCHED_KEYS_FILES["dsl1_vs_dsl2"]
+    )
     
-    # Valid date check
-    def is_valid_date(dt):
-        if pd.isna(dt):
-            return False
-        try:
-            year = dt.year if hasattr(dt, 'year') else pd.Timestamp(dt).year
-            return 1900 <= year <= 2100
-        except:
-            return False
+    ps_result = PaymentScheduleResult()
+    three_way_result = ThreeWayReconciliationResult()
+    
+    if (part_dir / "ps.arrow").exists():
+        ps = read(part_dir / "ps.arrow")
+        ps_result = reconcile_ps_vs_dsl2(
+            ps, dsl2,
+            balance_tolerance=balance_tolerance,
+            max_error_records=max_records,
+            streaming=streaming,
+            ps_match=ps_match,
+            unmatched_path=part_dir / "unmatched_ps.parquet" if list_unmatched else None,
+            outcomes_path=part_dir / ACCOUNT_OUTCOME_FILES["ps_vs_dsl2"] if list_unmatched else None,
+            matched_keys_path=part_dir / MATCHED_KEYS_FILES["ps_vs_dsl2"]
+        )
+        three_way_result = reconcile_three_way(
+            dsl1, dsl2, ps,
+            balance_tolerance=balance_tolerance,
+            max_records=max_records,
+            dsl1_prefiltered=True,
+            streaming=streaming,
+            outcomes_path=part_dir / ACCOUNT_OUTCOME_FILES["three_way"] if list_unmatched else None,
+            matched_keys=tuple(part_dir / name for name in MATCHED_KEYS_FILES.values())
+        )
     
-    valid_dates_mask = (
-        joined_pd["DATE_DSL1"].apply(is_valid_date) &
-        joined_pd["DATE_DSL2"].apply(is_valid_date) &
-        joined_pd["DATE_PS"].apply(is_valid_date)
+    return dsl1_result, ps_result, three_way_result
+
+
+def merge_account_lists(part_dirs: List[Path], file_name: str, row_col: str, path: Path, streaming: bool) -> None:
+    """Stream the per-partition account lists into one CSV report in source row order."""
+    (
+        pl.concat([pl.scan_parquet(part_dir / file_name) for part_dir in part_dirs])
+        .sort(row_col)
+        .drop(row_col)
+        .sink_csv(path, include_bom=True, engine=collect_engine(streaming))
+    )
+
+
+def merge_account_outcomes(part_dirs: List[Path], file_name: str, path: Path, streaming: bool) -> None:
+    """Stream the per-partition account outcomes into one Parquet file in key order."""
+    (
+        pl.concat([pl.scan_parquet(part_dir / file_name) for part_dir in part_dirs])
+        .sort(ACC_KEY_COL)
+        .sink_parquet(path, engine=collect_engine(streaming))
     )
+
+
+def merge_partition_reports(part_dirs: List[Path], report_dir: Path, with_ps: bool, streaming: bool) -> None:
+    """Merge the unmatched account lists and account outcomes of every partition into report_dir."""
+    merge_account_lists(part_dirs, "unmatched_dsl1.parquet", ROW_DSL1_COL, report_dir / UNMATCHED_DSL1_FILE, streaming)
+    comparisons = ["dsl1_vs_dsl2"]
+    if with_ps:
+        merge_account_lists(part_dirs, "unmatched_ps.parquet", ROW_PS_COL, report_dir / UNMATCHED_PS_FILE, streaming)
+        comparisons += ["ps_vs_dsl2", "three_way"]
+    for comparison in comparisons:
+        file_name = ACCOUNT_OUTCOME_FILES[comparison]
+        merge_account_outcomes(part_dirs, file_name, report_dir / file_name, streaming)
+
+
+def merge_partition_results(parts: List[Any], max_records: int) -> Any:
+    """
+    Merge the per-partition results of one reconciliation.
+    
+    Counters add up and error-value arrays concatenate (summary statistics
+    are then recomputed from the merged arrays). Every record frame
+    keeps its first max_records rows in source row order (record_order),
+    which is exactly the sample a single-process run takes.
+    """
+    merged = type(parts[0])()
+    
+    for name, default in vars(merged).items():
+        if name in ("start_time", "end_time", "record_order", "error_stats"):
+            continue
+        
+        values = [getattr(part, name) for part in parts]
+        
+        if isinstance(default, np.ndarray):
+            setattr(merged, name, np.concatenate(values))
+        elif isinstance(default, pl.DataFrame):
+            keyed = [
+                pl.concat([part.record_order[name], records], how="horizontal")
+                for part, records in zip(parts, values)
+                if records.height
+            ]
+            if keyed:
+                order_cols = parts[0].record_order[name].columns
+                setattr(merged, name, pl.concat(keyed).sort(order_cols).head(max_records).drop(order_cols))
+        elif isinstance(default, str):
+            setattr(merged, name, values[0])
+        else:
+            setattr(merged, name, sum(values))
+    
+    merged.start_time = min(part.start_time for part in parts)
+    merged.end_time = max(part.end_time for part in parts)
+    
+    return merged
+
+
+def reconcile_partitioned(
+    dsl1_data: Union[pl.DataFrame, pl.LazyFrame],
+    dsl2_data: Union[pl.DataFrame, pl.LazyFrame],
+    ps_data: Optional[Union[pl.DataFrame, pl.LazyFrame]],
+    partitions: int,
+    work_dir: Path,
+    workers: int = 1,
+    balance_tolerance: float = 0.01,
+    max_records: int = 100000,
+    dsl1_total_rows: Optional[int] = None,
+    streaming: bool = False,
+    ps_match: str = "all",
+    unmatched_dir: Optional[Path] = None
+) -> Tuple[ReconciliationResult, PaymentScheduleResult, ThreeWayReconciliationResult]:
+    """
+    Run all reconciliations on hash partitions of the sources in a bounded
+    process pool and merge the partial results.
+    
+    dsl1_data must already be filtered to GROUP_FLAG = 1 and every source
+    must carry the normalized account key. Merged counts and record samples
+    are identical to a single-process run; with unmatched_dir the unmatched
+    account reports and per-account outcomes are written there.
+    """
+    start_timer("partitioned")
+    log_flux(f"Hash-partitioning sources by account key into {partitions} buckets...")
+    
+    sources = {
+        "dsl1": (dsl1_data, ROW_DSL1_COL),
+        "dsl2": (dsl2_data, ROW_DSL2_COL),
+    }
+    if ps_data is not None:
+        sources["ps"] = (ps_data, ROW_PS_COL)
+    
+    try:
+        part_dirs = write_partitions(sources, partitions, work_dir, streaming=streaming)
+        log_info(f"Partitions written to {work_dir}", "partitioned")
+        
+        parts = run_file_tasks(
+            reconcile_partition_task,
+            part_dirs,
+            workers=workers,
+            task_args=(balance_tolerance, max_records, streaming, ps_match, unmatched_dir is not None)
+        )
+        
+        failed = [part_dir.name for part_dir, part in zip(part_dirs, parts) if part is None]
+        if failed:
+            raise RuntimeError(f"Partitioned reconciliation failed for {', '.join(failed)}")
+        
+        if unmatched_dir is not None:
+            merge_partition_reports(part_dirs, unmatched_dir, ps_data is not None, streaming)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    dsl1_result = merge_partition_results([part[0] for part in parts], max_records)
+    ps_result = merge_partition_results([part[1] for part in parts], max_records)
+    three_way_result = merge_partition_results([part[2] for part in parts], max_records)
+    
+    if dsl1_total_rows is not None:
+        dsl1_result.total_dsl1_rows = dsl1_total_rows
+    
+    log_secure(f"Merged {partitions} partition results", "partitioned")
+    
+    return dsl1_result, ps_result, three_way_result
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# INCREMENTAL RECONCILIATION: RECOMPUTE ONLY TOUCHED ACCOUNTS
+# ══════════════════════════════════════════════════════════════════════════════
+
+# Per-bucket results and the per-file state of the last run live here (under
+# the output folder), together with the default ingest cache
+INCREMENTAL_DIR_NAME = "_incremental"
+INCREMENTAL_STATE_FILE = "state.json"
+INCREMENTAL_RESULTS_FILE = "results.pkl"
+
+# Bump when the layout of the incremental state, or the results it caches, change
+INCREMENTAL_STATE_VERSION = 2
+
+# Account-key buckets; a bucket is recomputed whole when any of its accounts is touched
+INCREMENTAL_BUCKETS = 64
+
+
+def load_incremental_state(state_dir: Path) -> Optional[Dict[str, Any]]:
+    """The state written by the last incremental run, or None when missing or unreadable."""
+    path = state_dir / INCREMENTAL_STATE_FILE
+    if not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        log_warn(f"Ignoring unreadable incremental state {path}: {e}")
+        return None
+
+
+def save_incremental_state(state_dir: Path, state: Dict[str, Any]) -> None:
+    """Write the incremental state atomically."""
+    path = state_dir / INCREMENTAL_STATE_FILE
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def file_bucket_digests(
+    frame: Union[pl.DataFrame, pl.LazyFrame],
+    row_col: str,
+    ranks: List[int],
+    partitions: int,
+    streaming: bool = False
+) -> Dict[int, Dict[str, int]]:
+    """
+    For each file rank in ranks, a digest of its rows in every hash bucket
+    it occupies (bucket -> digest, one scan for all files).
     
-    # Date equality check (all three dates must match)
-    joined_pd["ALL_DATES_MATCH"] = False
-    joined_pd.loc[valid_dates_mask, "ALL_DATES_MATCH"] = (
-        (joined_pd.loc[valid_dates_mask, "DATE_DSL1"] == joined_pd.loc[valid_dates_mask, "DATE_DSL2"]) &
-        (joined_pd.loc[valid_dates_mask, "DATE_DSL2"] == joined_pd.loc[valid_dates_mask, "DATE_PS"])
+    The digest is an order-independent sum of row hashes over the loaded
+    columns and the row's position within its file (not its file rank), so
+    it changes exactly when the rows a file contributes to a bucket change.
+    """
+    if not ranks:
+        return {}
+    
+    row_hash = pl.struct(
+        pl.all().exclude(row_col),
+        (pl.col(row_col) % (1 << FILE_RANK_SHIFT)).alias("_POSITION")
+    ).hash(PARTITION_HASH_SEED)
+    
+    rank_digests = (
+        frame.lazy()
+        .with_columns((pl.col(row_col) // (1 << FILE_RANK_SHIFT)).alias("_RANK"), partition_expr(partitions))
+        .filter(pl.col("_RANK").is_in(ranks))
+        .group_by("_RANK", PARTITION_COL)
+        .agg(row_hash.sum().alias("_DIGEST"))
+        .collect(engine=collect_engine(streaming))
     )
     
-    # Balance equality check (all four balance fields must match within tolerance)
-    # PRE_BALANCE ↔ EXACT_PRE_BALANCE ↔ ยอดหนี้เงินกู้ ↔ CAPITAL_REMAIN
-    joined_pd["BAL_PRE_EXACT_MATCH"] = (joined_pd["BAL_DSL1_PRE"] - joined_pd["BAL_DSL1_EXACT"]).abs() <= balance_tolerance
-    joined_pd["BAL_EXACT_DSL2_MATCH"] = (joined_pd["BAL_DSL1_EXACT"] - joined_pd["BAL_DSL2"]).abs() <= balance_tolerance
-    joined_pd["BAL_DSL2_PS_MATCH"] = (joined_pd["BAL_DSL2"] - joined_pd["BAL_PS"]).abs() <= balance_tolerance
-    
-    joined_pd["ALL_BALANCES_MATCH"] = (
-        joined_pd["BAL_PRE_EXACT_MATCH"] &
-        joined_pd["BAL_EXACT_DSL2_MATCH"] &
-        joined_pd["BAL_DSL2_PS_MATCH"]
+    digests: Dict[int, Dict[str, int]] = {rank: {} for rank in ranks}
+    for rank, bucket, digest in rank_digests.select("_RANK", PARTITION_COL, "_DIGEST").iter_rows():
+        digests[rank][str(bucket)] = digest
+    return digests
+
+
+def remap_file_ranks(
+    frame: pl.DataFrame,
+    row_cols: List[str],
+    rank_map: Dict[int, int]
+) -> pl.DataFrame:
+    """Move stable row-order values from their old file ranks to the new ones."""
+    old_ranks = list(rank_map)
+    new_ranks = [rank_map[rank] for rank in old_ranks]
+    return frame.with_columns([
+        (
+            (pl.col(c) // (1 << FILE_RANK_SHIFT)).replace_strict(old_ranks, new_ranks, return_dtype=pl.UInt64)
+            * (1 << FILE_RANK_SHIFT)
+            + pl.col(c) % (1 << FILE_RANK_SHIFT)
+        ).alias(c)
+        for c in row_cols if c in frame.columns
+    ])
+
+
+def reconcile_incremental(
+    dsl1_data: Union[pl.DataFrame, pl.LazyFrame],
+    dsl2_data: Union[pl.DataFrame, pl.LazyFrame],
+    ps_data: Optional[Union[pl.DataFrame, pl.LazyFrame]],
+    folders: Dict[str, Optional[Path]],
+    state_dir: Path,
+    params_fingerprint: str,
+    partitions: int = INCREMENTAL_BUCKETS,
+    workers: int = 1,
+    balance_tolerance: float = 0.01,
+    max_records: int = 100000,
+    dsl1_total_rows: Optional[int] = None,
+    streaming: bool = False,
+    ps_match: str = "all",
+    unmatched_dir: Optional[Path] = None
+) -> Tuple[ReconciliationResult, PaymentScheduleResult, ThreeWayReconciliationResult, Dict[str, Any]]:
+    """
+    Partitioned reconciliation that keeps its per-bucket results in
+    state_dir and, on the next run, recomputes only the buckets holding
+    accounts of added, replaced or removed source files.
+    
+    Every source must carry the stable row order of with_file_order().
+    state_dir records, per source file, its fingerprint and a digest of its
+    rows in every bucket (file_bucket_digests). A new or replaced file
+    touches the buckets whose digest changed, a removed file all of its
+    buckets. Untouched buckets keep their results, with row orders moved to
+    the new file ranks, and all buckets are merged as in
+    reconcile_partitioned(), so the outputs equal a full run with the same
+    number of buckets. A missing, unfinished or differently parameterized
+    state (params_fingerprint) recomputes everything.
+    
+    Args:
+        folders: source name ("dsl1", "dsl2", "ps") -> folder
+    
+    Returns:
+        The three merged results and a summary of what was recomputed
+    """
+    start_timer("incremental")
+    run_start = time.time()
+    
+    sources = {
+        "dsl1": (dsl1_data, ROW_DSL1_COL),
+        "dsl2": (dsl2_data, ROW_DSL2_COL),
+    }
+    if ps_data is not None:
+        sources["ps"] = (ps_data, ROW_PS_COL)
+    
+    for name, (frame, row_col) in sources.items():
+        if row_col not in frame.collect_schema():
+            raise ValueError(f"Incremental reconciliation needs the per-file row order of {name} (Polars loaders)")
+    
+    bucket_root = state_dir / "buckets"
+    state = load_incremental_state(state_dir)
+    reusable = (
+        state is not None
+        and state.get("version") == INCREMENTAL_STATE_VERSION
+        and state.get("params") == params_fingerprint
+        and state.get("complete", False)
+        and all((partition_dir(bucket_root, i) / INCREMENTAL_RESULTS_FILE).exists() for i in range(partitions))
+    )
+    if state is not None and not reusable:
+        log_warn("Incremental state does not match this run (parameters changed or last run unfinished), recomputing every bucket")
+    
+    touched = set() if reusable else set(range(partitions))
+    rank_maps: Dict[str, Dict[int, int]] = {}
+    file_entries: Dict[str, List[Dict[str, Any]]] = {}
+    changed_files: Dict[str, Dict[str, List[str]]] = {}
+    
+    for name, (frame, row_col) in sources.items():
+        current = folder_fingerprint(folders[name])
+        previous = state["sources"].get(name, []) if reusable else []
+        old = {entry["name"]: entry for entry in previous}
+        
+        changed_ranks = [
+            rank for rank, fp in enumerate(current)
+            if old.get(fp["name"], {}).get("hash_sha256_short") != fp["hash_sha256_short"]
+        ]
+        new_digests = file_bucket_digests(frame, row_col, changed_ranks, partitions, streaming)
+        
+        new_rank = {fp["name"]: rank for rank, fp in enumerate(current)}
+        removed = [entry for entry in previous if entry["name"] not in new_rank]
+        
+        for rank, digests in new_digests.items():
+            old_digests = old.get(current[rank]["name"], {}).get("buckets", {})
+            touched.update(
+                int(bucket) for bucket in set(digests) | set(old_digests)
+                if digests.get(bucket) != old_digests.get(bucket)
+            )
+        for entry in removed:
+            touched.update(int(bucket) for bucket in entry["buckets"])
+        
+        rank_maps[name] = {
+            old_rank: new_rank[entry["name"]]
+            for old_rank, entry in enumerate(previous) if entry["name"] in new_rank
+        }
+        
+        file_entries[name] = [
+            {
+                "name": fp["name"],
+                "size_bytes": fp["size_bytes"],
+                "hash_sha256_short": fp["hash_sha256_short"],
+                "buckets": new_digests[rank] if rank in new_digests else old[fp["name"]]["buckets"],
+            }
+            for rank, fp in enumerate(current)
+        ]
+        changed_files[name] = {
+            "changed": [current[rank]["name"] for rank in changed_ranks],
+            "removed": [entry["name"] for entry in removed],
+        }
+        
+        if reusable and (changed_ranks or removed):
+            log_recon(
+                f"Incremental: {name} has {len(changed_ranks)} new/replaced and "
+                f"{len(removed)} removed file(s)"
+            )
+    
+    recompute = sorted(touched)
+    reused = [i for i in range(partitions) if i not in touched]
+    log_flux(f"Incremental: recomputing {len(recompute)} of {partitions} account buckets, reusing {len(reused)}")
+    
+    # Mark the state unfinished first: an interrupted run must not be trusted next time
+    state_dir.mkdir(parents=True, exist_ok=True)
+    save_incremental_state(state_dir, {
+        "version": INCREMENTAL_STATE_VERSION,
+        "params": params_fingerprint,
+        "complete": False,
+        "sources": {},
+    })
+    
+    if recompute:
+        for i in recompute:
+            shutil.rmtree(partition_dir(bucket_root, i), ignore_errors=True)
+        
+        part_dirs = write_partitions(sources, partitions, bucket_root, streaming=streaming, buckets=recompute)
+        
+        parts = run_file_tasks(
+            reconcile_partition_task,
+            part_dirs,
+            workers=workers,
+            task_args=(balance_tolerance, max_records, streaming, ps_match, True)
+        )
+        
+        failed = [part_dir.name for part_dir, part in zip(part_dirs, parts) if part is None]
+        if failed:
+            raise RuntimeError(f"Incremental reconciliation failed for {', '.join(failed)}")
+        
+        for part_dir, part in zip(part_dirs, parts):
+            with open(part_dir / INCREMENTAL_RESULTS_FILE, "wb") as f:
+                pickle.dump(part, f, protocol=pickle.HIGHEST_PROTOCOL)
+            for arrow_file in part_dir.glob("*.arrow"):
+                arrow_file.unlink()
+    
+    # Reused buckets: move their row orders to the new file ranks
+    remap = {
+        row_col: rank_maps[name]
+        for name, (_, row_col) in sources.items()
+        if any(old_rank != new_rank for old_rank, new_rank in rank_maps[name].items())
+    }
+    
+    parts = []
+    for i in range(partitions):
+        part_dir = partition_dir(bucket_root, i)
+        with open(part_dir / INCREMENTAL_RESULTS_FILE, "rb") as f:
+            part = pickle.load(f)
+        
+        if remap and i in reused:
+            for result in part:
+                for name, order in result.record_order.items():
+                    for row_col, rank_map in remap.items():
+                        order = remap_file_ranks(order, [row_col], rank_map)
+                    result.record_order[name] = order
+            with open(part_dir / INCREMENTAL_RESULTS_FILE, "wb") as f:
+                pickle.dump(part, f, protocol=pickle.HIGHEST_PROTOCOL)
+            
+            for file_name, row_col in (("unmatched_dsl1.parquet", ROW_DSL1_COL), ("unmatched_ps.parquet", ROW_PS_COL)):
+                if (part_dir / file_name).exists() and row_col in remap:
+                    remap_file_ranks(pl.read_parquet(part_dir / file_name), [row_col], remap[row_col]).write_parquet(part_dir / file_name)
+        
+        parts.append(part)
+    
+    if unmatched_dir is not None:
+        part_dirs = [partition_dir(bucket_root, i) for i in range(partitions)]
+        merge_partition_reports(part_dirs, unmatched_dir, ps_data is not None, streaming)
+    
+    results = [merge_partition_results([part[k] for part in parts], max_records) for k in range(3)]
+    for result in results:
+        result.start_time = run_start
+        result.end_time = time.time()
+    
+    dsl1_result, ps_result, three_way_result = results
+    if dsl1_total_rows is not None:
+        dsl1_result.total_dsl1_rows = dsl1_total_rows
+    
+    save_incremental_state(state_dir, {
+        "version": INCREMENTAL_STATE_VERSION,
+        "params": params_fingerprint,
+        "complete": True,
+        "updated_at": datetime.now().isoformat(),
+        "sources": file_entries,
+    })
+    
+    summary = {
+        "buckets": partitions,
+        "recomputed_buckets": len(recompute),
+        "full_rebuild": not reusable,
+        "files": changed_files,
+    }
+    
+    log_secure(f"Incremental reconciliation complete: {len(recompute)} of {partitions} buckets recomputed", "incremental")
+    
+    return dsl1_result, ps_result, three_way_result, summary
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# DUCKDB ENGINE: SQL RECONCILIATION WITH SPILL-TO-DISK
+# ══════════════════════════════════════════════════════════════════════════════
+
+ENGINES = ["polars", "duckdb"]
+
+# Missing dates sort before / after every real date in the as-of join
+ASOF_MIN_DATE_SQL = "DATE '0001-01-01'"
+ASOF_MAX_DATE_SQL = "DATE '9999-12-31'"
+
+
+def duckdb_connect(work_dir: Path, memory_limit_gb: Optional[float] = None) -> "duckdb.DuckDBPyConnection":
+    """
+    Embedded DuckDB database in work_dir. Joins, sorts and aggregates that
+    outgrow memory_limit_gb spill to work_dir/spill.
+    """
+    work_dir.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(str(work_dir / "reconcile.duckdb"))
+    con.execute(f"SET temp_directory = {sql_literal(str(work_dir / 'spill'))}")
+    if memory_limit_gb:
+        con.execute(f"SET memory_limit = '{memory_limit_gb}GB'")
+    return con
+
+
+def sql_literal(value: str) -> str:
+    """Single-quoted SQL string literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def duckdb_register(
+    con: "duckdb.DuckDBPyConnection",
+    name: str,
+    lf: pl.LazyFrame,
+    work_dir: Path,
+    streaming: bool
+) -> None:
+    """
+    Expose a projected source to DuckDB as view `name`: an Arrow table handed
+    over without copying, or (streaming) a Parquet file sunk from the lazy
+    plan so the source is never materialized in Python.
+    """
+    if streaming:
+        path = work_dir / f"{name}.parquet"
+        lf.sink_parquet(path, engine="streaming")
+        con.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet({sql_literal(str(path))})")
+    else:
+        con.register(name, lf.collect().to_arrow())
+
+
+def sql_dates_in_range(*date_cols: str) -> str:
+    """SQL twin of dates_in_range_expr()."""
+    return " AND ".join(f"coalesce(year({c}) BETWEEN 1900 AND 2100, false)" for c in date_cols)
+
+
+def sql_date_diff_days(valid: str, later_col: str, earlier_col: str) -> str:
+    """SQL twin of date_diff_days_expr()."""
+    return f"CASE WHEN {valid} THEN abs(date_diff('day', {earlier_col}, {later_col})) ELSE 0 END"
+
+
+def sql_balance_diff_pct(diff_col: str, base_col: str, other_col: str) -> str:
+    """SQL twin of balance_diff_pct_expr()."""
+    return (
+        f"CASE WHEN {base_col} <> 0 THEN abs({diff_col}) / abs({base_col}) * 100 "
+        f"WHEN {other_col} <> 0 THEN 100.0 ELSE 0.0 END"
     )
+
+
+def sql_iso_date(date_col: str) -> str:
+    """SQL twin of iso_date_expr()."""
+    return f"coalesce(strftime({date_col}, '%Y-%m-%d'), '')"
+
+
+def sql_match_categories(date_ok: str, bal_ok: str, scope: str = "TRUE") -> List[str]:
+    """SQL twin of match_category_exprs()."""
+    return [
+        f"count(*) FILTER (WHERE {scope} AND NOT {date_ok} AND {bal_ok}) AS date_only",
+        f"count(*) FILTER (WHERE {scope} AND {date_ok} AND NOT {bal_ok}) AS bal_only",
+        f"count(*) FILTER (WHERE {scope} AND NOT {date_ok} AND NOT {bal_ok}) AS both",
+        f"count(*) FILTER (WHERE {scope} AND {date_ok} AND {bal_ok}) AS perfect",
+    ]
+
+
+def sql_error_stats(value: str, where: str, order: str, name: str, percentiles: bool = True) -> List[str]:
+    """SQL twin of error_stats_exprs(): the values as one ordered list plus their statistics."""
+    exprs = [
+        f"list({value} ORDER BY {order}) FILTER (WHERE {where}) AS {name}",
+        f"avg({value}) FILTER (WHERE {where}) AS {name}_mean",
+        f"median({value}) FILTER (WHERE {where}) AS {name}_median",
+        f"stddev_pop({value}) FILTER (WHERE {where}) AS {name}_std",
+        f"min({value}) FILTER (WHERE {where}) AS {name}_min",
+        f"max({value}) FILTER (WHERE {where}) AS {name}_max",
+    ]
+    if percentiles:
+        exprs += [
+            f"quantile_cont({value}, 0.95) FILTER (WHERE {where}) AS {name}_p95",
+            f"quantile_cont({value}, 0.99) FILTER (WHERE {where}) AS {name}_p99",
+        ]
+    return exprs
+
+
+def duckdb_records(
+    con: "duckdb.DuckDBPyConnection",
+    table: str,
+    columns: List[str],
+    where: str,
+    order_cols: List[str],
+    n: int
+) -> pl.DataFrame:
+    """First n rows of table (in source row order) formatted as detailed records, with the order columns."""
+    return con.sql(
+        f"SELECT {', '.join(order_cols + columns)} FROM {table} "
+        f"WHERE {where} ORDER BY {', '.join(order_cols)} LIMIT {int(n)}"
+    ).pl()
+
+
+def duckdb_account_list(
+    con: "duckdb.DuckDBPyConnection",
+    source: str,
+    acc_col: str,
+    row_col: str,
+    work_dir: Path,
+    path: Path
+) -> int:
+    """
+    Key-only anti-join of source against DSL2. Writes the distinct unmatched
+    accounts (in source order) to path via a spilled Parquet file and
+    returns the number of distinct unmatched accounts.
+    """
+    unmatched = f"SELECT KEY, {acc_col} AS ACC_NO, {row_col} FROM {source} ANTI JOIN dsl2 USING (KEY)"
+    
+    if path is not None:
+        spilled = work_dir / f"unmatched_{source}.parquet"
+        con.execute(
+            f"COPY (SELECT ACC_NO, {row_col} FROM ({unmatched}) "
+            f"QUALIFY row_number() OVER (PARTITION BY KEY ORDER BY {row_col}) = 1) "
+            f"TO {sql_literal(str(spilled))} (FORMAT parquet)"
+        )
+        pl.scan_parquet(spilled).sort(row_col).drop(row_col).sink_csv(path, include_bom=True)
     
-    # Perfect match: all dates AND all balances match
-    joined_pd["PERFECT_MATCH"] = joined_pd["ALL_DATES_MATCH"] & joined_pd["ALL_BALANCES_MATCH"]
-    
-    update_progress()
-    
-    # Count results
-    result.perfect_matches = int(joined_pd["PERFECT_MATCH"].sum())
-    result.date_mismatches = int((~joined_pd["ALL_DATES_MATCH"] & joined_pd["ALL_BALANCES_MATCH"]).sum())
-    result.balance_mismatches = int((joined_pd["ALL_DATES_MATCH"] & ~joined_pd["ALL_BALANCES_MATCH"]).sum())
-    result.both_mismatches = int((~joined_pd["ALL_DATES_MATCH"] & ~joined_pd["ALL_BALANCES_MATCH"]).sum())
-    
-    log_info(f"Perfect matches (all dates & balances equal): {result.perfect_matches:,}")
-    log_info(f"Date mismatches only: {result.date_mismatches:,}")
-    log_info(f"Balance mismatches only: {result.balance_mismatches:,}")
-    log_info(f"Both mismatched: {result.both_mismatches:,}")
+    return con.sql(f"SELECT count(*) FROM (SELECT DISTINCT KEY FROM ({unmatched}))").fetchone()[0]
+
+
+def duckdb_account_outcomes(
+    con: "duckdb.DuckDBPyConnection",
+    table: str,
+    acc_col: str,
+    date_ok: str,
+    bal_ok: str,
+    bal_diff: Optional[str],
+    where: str,
+    path: Path
+) -> None:
+    """SQL twin of account_outcomes(): per-account outcomes of the rows of table matching where, written to path."""
+    max_diff = f"max(abs({bal_diff}))" if bal_diff else "CAST(NULL AS DOUBLE)"
+    con.execute(f"""
+        COPY (
+            SELECT *,
+                   CASE WHEN DATE_MISMATCHES > 0 AND BALANCE_MISMATCHES > 0 THEN 'both'
+                        WHEN DATE_MISMATCHES > 0 THEN 'date'
+                        WHEN BALANCE_MISMATCHES > 0 THEN 'balance'
+                        ELSE 'perfect' END AS STATUS
+            FROM (
+                SELECT ACC_KEY AS {ACC_KEY_COL},
+                       min({acc_col}) AS ACC_NO,
+                       count(*) AS ROWS,
+                       count(*) FILTER (WHERE NOT {date_ok}) AS DATE_MISMATCHES,
+                       count(*) FILTER (WHERE NOT {bal_ok}) AS BALANCE_MISMATCHES,
+                       {max_diff} AS MAX_ABS_BAL_DIFF
+                FROM {table}
+                WHERE {where}
+                GROUP BY ACC_KEY
+            )
+            ORDER BY {ACC_KEY_COL}
+        ) TO {sql_literal(str(path))} (FORMAT parquet)
+    """)
+
+
+def reconcile_duckdb(
+    dsl1_data: Union[pl.DataFrame, pl.LazyFrame],
+    dsl2_data: Union[pl.DataFrame, pl.LazyFrame],
+    ps_data: Optional[Union[pl.DataFrame, pl.LazyFrame]],
+    work_dir: Path,
+    balance_tolerance: float = 0.01,
+    max_records: int = 100000,
+    dsl1_total_rows: Optional[int] = None,
+    streaming: bool = False,
+    ps_match: str = "all",
+    unmatched_dir: Optional[Path] = None,
+    memory_limit_gb: Optional[float] = None
+) -> Tuple[ReconciliationResult, PaymentScheduleResult, ThreeWayReconciliationResult]:
+    """
+    Run all reconciliations as SQL in an embedded DuckDB database and return
+    the same result objects as the Polars engine.
+    
+    dsl1_data must already be filtered to GROUP_FLAG = 1. Each source is
+    narrowed to the compared columns (plus a row-order column, so samples
+    come out in the same order as the Polars engine) and handed to DuckDB;
+    comparison tables live in the database file under work_dir, and DuckDB's
+    out-of-core joins and aggregates spill next to it. The SQL mirrors the
+    Polars expressions, so both engines can cross-check each other. With
+    unmatched_dir the unmatched account reports and per-account outcomes
+    are written there.
+    """
+    if not DUCKDB_AVAILABLE:
+        raise ImportError("DuckDB is required for --engine duckdb. Install via: pip install duckdb")
     
-    update_progress()
+    start_timer("duckdb")
+    log_flux("Starting DuckDB reconciliation...")
     
-    # Collect perfect match records
-    log_flux(f"Collecting perfect match records (max {max_records:,})...")
-    
-    perfect_rows = joined_pd[joined_pd["PERFECT_MATCH"]].head(max_records)
-    
-    for _, row in perfect_rows.iterrows():
-        record = {
-            "ACC_NO": str(row.get("ACC_NO", "")),
-            "DATE_DSL1": format_date_iso(row.get("DATE_DSL1", "")),
-            "DATE_DSL2": str(row.get("วันที่เริ่มชำระหนี้", "")),
-            "DATE_PS": format_date_iso(row.get("DATE_PS", "")),
-            "BAL_DSL1_PRE": float(row.get("BAL_DSL1_PRE", 0)),
-            "BAL_DSL1_EXACT": float(row.get("BAL_DSL1_EXACT", 0)),
-            "BAL_DSL2": float(row.get("BAL_DSL2", 0)),
-            "BAL_PS": float(row.get("BAL_PS", 0)),
-        }
-        result.perfect_match_records.append(record)
-    
-    # Collect discrepancy records
-    discrepancy_rows = joined_pd[~joined_pd["PERFECT_MATCH"]].head(max_records)
-    
-    for _, row in discrepancy_rows.iterrows():
-        record = {
-            "ACC_NO": str(row.get("ACC_NO", "")),
-            "DATE_DSL1": format_date_iso(row.get("DATE_DSL1", "")),
-            "DATE_DSL2": str(row.get("วันที่เริ่มชำระหนี้", "")),
-            "DATE_PS": format_date_iso(row.get("DATE_PS", "")),
-            "ALL_DATES_MATCH": bool(row.get("ALL_DATES_MATCH", False)),
-            "BAL_DSL1_PRE": float(row.get("BAL_DSL1_PRE", 0)),
-            "BAL_DSL1_EXACT": float(row.get("BAL_DSL1_EXACT", 0)),
-            "BAL_DSL2": float(row.get("BAL_DSL2", 0)),
-            "BAL_PS": float(row.get("BAL_PS", 0)),
-            "ALL_BALANCES_MATCH": bool(row.get("ALL_BALANCES_MATCH", False)),
-        }
-        result.discrepancy_records.append(record)
+    tol = float(balance_tolerance)
+    dsl1_result = ReconciliationResult()
+    ps_result = PaymentScheduleResult()
+    three_way_result = ThreeWayReconciliationResult()
+    dsl1_result.start_time = ps_result.start_time = three_way_result.start_time = time.time()
     
-    log_info(f"Collected {len(result.perfect_match_records):,} perfect match records")
-    log_info(f"Collected {len(result.discrepancy_records):,} discrepancy records")
+    dsl1 = ensure_balances(ensure_dsl1_dates(ensure_account_key(dsl1_data, "ACC_NO")), DSL1_BALANCE_COLS)
+    dsl2 = ensure_balances(ensure_dsl2_dates(ensure_account_key(dsl2_data, "เลขบัญชี")), DSL2_BALANCE_COLS)
+    frames = [dsl1, dsl2]
+    if ps_data is not None:
+        ps = ensure_balances(ensure_ps_dates(ensure_account_key(ps_data, "ACC_NO")), PS_BALANCE_COLS)
+        frames.append(ps)
     
-    update_progress()
+    join_key = join_key_for(*frames)
+    exact_bal = pl.col("EXACT_BAL") if "EXACT_BAL" in dsl1.collect_schema() else pl.col("BAL_DSL1")
     
-    result.end_time = time.time()
+    try:
+        con = duckdb_connect(work_dir, memory_limit_gb)
+        
+        # Narrow, uniformly named sources
+        duckdb_register(con, "dsl1", with_row_order(dsl1.lazy(), ROW_DSL1_COL).select([
+            pl.col(join_key).alias("KEY"),
+            pl.col(ACC_KEY_COL).alias("ACC_KEY"),
+            pl.col("ACC_NO").cast(pl.Utf8).alias("ACC_NO_DSL1"),
+            pl.col("DATE_DSL1"),
+            pl.col("BAL_DSL1"),
+            exact_bal.alias("EXACT_BAL"),
+            pl.col(ROW_DSL1_COL),
+        ]), work_dir, streaming)
+        duckdb_register(con, "dsl2", with_row_order(dsl2.lazy(), ROW_DSL2_COL).select([
+            pl.col(join_key).alias("KEY"),
+            pl.col(ACC_KEY_COL).alias("ACC_KEY"),
+            pl.col("เลขบัญชี").cast(pl.Utf8).alias("ACC_NO_DSL2"),
+            pl.col("วันที่เริ่มชำระหนี้").cast(pl.Utf8).alias("DATE_DSL2_RAW"),
+            pl.col("DATE_DSL2"),
+            pl.col("BAL_DSL2"),
+            pl.col(ROW_DSL2_COL),
+        ]), work_dir, streaming)
+        if ps_data is not None:
+            duckdb_register(con, "ps", with_row_order(ps.lazy(), ROW_PS_COL).select([
+                pl.col(join_key).alias("KEY"),
+                pl.col(ACC_KEY_COL).alias("ACC_KEY"),
+                pl.col("ACC_NO").cast(pl.Utf8).alias("ACC_NO_PS"),
+                pl.col("DATE_PS"),
+                pl.col("BAL_PS"),
+                pl.col(ROW_PS_COL),
+            ]), work_dir, streaming)
+        
+        log_info("Sources registered", "duckdb")
+        
+        # ── DSL1 vs DSL2 ──────────────────────────────────────────────────────
+        log_flux("DuckDB: DSL1 vs DSL2...")
+        con.execute(f"""
+            CREATE TABLE dsl1_cmp AS
+            WITH joined AS (
+                SELECT dsl2.*, d1.ACC_NO_DSL1, d1.DATE_DSL1, d1.BAL_DSL1, d1.EXACT_BAL, d1.{ROW_DSL1_COL},
+                       d1.{ROW_DSL1_COL} IS NOT NULL AS IN_MATCHED,
+                       d1.DATE_DSL1 IS NOT NULL AND dsl2.DATE_DSL2 IS NOT NULL AS DATES_VALID
+                FROM dsl2 LEFT JOIN dsl1 d1 USING (KEY)
+            ), diffs AS (
+                SELECT *,
+                       coalesce(DATES_VALID AND DATE_DSL1 = DATE_DSL2, false) AS DATE_MATCH,
+                       {sql_date_diff_days("DATES_VALID", "DATE_DSL2", "DATE_DSL1")} AS DATE_DIFF_DAYS,
+                       BAL_DSL2 - BAL_DSL1 AS BAL_DIFF,
+                       BAL_DSL2 - EXACT_BAL AS EXACT_VS_DSL2_DIFF,
+                       BAL_DSL1 - EXACT_BAL AS EXACT_VS_PRE_DIFF,
+                       BAL_DSL1 < EXACT_BAL AS IS_DEBT_SEPARATION
+                FROM joined
+            )
+            SELECT *,
+                   {sql_balance_diff_pct("BAL_DIFF", "BAL_DSL1", "BAL_DSL2")} AS BAL_DIFF_PCT,
+                   abs(BAL_DIFF) <= {tol!r} AS BAL_MATCH,
+                   abs(EXACT_VS_DSL2_DIFF) <= {tol!r} AS EXACT_VS_DSL2_MATCH,
+                   abs(EXACT_VS_PRE_DIFF) <= {tol!r} AS EXACT_VS_PRE_MATCH
+            FROM diffs
+        """)
+        
+        order = f"{ROW_DSL2_COL}, {ROW_DSL1_COL}"
+        in_errors = "IN_MATCHED AND (NOT DATE_MATCH OR NOT BAL_MATCH)"
+        summary = con.sql(f"""
+            SELECT
+                (SELECT count(*) FROM dsl1) AS dsl1_rows,
+                (SELECT count(*) FROM dsl2) AS dsl2_rows,
+                count(*) FILTER (WHERE IN_MATCHED) AS matched,
+                count(*) FILTER (WHERE NOT IN_MATCHED) AS unmatched,
+                {", ".join(sql_match_categories("DATE_MATCH", "BAL_MATCH", "IN_MATCHED"))},
+                count(*) FILTER (WHERE IN_MATCHED AND NOT EXACT_VS_DSL2_MATCH) AS exact_vs_dsl2,
+                count(*) FILTER (WHERE IN_MATCHED AND NOT EXACT_VS_PRE_MATCH) AS exact_vs_pre,
+                count(*) FILTER (WHERE IN_MATCHED AND IS_DEBT_SEPARATION) AS debt_separation,
+                {", ".join(sql_error_stats("BAL_DIFF", in_errors, order, "balance_errors"))},
+                {", ".join(sql_error_stats("DATE_DIFF_DAYS", in_errors + " AND DATES_VALID", order, "date_diff_days", percentiles=False))},
+                list(EXACT_VS_DSL2_DIFF ORDER BY {order}) FILTER (WHERE IN_MATCHED AND NOT EXACT_VS_DSL2_MATCH) AS EXACT_VS_DSL2_DIFF,
+                list(EXACT_VS_PRE_DIFF ORDER BY {order}) FILTER (WHERE IN_MATCHED AND NOT EXACT_VS_PRE_MATCH) AS EXACT_VS_PRE_DIFF
+            FROM dsl1_cmp
+        """).pl()
+        
+        result = dsl1_result
+        result.total_dsl1_filtered_rows = summary["dsl1_rows"].item()
+        result.total_dsl1_rows = dsl1_total_rows if dsl1_total_rows is not None else result.total_dsl1_filtered_rows
+        result.total_dsl2_rows = summary["dsl2_rows"].item()
+        result.matched_rows = summary["matched"].item()
+        result.unmatched_dsl2 = summary["unmatched"].item()
+        result.date_mismatches = summary["date_only"].item()
+        result.balance_mismatches = summary["bal_only"].item()
+        result.both_mismatches = summary["both"].item()
+        result.perfect_matches = summary["perfect"].item()
+        result.exact_vs_dsl2_mismatches = summary["exact_vs_dsl2"].item()
+        result.exact_vs_pre_mismatches = summary["exact_vs_pre"].item()
+        result.debt_separation_cases = summary["debt_separation"].item()
+        result.balance_errors, result.error_stats["balance"] = read_error_stats(summary, "balance_errors")
+        result.date_diff_days, result.error_stats["date_diff"] = read_error_stats(summary, "date_diff_days")
+        result.date_diff_days = result.date_diff_days.astype(int)
+        result.exact_vs_dsl2_errors = summary["EXACT_VS_DSL2_DIFF"].explode().drop_nulls().to_numpy()
+        result.exact_vs_pre_errors = summary["EXACT_VS_PRE_DIFF"].explode().drop_nulls().to_numpy()
+        
+        order_cols = [ROW_DSL2_COL, ROW_DSL1_COL]
+        store_records(result, "error_records", duckdb_records(con, "dsl1_cmp", [
+            "ACC_NO_DSL2 AS ACC_NO",
+            f"{sql_iso_date('DATE_DSL1')} AS DATE_DSL1",
+            "coalesce(DATE_DSL2_RAW, 'nan') AS DATE_DSL2",
+            "DATE_MATCH",
+            "CAST(DATE_DIFF_DAYS AS BIGINT) AS DATE_DIFF_DAYS",
+            "BAL_DSL1", "BAL_DSL2", "BAL_MATCH", "BAL_DIFF",
+            "round(BAL_DIFF_PCT, 4) AS BAL_DIFF_PCT",
+            "EXACT_BAL", "EXACT_VS_DSL2_DIFF", "EXACT_VS_PRE_DIFF", "IS_DEBT_SEPARATION",
+        ], in_errors, order_cols, max_records), order_cols)
+        store_records(result, "debt_separation_records", duckdb_records(con, "dsl1_cmp", [
+            "ACC_NO_DSL2 AS ACC_NO",
+            "BAL_DSL1 AS PRE_BALANCE",
+            "EXACT_BAL AS EXACT_PRE_BALANCE",
+            "EXACT_VS_PRE_DIFF AS DIFFERENCE",
+            "BAL_DSL2 AS DSL2_BALANCE",
+            "'แยกหนี้ - PRE_BALANCE < EXACT_PRE_BALANCE' AS REMARK",
+        ], "IN_MATCHED AND IS_DEBT_SEPARATION", order_cols, max_records), order_cols)
+        
+        result.unmatched_dsl1 = duckdb_account_list(
+            con, "dsl1", "ACC_NO_DSL1", ROW_DSL1_COL, work_dir,
+            unmatched_dir / UNMATCHED_DSL1_FILE if unmatched_dir else None
+        )
+        if unmatched_dir:
+            duckdb_account_outcomes(
+                con, "dsl1_cmp", "ACC_NO_DSL2", "DATE_MATCH", "BAL_MATCH", "BAL_DIFF", "IN_MATCHED",
+                unmatched_dir / ACCOUNT_OUTCOME_FILES["dsl1_vs_dsl2"]
+            )
+        result.end_time = time.time()
+        log_info(f"DSL1 vs DSL2: {result.matched_rows:,} matched, {len(result.error_records):,} error records")
+        
+        if ps_data is not None:
+            # ── Payment Schedule vs DSL2 ──────────────────────────────────────
+            log_flux("DuckDB: Payment Schedule vs DSL2...")
+            ps_cols = f"p.ACC_NO_PS, p.DATE_PS, p.BAL_PS, p.{ROW_PS_COL}"
+            if ps_match == "asof":
+                # First installment due on/after the DSL2 date, else the last one before it
+                joined = f"""
+                    d AS (SELECT *, coalesce(DATE_DSL2, {ASOF_MIN_DATE_SQL}) AS ASOF_DATE FROM dsl2),
+                    p AS (SELECT *, coalesce(DATE_PS, {ASOF_MAX_DATE_SQL}) AS ASOF_DATE FROM ps),
+                    forward AS (
+                        SELECT d.* EXCLUDE (ASOF_DATE), {ps_cols}
+                        FROM d ASOF LEFT JOIN p ON d.KEY = p.KEY AND d.ASOF_DATE <= p.ASOF_DATE
+                    ),
+                    backward AS (
+                        SELECT d.* EXCLUDE (ASOF_DATE), {ps_cols}
+                        FROM (SELECT * FROM d SEMI JOIN (SELECT {ROW_DSL2_COL} FROM forward WHERE {ROW_PS_COL} IS NULL) USING ({ROW_DSL2_COL})) d
+                        ASOF LEFT JOIN p ON d.KEY = p.KEY AND d.ASOF_DATE >= p.ASOF_DATE
+                    ),
+                    joined AS (
+                        SELECT * FROM forward WHERE {ROW_PS_COL} IS NOT NULL
+                        UNION ALL BY NAME
+                        SELECT * FROM backward
+                    )
+                """
+            else:
+                joined = f"joined AS (SELECT dsl2.*, {ps_cols} FROM dsl2 LEFT JOIN ps p USING (KEY))"
+            
+            valid = sql_dates_in_range("DATE_PS", "DATE_DSL2")
+            con.execute(f"""
+                CREATE TABLE ps_cmp AS
+                WITH {joined},
+                diffs AS (
+                    SELECT *,
+                           {ROW_PS_COL} IS NOT NULL AS IN_MATCHED,
+                           {valid} AS DATES_VALID,
+                           coalesce({valid} AND DATE_PS = DATE_DSL2, false) AS DATE_MATCH,
+                           {sql_date_diff_days(valid, "DATE_DSL2", "DATE_PS")} AS DATE_DIFF_DAYS,
+                           BAL_DSL2 - BAL_PS AS BAL_DIFF
+                    FROM joined
+                )
+                SELECT *,
+                       {sql_balance_diff_pct("BAL_DIFF", "BAL_PS", "BAL_DSL2")} AS BAL_DIFF_PCT,
+                       abs(BAL_DIFF) <= {tol!r} AS BAL_MATCH
+                FROM diffs
+            """)
+            
+            order = f"{ROW_DSL2_COL}, {ROW_PS_COL}"
+            summary = con.sql(f"""
+                SELECT
+                    (SELECT count(*) FROM ps) AS ps_rows,
+                    (SELECT count(*) FROM dsl2) AS dsl2_rows,
+                    count(*) FILTER (WHERE IN_MATCHED) AS matched,
+                    count(*) FILTER (WHERE NOT IN_MATCHED) AS unmatched,
+                    {", ".join(sql_match_categories("DATE_MATCH", "BAL_MATCH", "IN_MATCHED"))},
+                    {", ".join(sql_error_stats("BAL_DIFF", in_errors, order, "balance_errors"))},
+                    list(DATE_DIFF_DAYS ORDER BY {order}) FILTER (WHERE {in_errors} AND DATES_VALID) AS date_diff_days
+                FROM ps_cmp
+            """).pl()
+            
+            result = ps_result
+            result.match_mode = ps_match
+            result.total_ps_rows = summary["ps_rows"].item()
+            result.total_dsl2_rows = summary["dsl2_rows"].item()
+            result.matched_rows = summary["matched"].item()
+            result.unmatched_dsl2 = summary["unmatched"].item()
+            result.date_mismatches = summary["date_only"].item()
+            result.balance_mismatches = summary["bal_only"].item()
+            result.both_mismatches = summary["both"].item()
+            result.perfect_matches = summary["perfect"].item()
+            result.balance_errors, result.error_stats["balance"] = read_error_stats(summary, "balance_errors")
+            result.date_diff_days = summary["date_diff_days"].explode().drop_nulls().to_numpy().astype(int)
+            
+            order_cols = [ROW_DSL2_COL, ROW_PS_COL]
+            store_records(result, "error_records", duckdb_records(con, "ps_cmp", [
+                "ACC_NO_DSL2 AS ACC_NO",
+                f"{sql_iso_date('DATE_PS')} AS DATE_PS",
+                "coalesce(DATE_DSL2_RAW, 'nan') AS DATE_DSL2",
+                "DATE_MATCH",
+                "CAST(DATE_DIFF_DAYS AS BIGINT) AS DATE_DIFF_DAYS",
+                "BAL_PS", "BAL_DSL2", "BAL_MATCH", "BAL_DIFF",
+                "round(BAL_DIFF_PCT, 4) AS BAL_DIFF_PCT",
+            ], in_errors, order_cols, max_records), order_cols)
+            
+            result.unmatched_ps = duckdb_account_list(
+                con, "ps", "ACC_NO_PS", ROW_PS_COL, work_dir,
+                unmatched_dir / UNMATCHED_PS_FILE if unmatched_dir else None
+            )
+            if unmatched_dir:
+                duckdb_account_outcomes(
+                    con, "ps_cmp", "ACC_NO_DSL2", "DATE_MATCH", "BAL_MATCH", "BAL_DIFF", "IN_MATCHED",
+                    unmatched_dir / ACCOUNT_OUTCOME_FILES["ps_vs_dsl2"]
+                )
+            result.end_time = time.time()
+            log_info(f"Payment Schedule vs DSL2: {result.matched_rows:,} matched, {len(result.error_records):,} error records")
+            
+            # ── Three-way (DuckDB's optimizer picks the join order) ──────────
+            log_flux("DuckDB: Three-way reconciliation...")
+            valid = sql_dates_in_range("DATE_DSL1", "DATE_DSL2", "DATE_PS")
+            con.execute(f"""
+                CREATE TABLE three_way_cmp AS
+                WITH compared AS (
+                    SELECT d1.ACC_NO_DSL1 AS ACC_NO, d1.ACC_KEY, d1.DATE_DSL1, d2.DATE_DSL2_RAW, d2.DATE_DSL2, p.DATE_PS,
+                           d1.BAL_DSL1 AS BAL_DSL1_PRE, d1.EXACT_BAL AS BAL_DSL1_EXACT, d2.BAL_DSL2, p.BAL_PS,
+                           d1.{ROW_DSL1_COL}, d2.{ROW_DSL2_COL}, p.{ROW_PS_COL},
+                           coalesce({valid} AND d1.DATE_DSL1 = d2.DATE_DSL2 AND d2.DATE_DSL2 = p.DATE_PS, false) AS ALL_DATES_MATCH,
+                           abs(d1.BAL_DSL1 - d1.EXACT_BAL) <= {tol!r}
+                               AND abs(d1.EXACT_BAL - d2.BAL_DSL2) <= {tol!r}
+                               AND abs(d2.BAL_DSL2 - p.BAL_PS) <= {tol!r} AS ALL_BALANCES_MATCH
+                    FROM dsl1 d1 JOIN dsl2 d2 USING (KEY) JOIN ps p USING (KEY)
+                )
+                SELECT *, ALL_DATES_MATCH AND ALL_BALANCES_MATCH AS PERFECT_MATCH FROM compared
+            """)
+            
+            counts = con.sql(f"""
+                SELECT count(*) AS matched, {", ".join(sql_match_categories("ALL_DATES_MATCH", "ALL_BALANCES_MATCH"))}
+                FROM three_way_cmp
+            """).pl()
+            
+            result = three_way_result
+            result.total_dsl1_filtered_rows = dsl1_result.total_dsl1_filtered_rows
+            result.total_dsl2_rows = dsl1_result.total_dsl2_rows
+            result.total_ps_rows = ps_result.total_ps_rows
+            result.matched_all_three = counts["matched"].item()
+            result.perfect_matches = counts["perfect"].item()
+            result.date_mismatches = counts["date_only"].item()
+            result.balance_mismatches = counts["bal_only"].item()
+            result.both_mismatches = counts["both"].item()
+            
+            record_cols = [
+                "ACC_NO",
+                f"{sql_iso_date('DATE_DSL1')} AS DATE_DSL1",
+                "coalesce(DATE_DSL2_RAW, 'nan') AS DATE_DSL2",
+                f"{sql_iso_date('DATE_PS')} AS DATE_PS",
+            ]
+            balance_cols = ["BAL_DSL1_PRE", "BAL_DSL1_EXACT", "BAL_DSL2", "BAL_PS"]
+            order_cols = [ROW_DSL1_COL, ROW_DSL2_COL, ROW_PS_COL]
+            store_records(result, "perfect_match_records", duckdb_records(
+                con, "three_way_cmp", record_cols + balance_cols, "PERFECT_MATCH", order_cols, max_records
+            ), order_cols)
+            store_records(result, "discrepancy_records", duckdb_records(
+                con, "three_way_cmp", record_cols + ["ALL_DATES_MATCH"] + balance_cols + ["ALL_BALANCES_MATCH"],
+                "NOT PERFECT_MATCH", order_cols, max_records
+            ), order_cols)
+            if unmatched_dir:
+                duckdb_account_outcomes(
+                    con, "three_way_cmp", "ACC_NO", "ALL_DATES_MATCH", "ALL_BALANCES_MATCH", None, "true",
+                    unmatched_dir / ACCOUNT_OUTCOME_FILES["three_way"]
+                )
+            result.end_time = time.time()
+            log_info(f"Three-way: {result.matched_all_three:,} matched in all three sources")
+        
+        con.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
     
-    log_secure(f"Three-Way Reconciliation complete", "reconcile_three_way")
+    log_secure("DuckDB reconciliation complete", "duckdb")
     
-    return result
+    return dsl1_result, ps_result, three_way_result
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -2190,6 +4548,18 @@ def iso_converter(o: Any) -> str:
     raise TypeError(f"Object of type {type(o)} is not JSON serializable")
 
 
+def write_records_csv(records: pl.DataFrame, csv_path: Path) -> None:
+    """
+    Write a record frame as UTF-8-SIG CSV straight from Arrow memory. Flags
+    and empty text keep the spelling of the earlier pandas-written reports
+    (True/False, and an unquoted empty field).
+    """
+    records.with_columns(
+        pl.col(pl.Utf8).replace("", None),
+        pl.col(pl.Boolean).replace_strict({True: "True", False: "False"}, return_dtype=pl.Utf8),
+    ).write_csv(csv_path, include_bom=True)
+
+
 def generate_nexus_artifact(
     combined_result: CombinedReconciliationResult,
     output_path: Path,
@@ -2230,12 +4600,12 @@ def generate_nexus_artifact(
     
     # Prepare scatter plot data (balance errors vs date differences)
     scatter_data = []
-    for i, record in enumerate(dsl1_result.error_records[:500]):
-        scatter_data.append({
-            "x": record.get("BAL_DIFF", 0),
-            "y": record.get("DATE_DIFF_DAYS", 0),
-            "acc_no": record.get("ACC_NO", ""),
-        })
+    if dsl1_result.error_records.height:
+        scatter_data = dsl1_result.error_records.head(500).select(
+            pl.col("BAL_DIFF").alias("x"),
+            pl.col("DATE_DIFF_DAYS").alias("y"),
+            pl.col("ACC_NO").alias("acc_no"),
+        ).to_dicts()
     
     # Prepare histogram data for balance errors
     histogram_data = {"values": [], "edges": []}
@@ -2289,14 +4659,14 @@ def generate_nexus_artifact(
             "error_count": len(dsl1_result.error_records) + len(ps_result.error_records),
         },
         "errors": {
-            "dsl1_vs_dsl2": dsl1_result.error_records[:1000],
-            "ps_vs_dsl2": ps_result.error_records[:1000],
-            "debt_separation": dsl1_result.debt_separation_records[:500],
-            "dsl2_conflicts": dsl2_preprocess.conflict_records[:500],
-            "three_way_discrepancies": three_way_result.discrepancy_records[:500],
+            "dsl1_vs_dsl2": dsl1_result.error_records.head(1000).to_dicts(),
+            "ps_vs_dsl2": ps_result.error_records.head(1000).to_dicts(),
+            "debt_separation": dsl1_result.debt_separation_records.head(500).to_dicts(),
+            "dsl2_conflicts": dsl2_preprocess.conflict_records.head(500).to_dicts(),
+            "three_way_discrepancies": three_way_result.discrepancy_records.head(500).to_dicts(),
         },
         "perfect_matches": {
-            "three_way": three_way_result.perfect_match_records[:1000],
+            "three_way": three_way_result.perfect_match_records.head(1000).to_dicts(),
         },
         "viz": {
             # Radar chart with 4 metrics (no velocity)
@@ -3997,6 +6367,16 @@ def generate_full_html_content(b64_data: str) -> str:
 # MANIFEST GENERATION
 # ══════════════════════════════════════════════════════════════════════════════
 
+def manifest_file_entry(file_path: Path) -> Dict[str, Any]:
+    """Manifest record for one input file (reuses the memoized fingerprint)."""
+    fp = file_fingerprint(file_path)
+    return {
+        "name": fp["name"],
+        "size_bytes": fp["size_bytes"],
+        "hash_sha256_short": fp["hash_sha256_short"],
+    }
+
+
 def generate_manifest(
     combined_result: CombinedReconciliationResult,
     dsl1_folder: Path,
@@ -4030,6 +6410,9 @@ def generate_manifest(
             "csv_dsl2_conflicts": "dsl2_conflicts.csv",
             "csv_three_way_perfect": "three_way_perfect_matches.csv",
             "csv_three_way_discrepancies": "three_way_discrepancies.csv",
+            "csv_unmatched_dsl1": UNMATCHED_DSL1_FILE,
+            "csv_unmatched_ps": UNMATCHED_PS_FILE,
+            "parquet_account_outcomes": ACCOUNT_OUTCOME_FILES,
             "html_artifact": "nexus_report.html",
         },
         "statistics": combined_result.to_dict(),
@@ -4047,22 +6430,14 @@ def generate_manifest(
     # Add file hashes
     log_info("Calculating file hashes for DSL1...")
     for f in discover_files(dsl1_folder):
-        manifest["inputs"]["dsl1_files"].append({
-            "name": f.name,
-            "size_bytes": f.stat().st_size,
-            "hash_sha256_short": get_file_hash(f)
-        })
+        manifest["inputs"]["dsl1_files"].append(manifest_file_entry(f))
     
     if progress and task_id:
         progress.update(task_id, completed=40)
     
     log_info("Calculating file hashes for DSL2...")
     for f in discover_files(dsl2_folder):
-        manifest["inputs"]["dsl2_files"].append({
-            "name": f.name,
-            "size_bytes": f.stat().st_size,
-            "hash_sha256_short": get_file_hash(f)
-        })
+        manifest["inputs"]["dsl2_files"].append(manifest_file_entry(f))
     
     if progress and task_id:
         progress.update(task_id, completed=60)
@@ -4070,11 +6445,7 @@ def generate_manifest(
     if ps_folder and ps_folder.exists():
         log_info("Calculating file hashes for Payment Schedule...")
         for f in discover_files(ps_folder):
-            manifest["inputs"]["payment_schedule_files"].append({
-                "name": f.name,
-                "size_bytes": f.stat().st_size,
-                "hash_sha256_short": get_file_hash(f)
-            })
+            manifest["inputs"]["payment_schedule_files"].append(manifest_file_entry(f))
     
     if progress and task_id:
         progress.update(task_id, completed=100)
@@ -4084,12 +6455,246 @@ def generate_manifest(
     return manifest
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# RUN-TO-RUN DELTA: DIFF MODE
+# ══════════════════════════════════════════════════════════════════════════════
+
+# Unmatched account lists folded into a comparison's outcomes (status "unmatched")
+DIFF_UNMATCHED_FILES = {
+    "dsl1_vs_dsl2": UNMATCHED_DSL1_FILE,
+    "ps_vs_dsl2": UNMATCHED_PS_FILE,
+}
+
+# Compared per-account outcome columns (besides STATUS)
+OUTCOME_VALUE_COLS = ["ROWS", "DATE_MISMATCHES", "BALANCE_MISMATCHES", "MAX_ABS_BAL_DIFF"]
+
+DIFF_SUMMARY_FILE = "delta_summary.json"
+
+
+def run_outcomes(run_dir: Path, comparison: str) -> Optional[pl.LazyFrame]:
+    """
+    Per-account outcomes of one comparison in a finished run (None when the
+    run did not produce them), with the run's unmatched accounts added as
+    status "unmatched".
+    """
+    path = run_dir / ACCOUNT_OUTCOME_FILES[comparison]
+    if not path.exists():
+        return None
+    
+    outcomes = pl.scan_parquet(path)
+    
+    unmatched_file = DIFF_UNMATCHED_FILES.get(comparison)
+    if unmatched_file and (run_dir / unmatched_file).exists():
+        unmatched = (
+            pl.scan_csv(run_dir / unmatched_file, schema_overrides={"ACC_NO": pl.Utf8})
+            .select([
+                account_key_expr("ACC_NO"),
+                pl.col("ACC_NO"),
+                pl.lit(0, dtype=pl.Int64).alias("ROWS"),
+                pl.lit(0, dtype=pl.Int64).alias("DATE_MISMATCHES"),
+                pl.lit(0, dtype=pl.Int64).alias("BALANCE_MISMATCHES"),
+                pl.lit(None, dtype=pl.Float64).alias("MAX_ABS_BAL_DIFF"),
+                pl.lit("unmatched").alias("STATUS"),
+            ])
+            .unique(subset=ACC_KEY_COL, keep="first", maintain_order=True)
+        )
+        outcomes = pl.concat([outcomes, unmatched], how="vertical_relaxed")
+    
+    return outcomes
+
+
+def diff_outcomes(
+    base: pl.LazyFrame,
+    new: pl.LazyFrame,
+    path: Path,
+    streaming: bool = False
+) -> Dict[str, int]:
+    """
+    Keyed diff of two runs' per-account outcomes: one full join on the
+    account key, classified per account as
+    
+    - new: discrepant now, perfect or absent in the base run
+    - resolved: discrepant in the base run, perfect or absent now
+    - changed: discrepant in both runs with a different outcome
+    
+    The delta rows (both runs' outcomes side by side) are streamed to path
+    as CSV in key order; the counts come from the same query.
+    """
+    def side(lf: pl.LazyFrame, suffix: str) -> pl.LazyFrame:
+        return lf.select([
+            ACC_KEY_COL,
+            *[pl.col(c).alias(f"{c}_{suffix}") for c in ["ACC_NO", "STATUS", *OUTCOME_VALUE_COLS]],
+        ])
+    
+    joined = side(base, "BASE").join(side(new, "NEW"), on=ACC_KEY_COL, how="full", coalesce=True)
+    
+    status_base = pl.col("STATUS_BASE").fill_null("absent")
+    status_new = pl.col("STATUS_NEW").fill_null("absent")
+    bad_base = ~status_base.is_in(["perfect", "absent"])
+    bad_new = ~status_new.is_in(["perfect", "absent"])
+    differs = pl.any_horizontal([
+        pl.col(f"{c}_BASE").ne_missing(pl.col(f"{c}_NEW")) for c in ["STATUS", *OUTCOME_VALUE_COLS]
+    ])
+    
+    classified = joined.with_columns(
+        pl.when(bad_new & ~bad_base).then(pl.lit("new"))
+        .when(bad_base & ~bad_new).then(pl.lit("resolved"))
+        .when(bad_base & bad_new & differs).then(pl.lit("changed"))
+        .otherwise(None)
+        .alias("CHANGE")
+    )
+    
+    delta = (
+        classified
+        .filter(pl.col("CHANGE").is_not_null())
+        .select([
+            ACC_KEY_COL,
+            pl.coalesce("ACC_NO_NEW", "ACC_NO_BASE").alias("ACC_NO"),
+            "CHANGE",
+            status_base.alias("STATUS_BASE"),
+            status_new.alias("STATUS_NEW"),
+            *[pl.col(f"{c}_{suffix}") for c in OUTCOME_VALUE_COLS for suffix in ("BASE", "NEW")],
+        ])
+        .sort(ACC_KEY_COL)
+    )
+    
+    counts, _ = pl.collect_all([
+        classified.select([
+            (pl.col("CHANGE") == "new").sum().alias("new"),
+            (pl.col("CHANGE") == "resolved").sum().alias("resolved"),
+            (pl.col("CHANGE") == "changed").sum().alias("changed"),
+            (bad_base & bad_new & ~differs).sum().alias("unchanged_discrepant"),
+            pl.col("STATUS_BASE").is_not_null().sum().alias("base_accounts"),
+            pl.col("STATUS_NEW").is_not_null().sum().alias("new_accounts"),
+            bad_base.sum().alias("base_discrepant"),
+            bad_new.sum().alias("new_discrepant"),
+        ]),
+        delta.sink_csv(path, include_bom=True, lazy=True),
+    ], engine=collect_engine(streaming))
+    
+    return {name: int(value) for name, value in counts.row(0, named=True).items()}
+
+
+def diff_runs(
+    base_dir: Path,
+    new_dir: Path,
+    output_dir: Path,
+    streaming: bool = False
+) -> Dict[str, Any]:
+    """
+    Compare the per-account outcomes of two finished runs (see
+    account_outcomes) and write delta_<comparison>.csv per comparison plus
+    the summary counts in delta_summary.json. Comparisons missing from
+    either run are skipped.
+    """
+    start_timer("diff_runs")
+    log_flux(f"Diffing account outcomes: {base_dir} -> {new_dir}")
+    
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    def generated_at(run_dir: Path) -> Optional[str]:
+        manifest_path = run_dir / "manifest.json"
+        if not manifest_path.exists():
+            return None
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("generated_at")
+    
+    summary = {
+        "generated_at": datetime.now().isoformat(),
+        "base_run": str(base_dir.absolute()),
+        "new_run": str(new_dir.absolute()),
+        "base_generated_at": generated_at(base_dir),
+        "new_generated_at": generated_at(new_dir),
+        "comparisons": {},
+    }
+    
+    for comparison in ACCOUNT_OUTCOME_FILES:
+        base = run_outcomes(base_dir, comparison)
+        new = run_outcomes(new_dir, comparison)
+        if base is None or new is None:
+            if base is not None or new is not None:
+                log_warn(f"Skipping {comparison}: account outcomes exist in only one of the runs")
+            continue
+        
+        start_timer(f"diff_{comparison}")
+        counts = diff_outcomes(base, new, output_dir / f"delta_{comparison}.csv", streaming)
+        summary["comparisons"][comparison] = counts
+        log_info(
+            f"{comparison}: {counts['new']:,} new, {counts['resolved']:,} resolved, "
+            f"{counts['changed']:,} changed discrepancies",
+            f"diff_{comparison}"
+        )
+    
+    if not summary["comparisons"]:
+        raise FileNotFoundError(f"No account outcomes to compare in {base_dir} and {new_dir}")
+    
+    with open(output_dir / DIFF_SUMMARY_FILE, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    
+    log_secure(f"Delta report written to {output_dir}", "diff_runs")
+    
+    return summary
+
+
+def diff_main(argv: List[str]) -> None:
+    """Entry point of `diff BASE_RUN NEW_RUN`: the delta report between two run output folders."""
+    parser = argparse.ArgumentParser(
+        prog="compare_init.py diff",
+        description="Run-to-run discrepancy delta: accounts that newly broke, got fixed or changed between two runs"
+    )
+    parser.add_argument("base_run", type=Path, help="Output folder of the earlier run")
+    parser.add_argument("new_run", type=Path, help="Output folder of the later run")
+    parser.add_argument("--output", type=Path, default=None, help="Folder for the delta reports (default: <new_run>/delta)")
+    parser.add_argument("--streaming", action="store_true", help="Run the diff on the Polars streaming engine")
+    parser.add_argument("--debug", action="store_true", help="Show full stack traces")
+    
+    args = parser.parse_args(argv)
+    
+    try:
+        render_header_panel("RECALC: RUN-TO-RUN DISCREPANCY DELTA", "4.0.0")
+        
+        for run_dir in (args.base_run, args.new_run):
+            if not run_dir.exists():
+                log_fatal(f"Run folder not found: {run_dir}")
+                sys.exit(1)
+        
+        summary = diff_runs(args.base_run, args.new_run, args.output or args.new_run / "delta", streaming=args.streaming)
+        
+        if console:
+            delta_table = Table(title="Discrepancy Delta", box=box.ROUNDED)
+            delta_table.add_column("Comparison", style="cyan")
+            for column in ("New", "Resolved", "Changed", "Still Discrepant", "Discrepant (base → new)"):
+                delta_table.add_column(column, style="white")
+            
+            for comparison, counts in summary["comparisons"].items():
+                delta_table.add_row(
+                    comparison,
+                    f"{counts['new']:,}",
+                    f"{counts['resolved']:,}",
+                    f"{counts['changed']:,}",
+                    f"{counts['unchanged_discrepant']:,}",
+                    f"{counts['base_discrepant']:,} → {counts['new_discrepant']:,}",
+                )
+            
+            console.print(delta_table)
+    
+    except Exception as e:
+        log_fatal(f"Diff failed: {e}")
+        if args.debug:
+            import traceback
+            traceback.print_exc()
+        sys.exit(1)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # MAIN EXECUTION ENGINE
 # ══════════════════════════════════════════════════════════════════════════════
 
 def main():
     """Main execution entry point with full CLI interface."""
+    # `diff BASE_RUN NEW_RUN` compares two finished runs instead of reconciling
+    if sys.argv[1:2] == ["diff"]:
+        return diff_main(sys.argv[2:])
     
     parser = argparse.ArgumentParser(
         description="RECALC TOOLKIT v4.0: DSL1 ↔ DSL2 ↔ Payment Schedule Reconciliation Engine",
@@ -4098,6 +6703,7 @@ def main():
 Examples:
   python recalc_reconcile.py --dsl1 ./DSL1 --dsl2 ./DSL2 --output ./results
   python recalc_reconcile.py --dsl1 ./DSL1 --dsl2 ./DSL2 --payment-schedule ./PS --output ./results --web-report
+  python recalc_reconcile.py diff ./results_yesterday ./results --output ./delta
         """
     )
     
@@ -4105,12 +6711,21 @@ Examples:
     parser.add_argument("--dsl2", type=Path, required=True, help="Path to DSL2 data folder")
     parser.add_argument("--payment-schedule", type=Path, default=None, help="Path to Payment Schedule data folder")
     parser.add_argument("--output", type=Path, required=True, help="Output folder for results")
-    parser.add_argument("--workers", type=int, default=4, help="Number of parallel workers")
+    parser.add_argument("--workers", type=int, default=4, help="Number of parallel file-loading worker processes")
     parser.add_argument("--web-report", action="store_true", help="Generate Nexus HTML artifact")
     parser.add_argument("--dry-run", action="store_true", help="Validation only, no write")
     parser.add_argument("--debug", action="store_true", help="Show full stack traces")
     parser.add_argument("--balance-tolerance", type=float, default=0.01, help="Balance match tolerance")
     parser.add_argument("--max-errors", type=int, default=100000, help="Maximum error records to capture")
+    parser.add_argument("--key-encoding", choices=["uint64", "string"], default="uint64", help="Join on UInt64-encoded account keys (string fallback for non-numeric) or on raw string keys")
+    parser.add_argument("--cache-dir", type=Path, default=None, help="Opt-in Parquet ingest cache (skips re-parsing unchanged source files)")
+    parser.add_argument("--streaming", action="store_true", help="Out-of-core mode: keep DSL1/Payment Schedule lazy and reconcile on the Polars streaming engine")
+    parser.add_argument("--partitions", type=int, default=1, help="Hash-partition sources by account key into N buckets reconciled in parallel worker processes (1 = off)")
+    parser.add_argument("--ps-match", choices=PS_MATCH_MODES, default="all", help="Payment Schedule installments compared per DSL2 account: every one (all), or only the first due on/after the DSL2 start date, or the last one for accounts with no later installment (asof)")
+    parser.add_argument("--memory-limit-gb", type=float, default=None, help="Approximate memory ceiling for --streaming (sizes the streaming chunks) and for --engine duckdb (spills beyond it)")
+    parser.add_argument("--resume", action="store_true", help="Reuse the checkpoints of an interrupted run in the output's _tmp folder: stages whose source files and parameters are unchanged are skipped")
+    parser.add_argument("--incremental", action="store_true", help="Keep per-file fingerprints and per-bucket results in the output's _incremental folder and recompute only the accounts touched by new, replaced or removed source files")
+    parser.add_argument("--engine", choices=ENGINES, default="polars", help="Reconciliation engine: Polars plans, or SQL in an embedded DuckDB database with spill-to-disk joins (cross-check)")
     
     args = parser.parse_args()
     
@@ -4132,16 +6747,48 @@ Examples:
             log_warn(f"Payment Schedule folder not found: {ps_folder}, skipping PS comparison")
             ps_folder = None
         
+        if args.engine == "duckdb":
+            if not DUCKDB_AVAILABLE:
+                log_fatal("DuckDB is required for --engine duckdb. Install via: pip install duckdb")
+                sys.exit(1)
+            if args.partitions > 1:
+                log_warn("--partitions is ignored with --engine duckdb (DuckDB parallelizes and spills on its own)")
+            if args.incremental:
+                log_warn("--incremental is ignored with --engine duckdb")
+                args.incremental = False
+        
+        if args.incremental and args.dry_run:
+            log_warn("--incremental is ignored with --dry-run (the incremental state is only updated by writing runs)")
+            args.incremental = False
+        
         # Create output folder
         args.output.mkdir(parents=True, exist_ok=True)
         tmp_folder = args.output / "_tmp"
         tmp_folder.mkdir(exist_ok=True)
         
+        # Unmatched account lists and per-account outcomes are streamed straight into the output during reconciliation
+        unmatched_dir = None if args.dry_run else tmp_folder
+        
+        # Incremental runs keep their state (and, by default, the ingest cache) next to the outputs
+        incremental_dir = args.output / INCREMENTAL_DIR_NAME
+        incremental_buckets = args.partitions if args.partitions > 1 else INCREMENTAL_BUCKETS
+        if args.incremental and args.cache_dir is None:
+            args.cache_dir = incremental_dir / "cache"
+        
+        # Incremental runs tag rows with their stable per-file order at load
+        row_cols = {"dsl1": ROW_DSL1_COL, "dsl2": ROW_DSL2_COL, "ps": ROW_PS_COL} if args.incremental else {}
+        
         log_info(f"DSL1 Source: {args.dsl1}")
         log_info(f"DSL2 Source: {args.dsl2}")
         if ps_folder:
             log_info(f"Payment Schedule Source: {ps_folder}")
         log_info(f"Output: {args.output}")
+        if args.cache_dir:
+            log_info(f"Ingest Cache: {args.cache_dir}")
+        if args.incremental:
+            log_info(f"Incremental State: {incremental_dir}")
+        if args.streaming:
+            configure_streaming(args.memory_limit_gb)
         
         # Pre-flight reconnaissance
         log_recon("Initiating Holographic Pre-Flight Scan...")
@@ -4151,6 +6798,27 @@ Examples:
         
         combined_result = CombinedReconciliationResult()
         
+        # Stage checkpoints: each stage is keyed by its source files, upstream stages and parameters
+        checkpoints = StageCheckpoints(tmp_folder, resume=args.resume)
+        
+        # Keys matched by the two-way stages, staged for the three-way stage
+        matched_keys = tuple(checkpoints.stage_dir / name for name in MATCHED_KEYS_FILES.values())
+        
+        dsl1_fp = stage_fingerprint("dsl1", INGEST_CACHE_VERSION, folder_fingerprint(args.dsl1), args.incremental)
+        dsl2_fp = stage_fingerprint("dsl2", INGEST_CACHE_VERSION, folder_fingerprint(args.dsl2), args.incremental)
+        ps_fp = stage_fingerprint("ps", INGEST_CACHE_VERSION, folder_fingerprint(ps_folder), args.incremental)
+        reconcile_fp = stage_fingerprint(
+            "reconcile", dsl1_fp, dsl2_fp, ps_fp,
+            args.key_encoding, args.balance_tolerance, args.max_errors, args.ps_match,
+            args.engine, args.partitions, args.incremental, unmatched_dir is not None
+        )
+        
+        # Incremental state is only reused by runs producing the same per-bucket results
+        incremental_fp = stage_fingerprint(
+            "incremental", INGEST_CACHE_VERSION, pl.__version__, args.key_encoding,
+            args.balance_tolerance, args.max_errors, args.ps_match, incremental_buckets, ps_folder is not None
+        )
+        
         # Load and preprocess datasets
         if RICH_AVAILABLE:
             with Progress(
@@ -4167,133 +6835,332 @@ Examples:
                 # Load DSL1
                 task1 = progress.add_task(f"[cyan]Loading DSL1 ({dsl1_scan['total_size_gb']:.1f}GB)...", total=100)
                 
-                if POLARS_AVAILABLE:
-                    try:
-                        dsl1_lazy = load_dsl1_polars(args.dsl1)
-                        progress.update(task1, completed=50)
-                        log_flux("Materializing DSL1 LazyFrame...")
-                        dsl1_data = dsl1_lazy.collect()
-                        progress.update(task1, completed=100)
-                        log_secure(f"DSL1 loaded: {len(dsl1_data):,} rows")
-                    except Exception as e:
-                        log_warn(f"Polars failed: {e}, falling back to pandas")
-                        if PANDAS_AVAILABLE:
-                            dsl1_data = pl.from_pandas(load_dsl1_pandas_fallback(args.dsl1))
-                            progress.update(task1, completed=100)
-                        else:
-                            raise
-                else:
-                    if PANDAS_AVAILABLE:
-                        dsl1_data = pl.from_pandas(load_dsl1_pandas_fallback(args.dsl1))
-                        progress.update(task1, completed=100)
-                    else:
+                def load_dsl1():
+                    if POLARS_AVAILABLE:
+                        try:
+                            dsl1_lazy = load_dsl1_polars(args.dsl1, cache_dir=args.cache_dir, workers=args.workers, row_col=row_cols.get("dsl1"))
+                            progress.update(task1, completed=50)
+                            if args.streaming:
+                                return stream_dsl1_filtered(dsl1_lazy)
+                            dsl1_data, dsl1_total_rows = collect_dsl1_filtered(dsl1_lazy)
+                            log_secure(f"DSL1 loaded: {len(dsl1_data):,} rows (GROUP_FLAG = 1)")
+                            return dsl1_data, dsl1_total_rows
+                        except Exception as e:
+                            log_warn(f"Polars failed: {e}, falling back to pandas")
+                            if not PANDAS_AVAILABLE:
+                                raise
+                    elif not PANDAS_AVAILABLE:
                         raise ImportError("Neither Polars nor Pandas available")
+                    return collect_dsl1_filtered(
+                        pandas_to_polars(load_dsl1_pandas_fallback(args.dsl1, workers=args.workers)).lazy()
+                    )
+                
+                dsl1_data, dsl1_total_rows = checkpoints.run_source("dsl1", dsl1_fp, load_dsl1, streaming=args.streaming)
+                progress.update(task1, completed=100)
                 
                 # Load and preprocess DSL2 (with deduplication and conflict detection)
                 task2 = progress.add_task(f"[cyan]Loading & Pre-processing DSL2 ({dsl2_scan['total_size_gb']:.1f}GB)...", total=100)
                 
-                dsl2_data, dsl2_preprocess_result = preprocess_dsl2_with_source_tracking(args.dsl2)
+                def load_dsl2():
+                    dsl2_data, dsl2_preprocess_result = preprocess_dsl2_with_source_tracking(
+                        args.dsl2, cache_dir=args.cache_dir, workers=args.workers, streaming=args.streaming,
+                        row_col=row_cols.get("dsl2"), work_dir=tmp_folder
+                    )
+                    return ensure_dsl2_dates(dsl2_data), dsl2_preprocess_result
+                
+                dsl2_data, dsl2_preprocess_result = checkpoints.run_source("dsl2", dsl2_fp, load_dsl2, streaming=args.streaming)
                 combined_result.dsl2_preprocessing = dsl2_preprocess_result
                 progress.update(task2, completed=100)
-                log_secure(f"DSL2 loaded and preprocessed: {len(dsl2_data):,} rows (after dedup)")
+                log_secure(f"DSL2 loaded and preprocessed: {dsl2_preprocess_result.deduplicated_rows:,} rows (after dedup)")
                 
                 # Load Payment Schedule if provided
                 ps_data = None
                 if ps_folder:
                     task3 = progress.add_task(f"[violet]Loading Payment Schedule ({ps_scan['total_size_gb']:.1f}GB)...", total=100)
                     
-                    if POLARS_AVAILABLE:
-                        try:
-                            ps_lazy = load_payment_schedule_polars(ps_folder)
-                            progress.update(task3, completed=50)
-                            log_flux("Materializing Payment Schedule LazyFrame...")
-                            ps_data = ps_lazy.collect()
-                            progress.update(task3, completed=100)
-                            log_secure(f"Payment Schedule loaded: {len(ps_data):,} rows")
-                        except Exception as e:
-                            log_warn(f"Polars failed for Payment Schedule: {e}, falling back to pandas")
-                            if PANDAS_AVAILABLE:
-                                ps_data = pl.from_pandas(load_payment_schedule_pandas_fallback(ps_folder))
-                                progress.update(task3, completed=100)
-                            else:
-                                log_warn("Payment Schedule loading failed, skipping PS comparison")
-                    else:
-                        if PANDAS_AVAILABLE:
-                            ps_data = pl.from_pandas(load_payment_schedule_pandas_fallback(ps_folder))
-                            progress.update(task3, completed=100)
+                    def load_ps():
+                        ps_data = None
+                        if POLARS_AVAILABLE:
+                            try:
+                                ps_lazy = load_payment_schedule_polars(ps_folder, cache_dir=args.cache_dir, workers=args.workers, row_col=row_cols.get("ps"))
+                                progress.update(task3, completed=50)
+                                if args.streaming:
+                                    ps_data = ps_lazy
+                                    log_secure("Payment Schedule scan planned for streaming")
+                                else:
+                                    log_flux("Materializing Payment Schedule LazyFrame...")
+                                    ps_data = ps_lazy.collect()
+                                    log_secure(f"Payment Schedule loaded: {len(ps_data):,} rows")
+                            except Exception as e:
+                                log_warn(f"Polars failed for Payment Schedule: {e}, falling back to pandas")
+                                if PANDAS_AVAILABLE:
+                                    ps_data = pandas_to_polars(load_payment_schedule_pandas_fallback(ps_folder, workers=args.workers))
+                                else:
+                                    log_warn("Payment Schedule loading failed, skipping PS comparison")
+                        elif PANDAS_AVAILABLE:
+                            ps_data = pandas_to_polars(load_payment_schedule_pandas_fallback(ps_folder, workers=args.workers))
+                        
+                        if ps_data is not None:
+                            ps_data = ensure_balances(ensure_ps_dates(ensure_account_key(ps_data, "ACC_NO")), PS_BALANCE_COLS)
+                        return ps_data, None
+                    
+                    ps_data, _ = checkpoints.run_source("ps", ps_fp, load_ps, streaming=args.streaming)
+                    progress.update(task3, completed=100)
                 
-                # Reconcile DSL1 vs DSL2
-                task4 = progress.add_task("[cyan]Reconciling DSL1 vs DSL2...", total=100)
-                combined_result.dsl1_vs_dsl2 = reconcile_dsl1_vs_dsl2(
-                    dsl1_data, 
-                    dsl2_data,
-                    balance_tolerance=args.balance_tolerance,
-                    max_error_records=args.max_errors,
-                    progress=progress,
-                    task_id=task4
-                )
-                progress.update(task4, completed=100)
+                if args.key_encoding == "uint64":
+                    dsl1_data, dsl2_data, ps_data = encode_account_keys(dsl1_data, dsl2_data, ps_data, streaming=args.streaming)
                 
-                # Reconcile Payment Schedule vs DSL2 if available
-                if ps_data is not None:
-                    task5 = progress.add_task("[violet]Reconciling Payment Schedule vs DSL2...", total=100)
-                    combined_result.ps_vs_dsl2 = reconcile_ps_vs_dsl2(
+                if args.incremental:
+                    task4 = progress.add_task(f"[cyan]Incremental Reconciliation ({incremental_buckets} buckets)...", total=100)
+                    combined_result.dsl1_vs_dsl2, ps_result, three_way_result, combined_result.incremental = checkpoints.run("reconcile", reconcile_fp, lambda: reconcile_incremental(
+                        dsl1_data,
+                        dsl2_data,
                         ps_data,
+                        folders={"dsl1": args.dsl1, "dsl2": args.dsl2, "ps": ps_folder},
+                        state_dir=incremental_dir,
+                        params_fingerprint=incremental_fp,
+                        partitions=incremental_buckets,
+                        workers=args.workers,
+                        balance_tolerance=args.balance_tolerance,
+                        max_records=args.max_errors,
+                        dsl1_total_rows=dsl1_total_rows,
+                        streaming=args.streaming,
+                        ps_match=args.ps_match,
+                        unmatched_dir=unmatched_dir
+                    ))
+                    if ps_data is not None:
+                        combined_result.ps_vs_dsl2 = ps_result
+                        combined_result.three_way = three_way_result
+                    progress.update(task4, completed=100)
+                elif args.engine == "duckdb":
+                    task4 = progress.add_task("[cyan]DuckDB Reconciliation...", total=100)
+                    combined_result.dsl1_vs_dsl2, ps_result, three_way_result = checkpoints.run("reconcile", reconcile_fp, lambda: reconcile_duckdb(
+                        dsl1_data,
                         dsl2_data,
+                        ps_data,
+                        work_dir=tmp_folder / "duckdb",
                         balance_tolerance=args.balance_tolerance,
-                        max_error_records=args.max_errors,
-                        progress=progress,
-                        task_id=task5
-                    )
-                    progress.update(task5, completed=100)
-                    
-                    # Three-way reconciliation
-                    task6 = progress.add_task("[peach]Three-Way Reconciliation (DSL1 ↔ DSL2 ↔ PS)...", total=100)
-                    combined_result.three_way = reconcile_three_way(
+                        max_records=args.max_errors,
+                        dsl1_total_rows=dsl1_total_rows,
+                        streaming=args.streaming,
+                        ps_match=args.ps_match,
+                        unmatched_dir=unmatched_dir,
+                        memory_limit_gb=args.memory_limit_gb
+                    ))
+                    if ps_data is not None:
+                        combined_result.ps_vs_dsl2 = ps_result
+                        combined_result.three_way = three_way_result
+                    progress.update(task4, completed=100)
+                elif args.partitions > 1:
+                    task4 = progress.add_task(f"[cyan]Partitioned Reconciliation ({args.partitions} buckets)...", total=100)
+                    combined_result.dsl1_vs_dsl2, ps_result, three_way_result = checkpoints.run("reconcile", reconcile_fp, lambda: reconcile_partitioned(
                         dsl1_data,
                         dsl2_data,
                         ps_data,
+                        partitions=args.partitions,
+                        work_dir=tmp_folder / "partitions",
+                        workers=args.workers,
                         balance_tolerance=args.balance_tolerance,
                         max_records=args.max_errors,
+                        dsl1_total_rows=dsl1_total_rows,
+                        streaming=args.streaming,
+                        ps_match=args.ps_match,
+                        unmatched_dir=unmatched_dir
+                    ))
+                    if ps_data is not None:
+                        combined_result.ps_vs_dsl2 = ps_result
+                        combined_result.three_way = three_way_result
+                    progress.update(task4, completed=100)
+                else:
+                    # Reconcile DSL1 vs DSL2
+                    task4 = progress.add_task("[cyan]Reconciling DSL1 vs DSL2...", total=100)
+                    combined_result.dsl1_vs_dsl2 = checkpoints.run("dsl1_vs_dsl2", reconcile_fp, lambda: reconcile_dsl1_vs_dsl2(
+                        dsl1_data, 
+                        dsl2_data,
+                        balance_tolerance=args.balance_tolerance,
+                        max_error_records=args.max_errors,
                         progress=progress,
-                        task_id=task6
-                    )
-                    progress.update(task6, completed=100)
+                        task_id=task4,
+                        dsl1_prefiltered=True,
+                        dsl1_total_rows=dsl1_total_rows,
+                        streaming=args.streaming,
+                        unmatched_path=unmatched_dir / UNMATCHED_DSL1_FILE if unmatched_dir else None,
+                        outcomes_path=unmatched_dir / ACCOUNT_OUTCOME_FILES["dsl1_vs_dsl2"] if unmatched_dir else None,
+                        matched_keys_path=matched_keys[0]
+                    ))
+                    progress.update(task4, completed=100)
+                    
+                    # Reconcile Payment Schedule vs DSL2 if available
+                    if ps_data is not None:
+                        task5 = progress.add_task("[violet]Reconciling Payment Schedule vs DSL2...", total=100)
+                        combined_result.ps_vs_dsl2 = checkpoints.run("ps_vs_dsl2", reconcile_fp, lambda: reconcile_ps_vs_dsl2(
+                            ps_data,
+                            dsl2_data,
+                            balance_tolerance=args.balance_tolerance,
+                            max_error_records=args.max_errors,
+                            progress=progress,
+                            task_id=task5,
+                            streaming=args.streaming,
+                            ps_match=args.ps_match,
+                            unmatched_path=unmatched_dir / UNMATCHED_PS_FILE if unmatched_dir else None,
+                            outcomes_path=unmatched_dir / ACCOUNT_OUTCOME_FILES["ps_vs_dsl2"] if unmatched_dir else None,
+                            matched_keys_path=matched_keys[1]
+                        ))
+                        progress.update(task5, completed=100)
+                        
+                        # Three-way reconciliation
+                        task6 = progress.add_task("[peach]Three-Way Reconciliation (DSL1 ↔ DSL2 ↔ PS)...", total=100)
+                        combined_result.three_way = checkpoints.run("three_way", reconcile_fp, lambda: reconcile_three_way(
+                            dsl1_data,
+                            dsl2_data,
+                            ps_data,
+                            balance_tolerance=args.balance_tolerance,
+                            max_records=args.max_errors,
+                            progress=progress,
+                            task_id=task6,
+                            dsl1_prefiltered=True,
+                            streaming=args.streaming,
+                            outcomes_path=unmatched_dir / ACCOUNT_OUTCOME_FILES["three_way"] if unmatched_dir else None,
+                            matched_keys=matched_keys
+                        ))
+                        progress.update(task6, completed=100)
         else:
             # Non-rich fallback (simplified)
-            print("Loading DSL1...")
-            if POLARS_AVAILABLE:
-                dsl1_data = load_dsl1_polars(args.dsl1).collect()
-            elif PANDAS_AVAILABLE:
-                dsl1_data = pl.from_pandas(load_dsl1_pandas_fallback(args.dsl1))
-            else:
+            def load_dsl1():
+                if POLARS_AVAILABLE:
+                    dsl1_lazy = load_dsl1_polars(args.dsl1, cache_dir=args.cache_dir, workers=args.workers, row_col=row_cols.get("dsl1"))
+                    if args.streaming:
+                        return stream_dsl1_filtered(dsl1_lazy)
+                    return collect_dsl1_filtered(dsl1_lazy)
+                if PANDAS_AVAILABLE:
+                    return collect_dsl1_filtered(
+                        pandas_to_polars(load_dsl1_pandas_fallback(args.dsl1, workers=args.workers)).lazy()
+                    )
                 raise ImportError("Neither Polars nor Pandas available")
             
+            print("Loading DSL1...")
+            dsl1_data, dsl1_total_rows = checkpoints.run_source("dsl1", dsl1_fp, load_dsl1, streaming=args.streaming)
+            
+            def load_dsl2():
+                dsl2_data, dsl2_preprocess_result = preprocess_dsl2_with_source_tracking(
+                    args.dsl2, cache_dir=args.cache_dir, workers=args.workers, streaming=args.streaming,
+                    row_col=row_cols.get("dsl2"), work_dir=tmp_folder
+                )
+                return ensure_dsl2_dates(dsl2_data), dsl2_preprocess_result
+            
             print("Loading and pre-processing DSL2...")
-            dsl2_data, dsl2_preprocess_result = preprocess_dsl2_with_source_tracking(args.dsl2)
+            dsl2_data, dsl2_preprocess_result = checkpoints.run_source("dsl2", dsl2_fp, load_dsl2, streaming=args.streaming)
             combined_result.dsl2_preprocessing = dsl2_preprocess_result
             
-            ps_data = None
-            if ps_folder:
-                print("Loading Payment Schedule...")
+            def load_ps():
+                ps_data = None
                 if POLARS_AVAILABLE:
                     try:
-                        ps_data = load_payment_schedule_polars(ps_folder).collect()
+                        ps_data = load_payment_schedule_polars(ps_folder, cache_dir=args.cache_dir, workers=args.workers, row_col=row_cols.get("ps"))
+                        if not args.streaming:
+                            ps_data = ps_data.collect()
                     except:
                         if PANDAS_AVAILABLE:
-                            ps_data = pl.from_pandas(load_payment_schedule_pandas_fallback(ps_folder))
+                            ps_data = pandas_to_polars(load_payment_schedule_pandas_fallback(ps_folder, workers=args.workers))
                 elif PANDAS_AVAILABLE:
-                    ps_data = pl.from_pandas(load_payment_schedule_pandas_fallback(ps_folder))
+                    ps_data = pandas_to_polars(load_payment_schedule_pandas_fallback(ps_folder, workers=args.workers))
+                
+                if ps_data is not None:
+                    ps_data = ensure_balances(ensure_ps_dates(ensure_account_key(ps_data, "ACC_NO")), PS_BALANCE_COLS)
+                return ps_data, None
+            
+            ps_data = None
+            if ps_folder:
+                print("Loading Payment Schedule...")
+                ps_data, _ = checkpoints.run_source("ps", ps_fp, load_ps, streaming=args.streaming)
             
-            print("Reconciling DSL1 vs DSL2...")
-            combined_result.dsl1_vs_dsl2 = reconcile_dsl1_vs_dsl2(dsl1_data, dsl2_data)
+            if args.key_encoding == "uint64":
+                dsl1_data, dsl2_data, ps_data = encode_account_keys(dsl1_data, dsl2_data, ps_data, streaming=args.streaming)
             
-            if ps_data is not None:
-                print("Reconciling Payment Schedule vs DSL2...")
-                combined_result.ps_vs_dsl2 = reconcile_ps_vs_dsl2(ps_data, dsl2_data)
+            if args.incremental:
+                print(f"Incremental reconciliation ({incremental_buckets} buckets)...")
+                combined_result.dsl1_vs_dsl2, ps_result, three_way_result, combined_result.incremental = checkpoints.run("reconcile", reconcile_fp, lambda: reconcile_incremental(
+                    dsl1_data, dsl2_data, ps_data,
+                    folders={"dsl1": args.dsl1, "dsl2": args.dsl2, "ps": ps_folder},
+                    state_dir=incremental_dir,
+                    params_fingerprint=incremental_fp,
+                    partitions=incremental_buckets,
+                    workers=args.workers,
+                    balance_tolerance=args.balance_tolerance,
+                    max_records=args.max_errors,
+                    dsl1_total_rows=dsl1_total_rows,
+                    streaming=args.streaming,
+                    ps_match=args.ps_match,
+                    unmatched_dir=unmatched_dir
+                ))
+                if ps_data is not None:
+                    combined_result.ps_vs_dsl2 = ps_result
+                    combined_result.three_way = three_way_result
+            elif args.engine == "duckdb":
+                print("DuckDB reconciliation...")
+                combined_result.dsl1_vs_dsl2, ps_result, three_way_result = checkpoints.run("reconcile", reconcile_fp, lambda: reconcile_duckdb(
+                    dsl1_data, dsl2_data, ps_data,
+                    work_dir=tmp_folder / "duckdb",
+                    balance_tolerance=args.balance_tolerance,
+                    max_records=args.max_errors,
+                    dsl1_total_rows=dsl1_total_rows,
+                    streaming=args.streaming,
+                    ps_match=args.ps_match,
+                    unmatched_dir=unmatched_dir,
+                    memory_limit_gb=args.memory_limit_gb
+                ))
+                if ps_data is not None:
+                    combined_result.ps_vs_dsl2 = ps_result
+                    combined_result.three_way = three_way_result
+            elif args.partitions > 1:
+                print(f"Partitioned reconciliation ({args.partitions} buckets)...")
+                combined_result.dsl1_vs_dsl2, ps_result, three_way_result = checkpoints.run("reconcile", reconcile_fp, lambda: reconcile_partitioned(
+                    dsl1_data, dsl2_data, ps_data,
+                    partitions=args.partitions,
+                    work_dir=tmp_folder / "partitions",
+                    workers=args.workers,
+                    balance_tolerance=args.balance_tolerance,
+                    max_records=args.max_errors,
+                    dsl1_total_rows=dsl1_total_rows,
+                    streaming=args.streaming,
+                    ps_match=args.ps_match,
+                    unmatched_dir=unmatched_dir
+                ))
+                if ps_data is not None:
+                    combined_result.ps_vs_dsl2 = ps_result
+                    combined_result.three_way = three_way_result
+            else:
+                print("Reconciling DSL1 vs DSL2...")
+                combined_result.dsl1_vs_dsl2 = checkpoints.run("dsl1_vs_dsl2", reconcile_fp, lambda: reconcile_dsl1_vs_dsl2(
+                    dsl1_data, dsl2_data, balance_tolerance=args.balance_tolerance, max_error_records=args.max_errors,
+                    dsl1_prefiltered=True, dsl1_total_rows=dsl1_total_rows, streaming=args.streaming,
+                    unmatched_path=unmatched_dir / UNMATCHED_DSL1_FILE if unmatched_dir else None,
+                    outcomes_path=unmatched_dir / ACCOUNT_OUTCOME_FILES["dsl1_vs_dsl2"] if unmatched_dir else None,
+                    matched_keys_path=matched_keys[0]
+                ))
                 
-                print("Three-Way Reconciliation...")
-                combined_result.three_way = reconcile_three_way(dsl1_data, dsl2_data, ps_data)
+                if ps_data is not None:
+                    print("Reconciling Payment Schedule vs DSL2...")
+                    combined_result.ps_vs_dsl2 = checkpoints.run("ps_vs_dsl2", reconcile_fp, lambda: reconcile_ps_vs_dsl2(
+                        ps_data, dsl2_data, balance_tolerance=args.balance_tolerance, max_error_records=args.max_errors,
+                        streaming=args.streaming, ps_match=args.ps_match,
+                        unmatched_path=unmatched_dir / UNMATCHED_PS_FILE if unmatched_dir else None,
+                        outcomes_path=unmatched_dir / ACCOUNT_OUTCOME_FILES["ps_vs_dsl2"] if unmatched_dir else None,
+                        matched_keys_path=matched_keys[1]
+                    ))
+                    
+                    print("Three-Way Reconciliation...")
+                    combined_result.three_way = checkpoints.run("three_way", reconcile_fp, lambda: reconcile_three_way(
+                        dsl1_data, dsl2_data, ps_data, balance_tolerance=args.balance_tolerance, max_records=args.max_errors,
+                        dsl1_prefiltered=True, streaming=args.streaming,
+                        outcomes_path=unmatched_dir / ACCOUNT_OUTCOME_FILES["three_way"] if unmatched_dir else None,
+                        matched_keys=matched_keys
+                    ))
+        
+        # Release the mapped sources (their stage files stay until the run completes).
+        # These are the last references: the loaded heap frames were dropped once
+        # staged, and combined_result.dsl2_preprocessing holds no frame.
+        dsl1_data = dsl2_data = ps_data = None
         
         # Display results summary
         dsl1_result = combined_result.dsl1_vs_dsl2
@@ -4312,6 +7179,7 @@ Examples:
             summary_table.add_row("Filtered/Dedup Rows", f"{dsl1_result.total_dsl1_filtered_rows:,}", "N/A", "-")
             summary_table.add_row("DSL2 Rows (Dedup)", f"{dsl2_preprocess.deduplicated_rows:,}", f"{dsl2_preprocess.deduplicated_rows:,}", "-")
             summary_table.add_row("Matched Rows", f"{dsl1_result.matched_rows:,}", f"{ps_result.matched_rows:,}", f"{three_way_result.matched_all_three:,}")
+            summary_table.add_row("Unmatched (source side)", f"{dsl1_result.unmatched_dsl1:,}", f"{ps_result.unmatched_ps:,}", "-")
             summary_table.add_row("Perfect Matches", f"{dsl1_result.perfect_matches:,}", f"{ps_result.perfect_matches:,}", f"{three_way_result.perfect_matches:,}")
             summary_table.add_row("Date Mismatches", f"{dsl1_result.date_mismatches:,}", f"{ps_result.date_mismatches:,}", f"{three_way_result.date_mismatches:,}")
             summary_table.add_row("Balance Mismatches", f"{dsl1_result.balance_mismatches:,}", f"{ps_result.balance_mismatches:,}", f"{three_way_result.balance_mismatches:,}")
@@ -4321,131 +7189,131 @@ Examples:
             console.print(summary_table)
         
         if args.dry_run:
+            checkpoints.clear()
             log_info("Dry run complete. No files written.")
             return
         
-        # Write outputs
-        log_write("Writing output files...")
-        
-        if RICH_AVAILABLE:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(bar_width=40),
-                TaskProgressColumn(),
-                TimeElapsedColumn(),
-                TimeRemainingColumn(),
-                console=console,
-                transient=False
-            ) as progress:
-                
-                # CSV output for DSL1 vs DSL2 errors
-                if dsl1_result.error_records:
-                    csv_task = progress.add_task("[write]Writing dsl1_dsl2_discrepancies.csv...", total=100)
+        # Report stage: the CSVs, HTML artifact and manifest written into _tmp
+        report_fp = stage_fingerprint("report", reconcile_fp, args.web_report)
+        if not checkpoints.completed("report", report_fp):
+            # Write outputs
+            log_write("Writing output files...")
+            
+            if RICH_AVAILABLE:
+                with Progress(
+                    SpinnerColumn(),
+                    TextColumn("[progress.description]{task.description}"),
+                    BarColumn(bar_width=40),
+                    TaskProgressColumn(),
+                    TimeElapsedColumn(),
+                    TimeRemainingColumn(),
+                    console=console,
+                    transient=False
+                ) as progress:
+                    
+                    # CSV output for DSL1 vs DSL2 errors
+                    if dsl1_result.error_records.height:
+                        csv_task = progress.add_task("[write]Writing dsl1_dsl2_discrepancies.csv...", total=100)
+                        csv_path = tmp_folder / "dsl1_dsl2_discrepancies.csv"
+                        write_records_csv(dsl1_result.error_records, csv_path)
+                        progress.update(csv_task, completed=100)
+                        log_secure(f"CSV written: {csv_path}")
+                    
+                    # CSV output for PS vs DSL2 errors
+                    if ps_result.error_records.height:
+                        csv_task2 = progress.add_task("[write]Writing ps_dsl2_discrepancies.csv...", total=100)
+                        csv_path2 = tmp_folder / "ps_dsl2_discrepancies.csv"
+                        write_records_csv(ps_result.error_records, csv_path2)
+                        progress.update(csv_task2, completed=100)
+                        log_secure(f"CSV written: {csv_path2}")
+                    
+                    # CSV output for Debt Separation cases
+                    if dsl1_result.debt_separation_records.height:
+                        csv_task3 = progress.add_task("[write]Writing debt_separation_cases.csv...", total=100)
+                        csv_path3 = tmp_folder / "debt_separation_cases.csv"
+                        write_records_csv(dsl1_result.debt_separation_records, csv_path3)
+                        progress.update(csv_task3, completed=100)
+                        log_secure(f"CSV written: {csv_path3}")
+                    
+                    # CSV output for DSL2 Conflicts
+                    if dsl2_preprocess.conflict_records.height:
+                        csv_task4 = progress.add_task("[write]Writing dsl2_conflicts.csv...", total=100)
+                        csv_path4 = tmp_folder / "dsl2_conflicts.csv"
+                        write_records_csv(dsl2_preprocess.conflict_records, csv_path4)
+                        progress.update(csv_task4, completed=100)
+                        log_secure(f"CSV written: {csv_path4}")
+                    
+                    # CSV output for Three-Way Perfect Matches
+                    if three_way_result.perfect_match_records.height:
+                        csv_task5 = progress.add_task("[write]Writing three_way_perfect_matches.csv...", total=100)
+                        csv_path5 = tmp_folder / "three_way_perfect_matches.csv"
+                        write_records_csv(three_way_result.perfect_match_records, csv_path5)
+                        progress.update(csv_task5, completed=100)
+                        log_secure(f"CSV written: {csv_path5}")
+                    
+                    # CSV output for Three-Way Discrepancies
+                    if three_way_result.discrepancy_records.height:
+                        csv_task6 = progress.add_task("[write]Writing three_way_discrepancies.csv...", total=100)
+                        csv_path6 = tmp_folder / "three_way_discrepancies.csv"
+                        write_records_csv(three_way_result.discrepancy_records, csv_path6)
+                        progress.update(csv_task6, completed=100)
+                        log_secure(f"CSV written: {csv_path6}")
+                    
+                    # HTML Artifact
+                    if args.web_report:
+                        html_task = progress.add_task("[peach]Generating nexus_report.html...", total=100)
+                        html_path = tmp_folder / "nexus_report.html"
+                        generate_nexus_artifact(combined_result, html_path, progress, html_task)
+                    
+                    # Manifest
+                    manifest_task = progress.add_task("[secure]Generating manifest.json...", total=100)
+                    manifest = generate_manifest(combined_result, args.dsl1, args.dsl2, ps_folder, args.output, progress, manifest_task)
+                    manifest_path = tmp_folder / "manifest.json"
+                    
+                    with open(manifest_path, "w", encoding="utf-8") as f:
+                        json.dump(manifest, f, indent=2, ensure_ascii=False, default=iso_converter)
+                    log_secure(f"Manifest written: {manifest_path}")
+            else:
+                # Non-rich fallback
+                if dsl1_result.error_records.height:
                     csv_path = tmp_folder / "dsl1_dsl2_discrepancies.csv"
-                    error_df = pd.DataFrame(dsl1_result.error_records)
-                    error_df.to_csv(csv_path, index=False, encoding="utf-8-sig")
-                    progress.update(csv_task, completed=100)
-                    log_secure(f"CSV written: {csv_path}")
+                    write_records_csv(dsl1_result.error_records, csv_path)
                 
-                # CSV output for PS vs DSL2 errors
-                if ps_result.error_records:
-                    csv_task2 = progress.add_task("[write]Writing ps_dsl2_discrepancies.csv...", total=100)
+                if ps_result.error_records.height:
                     csv_path2 = tmp_folder / "ps_dsl2_discrepancies.csv"
-                    error_df2 = pd.DataFrame(ps_result.error_records)
-                    error_df2.to_csv(csv_path2, index=False, encoding="utf-8-sig")
-                    progress.update(csv_task2, completed=100)
-                    log_secure(f"CSV written: {csv_path2}")
+                    write_records_csv(ps_result.error_records, csv_path2)
                 
-                # CSV output for Debt Separation cases
-                if dsl1_result.debt_separation_records:
-                    csv_task3 = progress.add_task("[write]Writing debt_separation_cases.csv...", total=100)
+                if dsl1_result.debt_separation_records.height:
                     csv_path3 = tmp_folder / "debt_separation_cases.csv"
-                    debt_df = pd.DataFrame(dsl1_result.debt_separation_records)
-                    debt_df.to_csv(csv_path3, index=False, encoding="utf-8-sig")
-                    progress.update(csv_task3, completed=100)
-                    log_secure(f"CSV written: {csv_path3}")
+                    write_records_csv(dsl1_result.debt_separation_records, csv_path3)
                 
-                # CSV output for DSL2 Conflicts
-                if dsl2_preprocess.conflict_records:
-                    csv_task4 = progress.add_task("[write]Writing dsl2_conflicts.csv...", total=100)
+                if dsl2_preprocess.conflict_records.height:
                     csv_path4 = tmp_folder / "dsl2_conflicts.csv"
-                    conflict_df = pd.DataFrame(dsl2_preprocess.conflict_records)
-                    conflict_df.to_csv(csv_path4, index=False, encoding="utf-8-sig")
-                    progress.update(csv_task4, completed=100)
-                    log_secure(f"CSV written: {csv_path4}")
+                    write_records_csv(dsl2_preprocess.conflict_records, csv_path4)
                 
-                # CSV output for Three-Way Perfect Matches
-                if three_way_result.perfect_match_records:
-                    csv_task5 = progress.add_task("[write]Writing three_way_perfect_matches.csv...", total=100)
+                if three_way_result.perfect_match_records.height:
                     csv_path5 = tmp_folder / "three_way_perfect_matches.csv"
-                    perfect_df = pd.DataFrame(three_way_result.perfect_match_records)
-                    perfect_df.to_csv(csv_path5, index=False, encoding="utf-8-sig")
-                    progress.update(csv_task5, completed=100)
-                    log_secure(f"CSV written: {csv_path5}")
+                    write_records_csv(three_way_result.perfect_match_records, csv_path5)
                 
-                # CSV output for Three-Way Discrepancies
-                if three_way_result.discrepancy_records:
-                    csv_task6 = progress.add_task("[write]Writing three_way_discrepancies.csv...", total=100)
+                if three_way_result.discrepancy_records.height:
                     csv_path6 = tmp_folder / "three_way_discrepancies.csv"
-                    disc_df = pd.DataFrame(three_way_result.discrepancy_records)
-                    disc_df.to_csv(csv_path6, index=False, encoding="utf-8-sig")
-                    progress.update(csv_task6, completed=100)
-                    log_secure(f"CSV written: {csv_path6}")
+                    write_records_csv(three_way_result.discrepancy_records, csv_path6)
                 
-                # HTML Artifact
                 if args.web_report:
-                    html_task = progress.add_task("[peach]Generating nexus_report.html...", total=100)
                     html_path = tmp_folder / "nexus_report.html"
-                    generate_nexus_artifact(combined_result, html_path, progress, html_task)
+                    generate_nexus_artifact(combined_result, html_path)
                 
-                # Manifest
-                manifest_task = progress.add_task("[secure]Generating manifest.json...", total=100)
-                manifest = generate_manifest(combined_result, args.dsl1, args.dsl2, ps_folder, args.output, progress, manifest_task)
+                manifest = generate_manifest(combined_result, args.dsl1, args.dsl2, ps_folder, args.output)
                 manifest_path = tmp_folder / "manifest.json"
-                
                 with open(manifest_path, "w", encoding="utf-8") as f:
                     json.dump(manifest, f, indent=2, ensure_ascii=False, default=iso_converter)
-                log_secure(f"Manifest written: {manifest_path}")
-        else:
-            # Non-rich fallback
-            if dsl1_result.error_records:
-                csv_path = tmp_folder / "dsl1_dsl2_discrepancies.csv"
-                pd.DataFrame(dsl1_result.error_records).to_csv(csv_path, index=False, encoding="utf-8-sig")
-            
-            if ps_result.error_records:
-                csv_path2 = tmp_folder / "ps_dsl2_discrepancies.csv"
-                pd.DataFrame(ps_result.error_records).to_csv(csv_path2, index=False, encoding="utf-8-sig")
-            
-            if dsl1_result.debt_separation_records:
-                csv_path3 = tmp_folder / "debt_separation_cases.csv"
-                pd.DataFrame(dsl1_result.debt_separation_records).to_csv(csv_path3, index=False, encoding="utf-8-sig")
-            
-            if dsl2_preprocess.conflict_records:
-                csv_path4 = tmp_folder / "dsl2_conflicts.csv"
-                pd.DataFrame(dsl2_preprocess.conflict_records).to_csv(csv_path4, index=False, encoding="utf-8-sig")
-            
-            if three_way_result.perfect_match_records:
-                csv_path5 = tmp_folder / "three_way_perfect_matches.csv"
-                pd.DataFrame(three_way_result.perfect_match_records).to_csv(csv_path5, index=False, encoding="utf-8-sig")
-            
-            if three_way_result.discrepancy_records:
-                csv_path6 = tmp_folder / "three_way_discrepancies.csv"
-                pd.DataFrame(three_way_result.discrepancy_records).to_csv(csv_path6, index=False, encoding="utf-8-sig")
-            
-            if args.web_report:
-                html_path = tmp_folder / "nexus_report.html"
-                generate_nexus_artifact(combined_result, html_path)
             
-            manifest = generate_manifest(combined_result, args.dsl1, args.dsl2, ps_folder, args.output)
-            manifest_path = tmp_folder / "manifest.json"
-            with open(manifest_path, "w", encoding="utf-8") as f:
-                json.dump(manifest, f, indent=2, ensure_ascii=False, default=iso_converter)
+            checkpoints.mark("report", report_fp)
         
-        # Atomic move from tmp to final
+        # Atomic move from tmp to final (checkpoints are no longer needed)
         log_write("Moving files to final destination...")
         
-        import shutil
+        checkpoints.clear()
         for f in tmp_folder.iterdir():
             final_path = args.output / f.name
             if final_path.exists():
@@ -0,0 +1,1257 @@
+"""
+Tests for compare_init.py.
+
+Function-level checks run on small in-memory frames and files; end-to-end
+checks run the CLI on a small generated fixture (DSL1, CP874 DSL2 and
+Payment Schedule folders) and compare the reports of alternative modes
+against the default run.
+
+Run with: python -m pytest -q test_compare_init.py
+"""
+
+import json
+import random
+import shutil
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import pytest
+
+import compare_init
+
+SCRIPT = Path(compare_init.__file__).resolve()
+
+DSL2_TITLE = "รายงานข้อมูล,,,"
+DSL2_HEADER = "ลำดับ,เลขบัญชี,วันที่เริ่มชำระหนี้,ยอดหนี้เงินกู้"
+
+# Runs main() as if Rich were not installed (the script path follows -c)
+WITHOUT_RICH = (
+    "import os, sys; sys.argv[0] = sys.argv.pop(1); sys.path.insert(0, os.path.dirname(sys.argv[0])); "
+    "import compare_init; compare_init.RICH_AVAILABLE = False; compare_init.console = None; compare_init.main()"
+)
+
+# Manifest statistics that legitimately differ between runs
+VOLATILE_STATS = ("duration_seconds", "generated_at")
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# FIXTURE
+# ══════════════════════════════════════════════════════════════════════════════
+
+def write_dsl2(path: Path, rows) -> None:
+    """DSL2 export: CP874, a title row above the header."""
+    lines = [DSL2_TITLE, DSL2_HEADER] + [",".join(row) for row in rows]
+    path.write_bytes(("\n".join(lines) + "\n").encode("cp874"))
+
+
+def write_fixture(root: Path, accounts: int = 400, seed: int = 7) -> None:
+    """
+    DSL1 (two files), DSL2 (three CP874 files) and one Payment Schedule file
+    exercising leading zeros, date and balance mismatches, unmatched accounts
+    on every side, exact and formatting-variant DSL2 duplicates, and conflicts.
+    """
+    rng = random.Random(seed)
+    for folder in ("DSL1", "DSL2", "PS"):
+        (root / folder).mkdir(parents=True)
+
+    accs = [f"{rng.randint(1, 10 ** 9):012d}" for _ in range(accounts)]
+    truth = {}
+
+    dsl1 = []
+    for acc in accs:
+        y, m, d = rng.randint(2015, 2024), rng.randint(1, 12), rng.randint(1, 28)
+        bal = round(rng.uniform(0, 1e6), 2)
+        truth[acc] = (y, m, d, bal)
+        exact = bal if rng.random() < 0.9 else bal + 100
+        flag = rng.choice(["1", "1", "1", "0", ""])
+        when = rng.choice([f"{y}-{m:02d}-{d:02d}", f"{y}-{m:02d}-{d:02d} 00:00:00"])
+        dsl1.append(f"{acc},{flag},{when},{bal},{exact}")
+    dsl1.append("000000000042,1,2020-01-01,10.0,10.0")  # No DSL2 row
+
+    header = "ACC_NO,GROUP_FLAG,FIRST_PAYMENT_DATE,PRE_BALANCE,EXACT_PRE_BALANCE"
+    half = len(dsl1) // 2
+    (root / "DSL1" / "a.csv").write_text("\n".join([header] + dsl1[:half]) + "\n", encoding="utf-8")
+    (root / "DSL1" / "b.csv").write_text("\n".join([header] + dsl1[half:]) + "\n", encoding="utf-8")
+
+    for part in range(3):
+        rows = []
+        for idx, acc in enumerate(accs[part::3]):
+            y, m, d, bal = truth[acc]
+            if rng.random() < 0.1:
+                d = min(28, d + 1)
+            if rng.random() < 0.1:
+                bal += 5
+            key = acc.lstrip("0") if rng.random() < 0.3 else acc
+            when = f"{d:02d}/{m:02d}/{y + 543}"
+            rows.append([str(idx), key, when, f"{bal:.2f}"])
+            roll = rng.random()
+            if roll < 0.05:
+                rows.append([str(idx), key, when, f"{bal:.2f}"])
+            elif roll < 0.10:
+                rows.append([str(idx), key, when, f"{bal}"])
+            elif roll < 0.13:
+                rows.append([str(idx), key, "01/01/2560", f"{bal:.2f}"])
+        write_dsl2(root / "DSL2" / f"br{part}.csv", rows)
+
+    ps = ["ACC_NO,DUE_PAYMENT_DATE,CAPITAL_REMAIN"]
+    for acc in accs[: int(accounts * 0.8)]:
+        y, m, d, bal = truth[acc]
+        for k in range(rng.randint(1, 3)):
+            mm, yy = (m - 1 + k) % 12 + 1, y + (m - 1 + k) // 12
+            ps.append(f"{acc},{yy}-{mm:02d}-{d:02d},{max(0, bal - k * 1000):.2f}")
+    ps.append("999999999999,2020-01-01,1.00")  # No DSL2 row
+    (root / "PS" / "ps.csv").write_text("\n".join(ps) + "\n", encoding="utf-8")
+
+
+def run_reconciliation(data: Path, output: Path, *args: str, without_rich: bool = False) -> Path:
+    """Run the CLI on the fixture (optionally on its plain-print path) and return its output folder."""
+    entry = ["-c", WITHOUT_RICH, str(SCRIPT)] if without_rich else [str(SCRIPT)]
+    subprocess.run(
+        [
+            sys.executable, *entry,
+            "--dsl1", str(data / "DSL1"),
+            "--dsl2", str(data / "DSL2"),
+            "--payment-schedule", str(data / "PS"),
+            "--output", str(output),
+            "--max-errors", "25",
+            *args,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return output
+
+
+def stable_stats(run: Path):
+    """Manifest statistics without timings, floats rounded past summation noise."""
+    def strip(value):
+        if isinstance(value, dict):
+            return {k: strip(v) for k, v in value.items() if k not in VOLATILE_STATS}
+        if isinstance(value, list):
+            return [strip(v) for v in value]
+        if isinstance(value, float):
+            return round(value, 6)
+        return value
+
+    with open(run / "manifest.json", "r", encoding="utf-8") as f:
+        return strip(json.load(f)["statistics"])
+
+
+def assert_same_reports(expected: Path, actual: Path) -> None:
+    """Byte-identical CSV reports and equal per-account outcomes."""
+    reports = sorted(p.name for p in expected.glob("*.csv"))
+    assert reports
+    for name in reports:
+        assert (actual / name).read_bytes() == (expected / name).read_bytes(), name
+
+    for name in compare_init.ACCOUNT_OUTCOME_FILES.values():
+        assert pl.read_parquet(actual / name).equals(pl.read_parquet(expected / name)), name
+
+
+def assert_same_outputs(expected: Path, actual: Path) -> None:
+    """Same statistics, reports and per-account outcomes."""
+    assert stable_stats(actual) == stable_stats(expected)
+    assert_same_reports(expected, actual)
+
+
+@pytest.fixture(scope="module")
+def fixture_data(tmp_path_factory) -> Path:
+    root = tmp_path_factory.mktemp("data")
+    write_fixture(root)
+    return root
+
+
+@pytest.fixture(scope="module")
+def default_run(fixture_data, tmp_path_factory) -> Path:
+    return run_reconciliation(fixture_data, tmp_path_factory.mktemp("default") / "out")
+
+
+@pytest.fixture
+def warnings(monkeypatch):
+    """Messages passed to log_warn during the test."""
+    messages = []
+    monkeypatch.setattr(compare_init, "log_warn", lambda message, *args, **kwargs: messages.append(message))
+    return messages
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# THAI-ENCODED INGEST
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_transcode_to_utf8_decodes_cp874_in_chunks(tmp_path):
+    source = tmp_path / "src.csv"
+    text = "เลขบัญชี,ยอดหนี้เงินกู้\n001,1,000.50\n" * 50
+    source.write_bytes(text.encode("cp874"))
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+
+    utf8_path = compare_init.transcode_to_utf8(source, "cp874", work_dir, chunk_size=7)
+
+    assert utf8_path.parent == work_dir
+    assert utf8_path.read_text(encoding="utf-8") == text
+
+
+def test_transcode_to_utf8_warns_on_undecodable_bytes(tmp_path, warnings):
+    source = tmp_path / "src.csv"
+    source.write_bytes("บัญชี".encode("cp874") + b"\xdb\xfc\n")  # Unassigned in CP874
+
+    utf8_path = compare_init.transcode_to_utf8(source, "cp874", tmp_path)
+
+    assert utf8_path.read_text(encoding="utf-8") == "บัญชี��\n"
+    assert len(warnings) == 1 and "2 undecodable" in warnings[0]
+
+
+def test_read_csv_polars_any_encoding_reads_cp874_dsl2(tmp_path):
+    path = tmp_path / "x.csv"
+    write_dsl2(path, [["1", " 0012 ", "01/01/2567", "\"1,000.50\""], ["2", "0034", "-", "-"]])
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    required = ["เลขบัญชี", "วันที่เริ่มชำระหนี้", "ยอดหนี้เงินกู้"]
+
+    encoding = compare_init.detect_encoding(path)
+    header_row_idx = compare_init.detect_header_row_index(path, encoding, required)
+    df = compare_init.read_csv_polars_any_encoding(
+        path, encoding, required, key_col="เลขบัญชี", header_row_idx=header_row_idx, work_dir=work_dir
+    )
+
+    assert df.columns == required
+    assert df["เลขบัญชี"].to_list() == ["0012", "0034"]
+    assert df["ยอดหนี้เงินกู้"].to_list() == ["1,000.50", "-"]
+    assert list(work_dir.iterdir()) == []  # The UTF-8 copy is removed after the read
+
+
+def test_cli_loads_every_cp874_dsl2_row(fixture_data, default_run):
+    rows = sum(
+        len(path.read_bytes().decode("cp874").splitlines()) - 2
+        for path in (fixture_data / "DSL2").glob("*.csv")
+    )
+    assert stable_stats(default_run)["dsl2_preprocessing"]["original_rows"] == rows
+    assert not (default_run / "_tmp").exists()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# INGEST CACHE
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_cached_ingest_hits_until_the_source_changes(tmp_path):
+    source = tmp_path / "src.csv"
+    source.write_text("ACC_NO\n1\n", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    builds = []
+
+    def build():
+        builds.append(source.read_text(encoding="utf-8"))
+        return pl.read_csv(source, infer_schema=False)
+
+    first = compare_init.cached_ingest(cache_dir, "dsl1", source, build).collect()
+    second = compare_init.cached_ingest(cache_dir, "dsl1", source, build).collect()
+    assert len(builds) == 1
+    assert second.equals(first)
+
+    source.write_text("ACC_NO\n2\n", encoding="utf-8")
+    third = compare_init.cached_ingest(cache_dir, "dsl1", source, build).collect()
+    assert len(builds) == 2
+    assert third["ACC_NO"].to_list() == ["2"]
+
+
+def test_cached_ingest_passes_through_without_cache_dir(tmp_path):
+    source = tmp_path / "src.csv"
+    source.write_text("ACC_NO\n1\n", encoding="utf-8")
+
+    lf = compare_init.cached_ingest(None, "dsl1", source, lambda: pl.read_csv(source))
+
+    assert lf.collect()["ACC_NO"].to_list() == [1]
+    assert compare_init.cached_ingest(None, "dsl1", source, lambda: None) is None
+
+
+def test_cli_cache_run_matches_default(fixture_data, default_run, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cold = run_reconciliation(fixture_data, tmp_path / "cold", "--cache-dir", str(cache_dir))
+    entries = sorted(cache_dir.rglob("*.parquet"))
+    warm = run_reconciliation(fixture_data, tmp_path / "warm", "--cache-dir", str(cache_dir))
+
+    assert len(entries) == 6  # One per source file
+    assert sorted(cache_dir.rglob("*.parquet")) == entries
+    assert_same_outputs(default_run, cold)
+    assert_same_outputs(default_run, warm)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PARALLEL FILE LOADING
+# ══════════════════════════════════════════════════════════════════════════════
+
+@pytest.mark.parametrize("dataset, folder", [("dsl1", "DSL1"), ("dsl2", "DSL2"), ("payment_schedule", "PS")])
+def test_ingest_files_pool_matches_serial(fixture_data, tmp_path, dataset, folder):
+    files = compare_init.discover_files(fixture_data / folder)
+    serial = compare_init.ingest_files(dataset, files, workers=1, work_dir=tmp_path)
+    pooled = compare_init.ingest_files(dataset, files, workers=3, work_dir=tmp_path)
+
+    assert [path for path, _ in pooled] == files
+    for (_, expected), (_, actual) in zip(serial, pooled):
+        assert actual.collect().equals(expected.collect())
+
+
+def test_ingest_file_task_probes_lazy_datasets(fixture_data):
+    path = fixture_data / "DSL1" / "a.csv"
+
+    probe, fingerprint = compare_init.ingest_file_task(path, "dsl1", None)
+
+    assert fingerprint is None
+    assert probe["columns"] == compare_init.DSL1_REQUIRED_COLS
+    expected = compare_init.scan_dsl1_file(path).collect()
+    assert compare_init.scan_dsl1_file(path, probe=probe).collect().equals(expected)
+
+
+def test_ingest_file_task_skips_files_without_acc_no(tmp_path, monkeypatch):
+    monkeypatch.setattr(compare_init, "log_fatal", lambda *args, **kwargs: None)
+    path = tmp_path / "x.csv"
+    path.write_text("OTHER\n1\n", encoding="utf-8")
+
+    assert compare_init.ingest_file_task(path, "payment_schedule", None) == (None, None)
+
+
+def test_cli_single_worker_matches_default(fixture_data, default_run, tmp_path):
+    assert_same_outputs(default_run, run_reconciliation(fixture_data, tmp_path / "out", "--workers", "1"))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# DSL1 GROUP_FLAG FILTER
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_collect_dsl1_filtered_keeps_group_flag_1():
+    dsl1 = pl.LazyFrame({
+        "ACC_NO": ["1", "2", "3", "4", "5"],
+        "GROUP_FLAG": ["1", "0", None, "1", "x"],
+    })
+
+    filtered, total_rows = compare_init.collect_dsl1_filtered(dsl1)
+
+    assert total_rows == 5
+    assert filtered["ACC_NO"].to_list() == ["1", "4"]
+
+
+def test_filter_group_flag_without_the_column_keeps_every_row(warnings):
+    dsl1 = pl.LazyFrame({"ACC_NO": ["1", "2"]})
+
+    assert compare_init.filter_group_flag(dsl1).collect().height == 2
+    assert warnings
+
+
+def test_cli_counts_dsl1_before_and_after_the_filter(fixture_data, default_run):
+    lines = [
+        line.split(",")
+        for path in sorted((fixture_data / "DSL1").glob("*.csv"))
+        for line in path.read_text(encoding="utf-8").splitlines()[1:]
+    ]
+    stats = stable_stats(default_run)["dsl1_vs_dsl2"]
+
+    assert stats["total_dsl1_rows"] == len(lines)
+    assert stats["total_dsl1_filtered_rows"] == sum(fields[1] == "1" for fields in lines)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# NORMALIZED ACCOUNT KEYS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_account_key_expr_trims_and_strips_leading_zeros():
+    df = pl.DataFrame({"ACC_NO": [" 000123 ", "123", "0", "A01"]})
+
+    keys = df.select(compare_init.account_key_expr("ACC_NO"))[compare_init.ACC_KEY_COL]
+
+    assert keys.to_list() == ["123", "123", "", "A01"]
+
+
+def test_ensure_account_key_reuses_the_precomputed_key():
+    df = pl.DataFrame({"ACC_NO": ["0012"], compare_init.ACC_KEY_COL: ["precomputed"]})
+
+    assert compare_init.ensure_account_key(df, "ACC_NO").equals(df)
+    added = compare_init.ensure_account_key(df.drop(compare_init.ACC_KEY_COL), "ACC_NO")
+    assert added[compare_init.ACC_KEY_COL].to_list() == ["12"]
+
+
+@pytest.mark.parametrize("dataset, folder", [("dsl1", "DSL1"), ("dsl2", "DSL2"), ("payment_schedule", "PS")])
+def test_loaders_attach_the_account_key(fixture_data, dataset, folder):
+    path = compare_init.discover_files(fixture_data / folder)[0]
+    source_col = "เลขบัญชี" if dataset == "dsl2" else "ACC_NO"
+
+    df = compare_init.INGEST_BUILDERS[dataset](path).lazy().collect()
+
+    expected = df.select(compare_init.account_key_expr(source_col))
+    assert df.select(compare_init.ACC_KEY_COL).equals(expected)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# UINT64 ACCOUNT KEYS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def keyed(*keys):
+    return compare_init.ensure_account_key(pl.DataFrame({"ACC_NO": list(keys)}), "ACC_NO")
+
+
+def test_encode_account_keys_maps_numeric_keys_to_their_value():
+    (df,) = compare_init.encode_account_keys(keyed("00123", "456"))
+
+    assert df[compare_init.ACC_KEY_INT_COL].dtype == pl.UInt64
+    assert df[compare_init.ACC_KEY_INT_COL].to_list() == [123, 456]
+
+
+def test_encode_account_keys_dictionary_ids_are_consistent_across_frames():
+    left, missing, right = compare_init.encode_account_keys(
+        keyed("A01", "7", "123456789012345678901"),
+        None,
+        keyed("B02", "A01", "123456789012345678901"),
+    )
+
+    left_ids = dict(zip(left["ACC_NO"], left[compare_init.ACC_KEY_INT_COL]))
+    right_ids = dict(zip(right["ACC_NO"], right[compare_init.ACC_KEY_INT_COL]))
+    assert missing is None
+    assert left_ids["7"] == 7
+    assert left_ids["A01"] == right_ids["A01"] >= compare_init.DICT_KEY_BASE
+    assert left_ids["123456789012345678901"] == right_ids["123456789012345678901"] >= compare_init.DICT_KEY_BASE
+    assert right_ids["B02"] >= compare_init.DICT_KEY_BASE
+    assert len({left_ids["A01"], left_ids["123456789012345678901"], right_ids["B02"]}) == 3
+
+
+def test_encoded_join_matches_the_string_join():
+    left, right = compare_init.encode_account_keys(
+        keyed("001", "A01", "", "9223372036854775808"),
+        keyed("1", "A01", "0", "9223372036854775808", "X"),
+    )
+
+    by_int = left.join(right, on=compare_init.ACC_KEY_INT_COL).select("ACC_NO").sort("ACC_NO")
+    by_str = left.join(right, on=compare_init.ACC_KEY_COL).select("ACC_NO").sort("ACC_NO")
+    assert by_int.equals(by_str)
+    assert by_int.height == 4
+
+
+def test_join_key_for_needs_the_integer_key_on_every_frame():
+    (encoded,) = compare_init.encode_account_keys(keyed("1"))
+
+    assert compare_init.join_key_for(encoded, encoded) == compare_init.ACC_KEY_INT_COL
+    assert compare_init.join_key_for(encoded, keyed("1")) == compare_init.ACC_KEY_COL
+
+
+def test_cli_string_key_encoding_matches_the_default(fixture_data, default_run, tmp_path):
+    output = run_reconciliation(fixture_data, tmp_path / "out", "--key-encoding", "string")
+
+    assert_same_outputs(default_run, output)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# BUDDHIST ERA DATES
+# ══════════════════════════════════════════════════════════════════════════════
+
+BUDDHIST_DATES = [
+    "15/01/2567", " 1/2/2500 ", "๑๕/๐๑/๒๕๖๗", "29/02/2567", "30/02/2567", "31/12/2643",
+    "01/01/2644", "0/01/2567", "01/13/2567", "2567-01-15", "15/01", "", "-", "abc", None,
+]
+
+
+def test_buddhist_expr_matches_the_row_parser():
+    df = pl.DataFrame({"D": BUDDHIST_DATES}, schema={"D": pl.Utf8})
+
+    parsed = df.select(compare_init.parse_date_dsl2_buddhist_expr("D").alias("D"))["D"].to_list()
+
+    expected = [compare_init.parse_date_dsl2_buddhist(value) for value in BUDDHIST_DATES]
+    assert parsed == [value.date() if value else None for value in expected]
+    assert parsed[0] == date(2024, 1, 15)
+    assert parsed[2] == date(2024, 1, 15)
+
+
+def test_ensure_dsl2_dates_attaches_a_date_column_once():
+    df = pl.DataFrame({"วันที่เริ่มชำระหนี้": ["15/01/2567"]})
+
+    dated = compare_init.ensure_dsl2_dates(df)
+
+    assert dated[compare_init.DSL2_DATE_COL].to_list() == [date(2024, 1, 15)]
+    assert compare_init.ensure_dsl2_dates(dated).equals(dated)
+    round_trip = dated.with_columns(pl.col(compare_init.DSL2_DATE_COL).cast(pl.Datetime))
+    assert compare_init.ensure_dsl2_dates(round_trip).schema[compare_init.DSL2_DATE_COL] == pl.Date
+    missing = compare_init.ensure_dsl2_dates(pl.DataFrame({"x": [1]}))
+    assert missing[compare_init.DSL2_DATE_COL].to_list() == [None]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# INFERRED DATE FORMATS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_infer_date_formats_keeps_only_the_formats_in_use():
+    formats = compare_init.PS_DATE_FORMATS
+
+    assert compare_init.infer_date_formats(pl.Series(["2024-01-15", "2023-12-31"]), formats) == ["%Y-%m-%d"]
+    assert compare_init.infer_date_formats(pl.Series(["15/01/2024", "2024-01-15"]), formats) == ["%Y-%m-%d", "%d/%m/%Y"]
+    assert compare_init.infer_date_formats(pl.Series([None], dtype=pl.Utf8), formats) == formats
+    assert compare_init.infer_date_formats(pl.Series(["garbage"]), formats) == formats
+
+
+def test_attach_ps_dates_matches_the_row_parser():
+    values = ["2024-01-15", "15/01/2024 10:30:00", "05/01/2023", "12/31/2023", "2024/02/29", "-", "bad", None]
+    lf = pl.LazyFrame({"DUE_PAYMENT_DATE": values}, schema={"DUE_PAYMENT_DATE": pl.Utf8})
+
+    parsed = compare_init.attach_ps_dates(lf, "test").collect()[compare_init.PS_DATE_COL]
+
+    expected = [compare_init.parse_date_payment_schedule(value) for value in values]
+    assert parsed.to_list() == [value.date() if value else None for value in expected]
+
+
+def test_ensure_parsed_dates_repairs_rows_outside_the_sampled_format():
+    lf = pl.LazyFrame({"FIRST_PAYMENT_DATE": ["2024-01-15", "16/01/2024"]})
+    sampled = compare_init.attach_dsl1_dates(lf, "test", ["%Y-%m-%d"]).collect()
+
+    assert sampled[compare_init.DSL1_DATE_COL].to_list() == [date(2024, 1, 15), None]
+    repaired = compare_init.ensure_dsl1_dates(sampled)
+    assert repaired[compare_init.DSL1_DATE_COL].to_list() == [date(2024, 1, 15), date(2024, 1, 16)]
+
+
+def test_probes_carry_the_inferred_date_formats(fixture_data):
+    dsl1 = compare_init.probe_dsl1_file(compare_init.discover_files(fixture_data / "DSL1")[0])
+    ps = compare_init.probe_payment_schedule_file(compare_init.discover_files(fixture_data / "PS")[0])
+
+    assert dsl1["date_formats"] == ["%Y-%m-%d"]
+    assert ps["date_formats"] == ["%Y-%m-%d"]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# COLUMNAR BALANCES
+# ══════════════════════════════════════════════════════════════════════════════
+
+BALANCES = ["1,234.50", " 12 ", "-5.5", "1e3", "๑๒๓", "-", "", "N/A", "nan", "abc", None]
+
+
+def test_safe_float_expr_matches_safe_float():
+    df = pl.DataFrame({"B": BALANCES}, schema={"B": pl.Utf8})
+
+    parsed = df.select(compare_init.safe_float_expr("B", pl.Utf8).alias("B"))["B"].to_list()
+
+    assert parsed == [compare_init.safe_float(value) for value in BALANCES]
+    numeric = pl.DataFrame({"B": [1.5, None, float("nan")]})
+    assert numeric.select(compare_init.safe_float_expr("B", pl.Float64, -1.0))["B"].to_list() == [1.5, -1.0, -1.0]
+
+
+def test_ensure_balances_keeps_the_raw_column_and_parses_once():
+    lf = pl.LazyFrame({"CAPITAL_REMAIN": ["1,000.00", "x"]})
+
+    parsed = compare_init.ensure_balances(lf, compare_init.PS_BALANCE_COLS)
+
+    assert parsed.collect()["BAL_PS"].to_list() == [1000.0, 0.0]
+    assert parsed.collect()["CAPITAL_REMAIN"].to_list() == ["1,000.00", "x"]
+    assert compare_init.ensure_balances(parsed, compare_init.PS_BALANCE_COLS) is parsed
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# LAZY RECONCILE PLANS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def tiny_sources():
+    """
+    Accounts 1-4 are in every source: 1 is perfect, 2 has a later DSL2 date,
+    3 a higher DSL2 balance, 4 both. DSL1 5 is GROUP_FLAG 0, DSL1 6, DSL2 7
+    and PS 8 have no counterpart.
+    """
+    dsl1 = pl.DataFrame({
+        "ACC_NO": ["001", "2", "3", "4", "5", "6"],
+        "GROUP_FLAG": ["1", "1", "1", "1", "0", "1"],
+        "FIRST_PAYMENT_DATE": ["2024-01-15"] * 6,
+        "PRE_BALANCE": ["100", "200", "300", "400", "500", "600"],
+        "EXACT_PRE_BALANCE": ["100", "200", "300", "400", "500", "600"],
+    })
+    dsl2 = pl.DataFrame({
+        "เลขบัญชี": ["1", "2", "3", "4", "7"],
+        "วันที่เริ่มชำระหนี้": ["15/01/2567", "16/01/2567", "15/01/2567", "16/01/2567", "15/01/2567"],
+        "ยอดหนี้เงินกู้": ["100.00", "200", "350", "450", "1"],
+    })
+    ps = pl.DataFrame({
+        "ACC_NO": ["1", "2", "3", "8"],
+        "DUE_PAYMENT_DATE": ["2024-01-15", "2024-01-16", "2024-01-15", "2024-01-15"],
+        "CAPITAL_REMAIN": ["100", "200", "300", "1"],
+    })
+    return dsl1, dsl2, ps
+
+
+def test_reconcile_dsl1_vs_dsl2_counts_each_category():
+    dsl1, dsl2, _ = tiny_sources()
+
+    result = compare_init.reconcile_dsl1_vs_dsl2(dsl1, dsl2, max_error_records=10)
+
+    assert (result.total_dsl1_rows, result.total_dsl1_filtered_rows, result.matched_rows) == (6, 5, 4)
+    assert result.unmatched_dsl2 == 1
+    assert (result.perfect_matches, result.date_mismatches, result.balance_mismatches, result.both_mismatches) == (1, 1, 1, 1)
+    assert result.exact_vs_dsl2_mismatches == 2
+    assert result.error_records["ACC_NO"].to_list() == ["2", "3", "4"]
+
+
+def test_reconcile_ps_vs_dsl2_counts_each_category():
+    _, dsl2, ps = tiny_sources()
+
+    result = compare_init.reconcile_ps_vs_dsl2(ps, dsl2, max_error_records=10)
+
+    assert (result.matched_rows, result.unmatched_dsl2, result.perfect_matches, result.balance_mismatches) == (3, 2, 2, 1)
+    assert result.date_mismatches == result.both_mismatches == 0
+    (record,) = result.error_records.to_dicts()
+    assert (record["ACC_NO"], record["BAL_DIFF"], record["DATE_MATCH"]) == ("3", 50.0, True)
+
+
+def test_reconcile_three_way_samples_in_dsl1_order():
+    dsl1, dsl2, ps = tiny_sources()
+
+    result = compare_init.reconcile_three_way(dsl1, dsl2, ps, max_records=10)
+
+    assert (result.matched_all_three, result.perfect_matches, result.date_mismatches, result.balance_mismatches) == (3, 1, 1, 1)
+    assert result.perfect_match_records["ACC_NO"].to_list() == ["001"]
+    assert result.discrepancy_records["ACC_NO"].to_list() == ["2", "3"]
+
+
+def test_reconcile_samples_respect_the_cap():
+    dsl1, dsl2, _ = tiny_sources()
+
+    result = compare_init.reconcile_dsl1_vs_dsl2(dsl1, dsl2, max_error_records=2)
+
+    assert result.error_records["ACC_NO"].to_list() == ["2", "3"]
+    assert result.both_mismatches == 1
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# STREAMING MODE
+# ══════════════════════════════════════════════════════════════════════════════
+
+def plain(value):
+    """Comparable form of a result attribute."""
+    if isinstance(value, pl.DataFrame):
+        return value.to_dicts()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {k: plain(v) for k, v in value.items()}
+    return value
+
+
+def result_fields(result):
+    """Counts, error arrays and samples of a reconcile result, without timings."""
+    return {
+        name: plain(value)
+        for name, value in vars(result).items()
+        if name not in ("start_time", "end_time")
+    }
+
+
+def test_streaming_lazy_inputs_match_eager_reconciliation():
+    dsl1, dsl2, ps = tiny_sources()
+
+    assert result_fields(
+        compare_init.reconcile_dsl1_vs_dsl2(dsl1.lazy(), dsl2, max_error_records=10, streaming=True)
+    ) == result_fields(compare_init.reconcile_dsl1_vs_dsl2(dsl1, dsl2, max_error_records=10))
+    assert result_fields(
+        compare_init.reconcile_ps_vs_dsl2(ps.lazy(), dsl2, max_error_records=10, streaming=True)
+    ) == result_fields(compare_init.reconcile_ps_vs_dsl2(ps, dsl2, max_error_records=10))
+    assert result_fields(
+        compare_init.reconcile_three_way(dsl1.lazy(), dsl2, ps.lazy(), max_records=10, streaming=True)
+    ) == result_fields(compare_init.reconcile_three_way(dsl1, dsl2, ps, max_records=10))
+
+
+def test_cli_streaming_matches_the_default(fixture_data, default_run, tmp_path):
+    output = run_reconciliation(fixture_data, tmp_path / "out", "--streaming", "--memory-limit-gb", "1")
+
+    assert_same_outputs(default_run, output)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PARTITIONED RECONCILIATION
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_merge_partition_results_keeps_the_global_sample_order():
+    first, second = compare_init.PaymentScheduleResult(), compare_init.PaymentScheduleResult()
+    first.matched_rows, second.matched_rows = 2, 3
+    first.balance_errors, second.balance_errors = np.array([1.0]), np.array([2.0, 3.0])
+    first.error_records = pl.DataFrame({"ACC_NO": ["a", "c"]})
+    second.error_records = pl.DataFrame({"ACC_NO": ["b", "d"]})
+    first.record_order = {"error_records": pl.DataFrame({"_ROW": [0, 5]})}
+    second.record_order = {"error_records": pl.DataFrame({"_ROW": [1, 7]})}
+
+    merged = compare_init.merge_partition_results([first, second], max_records=3)
+
+    assert merged.matched_rows == 5
+    assert merged.balance_errors.tolist() == [1.0, 2.0, 3.0]
+    assert merged.error_records["ACC_NO"].to_list() == ["a", "b", "c"]
+
+
+def test_write_partitions_buckets_equal_keys_together(tmp_path):
+    dsl1, dsl2, _ = tiny_sources()
+    sources = {
+        "dsl1": (compare_init.ensure_account_key(dsl1, "ACC_NO"), "_ROW_DSL1"),
+        "dsl2": (compare_init.ensure_account_key(dsl2, "เลขบัญชี"), "_ROW_DSL2"),
+    }
+
+    part_dirs = compare_init.write_partitions(sources, 3, tmp_path)
+
+    buckets = {
+        name: {
+            key: i
+            for i, part_dir in enumerate(part_dirs)
+            for key in compare_init.read_ipc_mapped(part_dir / f"{name}.arrow")[compare_init.ACC_KEY_COL]
+        }
+        for name in sources
+    }
+    assert sum(len(keys) for keys in buckets.values()) == dsl1.height + dsl2.height
+    assert all(buckets["dsl1"][key] == buckets["dsl2"][key] for key in ["1", "2", "3", "4"])
+
+
+@pytest.mark.parametrize("partitions", ["2", "5"])
+def test_cli_partitions_match_the_default(fixture_data, default_run, tmp_path, partitions):
+    output = run_reconciliation(fixture_data, tmp_path / "out", "--partitions", partitions)
+
+    assert_same_outputs(default_run, output)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# COLUMNAR RECORDS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_write_records_csv_keeps_the_pandas_spelling(tmp_path):
+    records = pl.DataFrame({"ACC_NO": ["1", "2"], "DATE": ["", "2024-01-15"], "MATCH": [True, False], "BAL": [1.5, None]})
+
+    compare_init.write_records_csv(records, tmp_path / "records.csv")
+
+    text = (tmp_path / "records.csv").read_bytes().decode("utf-8-sig")
+    assert text.splitlines() == ["ACC_NO,DATE,MATCH,BAL", "1,,True,1.5", "2,2024-01-15,False,"]
+
+
+def test_record_frames_format_dates_and_balances():
+    dsl1, dsl2, ps = tiny_sources()
+
+    result = compare_init.reconcile_three_way(dsl1, dsl2, ps, max_records=10)
+
+    (record,) = result.perfect_match_records.to_dicts()
+    assert record["DATE_DSL1"] == "2024-01-15"
+    assert record["DATE_DSL2"] == "15/01/2567"
+    assert record["BAL_DSL2"] == 100.0
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# FUSED AGGREGATION
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_match_category_exprs_partition_the_rows_in_scope():
+    df = pl.DataFrame({"date_ok": [True, True, False, False, True], "bal_ok": [True, False, True, False, True]})
+
+    counts = df.select(compare_init.match_category_exprs(pl.col("date_ok"), pl.col("bal_ok"), pl.int_range(pl.len()) < 4))
+
+    assert counts.row(0, named=True) == {"date_only": 1, "bal_only": 1, "both": 1, "perfect": 1}
+
+
+def test_fused_error_stats_match_the_numpy_fallback():
+    rng = random.Random(3)
+    dsl1, dsl2, _ = tiny_sources()
+    dsl2 = dsl2.with_columns(pl.Series("ยอดหนี้เงินกู้", [f"{rng.uniform(0, 500):.2f}" for _ in range(dsl2.height)]))
+
+    result = compare_init.reconcile_dsl1_vs_dsl2(dsl1, dsl2)
+    fused = (result.balance_error_stats, result.date_diff_stats)
+    result.error_stats = {}
+
+    assert fused[0] == pytest.approx(result.balance_error_stats)
+    assert fused[1] == pytest.approx(result.date_diff_stats)
+    assert result.balance_errors.size == 4
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# THREE-WAY KEY REDUCTION
+# ══════════════════════════════════════════════════════════════════════════════
+
+def staged_matched_keys(tmp_path, dsl1, dsl2, ps):
+    """Run both two-way reconciliations and return their matched-key files."""
+    paths = tuple(tmp_path / name for name in compare_init.MATCHED_KEYS_FILES.values())
+    compare_init.reconcile_dsl1_vs_dsl2(dsl1, dsl2, matched_keys_path=paths[0])
+    compare_init.reconcile_ps_vs_dsl2(ps, dsl2, matched_keys_path=paths[1])
+    return paths
+
+
+def test_read_matched_keys_intersects_the_two_way_keys(tmp_path):
+    dsl1, dsl2, ps = tiny_sources()
+    ps = pl.concat([ps, ps.head(1)])
+    paths = staged_matched_keys(tmp_path, dsl1, dsl2, ps)
+
+    key_counts = compare_init.read_matched_keys(paths, compare_init.ACC_KEY_COL).sort(compare_init.ACC_KEY_COL)
+
+    assert key_counts[compare_init.ACC_KEY_COL].to_list() == ["1", "2", "3"]
+    assert key_counts["ROWS_PS"].to_list() == [2, 1, 1]
+    assert key_counts["ROWS_DSL1"].to_list() == key_counts["ROWS_DSL2"].to_list() == [1, 1, 1]
+
+
+def test_read_matched_keys_falls_back_when_unusable(tmp_path):
+    paths = staged_matched_keys(tmp_path, *tiny_sources())
+
+    assert compare_init.read_matched_keys(None, compare_init.ACC_KEY_COL) is None
+    assert compare_init.read_matched_keys(paths, compare_init.ACC_KEY_INT_COL) is None
+    paths[1].unlink()
+    assert compare_init.read_matched_keys(paths, compare_init.ACC_KEY_COL) is None
+
+
+def test_three_way_with_matched_keys_matches_the_in_plan_intersection(tmp_path):
+    dsl1, dsl2, ps = tiny_sources()
+    ps = pl.concat([ps, ps.head(1)])
+    paths = staged_matched_keys(tmp_path, dsl1, dsl2, ps)
+
+    reduced = compare_init.reconcile_three_way(dsl1, dsl2, ps, matched_keys=paths)
+    in_plan = compare_init.reconcile_three_way(dsl1, dsl2, ps)
+
+    assert result_fields(reduced) == result_fields(in_plan)
+    assert (reduced.total_dsl1_filtered_rows, reduced.total_dsl2_rows, reduced.total_ps_rows) == (5, 5, 5)
+
+
+def test_cli_keeps_the_matched_keys_out_of_the_output(default_run):
+    assert not list(default_run.glob("matched_keys_*"))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# AS-OF INSTALLMENT MATCHING
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_asof_join_picks_one_installment_per_dsl2_row():
+    key = compare_init.ACC_KEY_COL
+    dsl2 = pl.LazyFrame({
+        key: ["a", "b", "c", "d", "e"],
+        "DATE_DSL2": [date(2024, 2, 1), date(2024, 6, 1), None, date(2024, 1, 1), date(2024, 1, 1)],
+    })
+    ps = pl.LazyFrame({
+        key: ["a", "a", "a", "b", "b", "c", "c", "d", "d"],
+        "ACC_NO": ["a1", "a2", "a3", "b1", "b2", "c1", "c2", "d1", "d2"],
+        "DATE_PS": [
+            date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1),
+            date(2024, 3, 1), date(2024, 4, 1),
+            date(2024, 5, 1), date(2024, 4, 1),
+            None, date(2023, 1, 1),
+        ],
+    })
+
+    joined = compare_init.join_ps_installments_asof(dsl2, ps, key).collect()
+
+    assert joined[key].to_list() == ["a", "b", "c", "d", "e"]
+    assert joined["ACC_NO"].to_list() == ["a2", "b2", "c2", "d1", None]
+
+
+def test_asof_ps_reconciliation_compares_each_dsl2_row_once():
+    _, dsl2, ps = tiny_sources()
+    ps = pl.concat([ps, pl.DataFrame({"ACC_NO": ["1"], "DUE_PAYMENT_DATE": ["2024-02-15"], "CAPITAL_REMAIN": ["90"]})])
+
+    every = compare_init.reconcile_ps_vs_dsl2(ps, dsl2, max_error_records=10)
+    asof = compare_init.reconcile_ps_vs_dsl2(ps, dsl2, max_error_records=10, ps_match="asof")
+
+    assert (every.matched_rows, every.balance_mismatches, every.both_mismatches) == (4, 1, 1)
+    assert (asof.matched_rows, asof.balance_mismatches, asof.both_mismatches, asof.perfect_matches) == (3, 1, 0, 2)
+    assert asof.match_mode == "asof"
+
+
+def test_cli_asof_partitions_match_a_single_process_run(fixture_data, tmp_path):
+    single = run_reconciliation(fixture_data, tmp_path / "single", "--ps-match", "asof")
+    partitioned = run_reconciliation(fixture_data, tmp_path / "partitioned", "--ps-match", "asof", "--partitions", "3")
+
+    assert_same_outputs(single, partitioned)
+    stats = stable_stats(single)["ps_vs_dsl2"]
+    assert stats["match_mode"] == "asof"
+    assert stats["matched_rows"] <= stats["total_dsl2_rows"]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# UNMATCHED ACCOUNTS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_unmatched_accounts_are_counted_and_listed_once(tmp_path):
+    dsl1, dsl2, ps = tiny_sources()
+    ps = pl.concat([ps, pl.DataFrame({
+        "ACC_NO": ["9", "0008", "10"],
+        "DUE_PAYMENT_DATE": ["2024-01-15"] * 3,
+        "CAPITAL_REMAIN": ["1"] * 3,
+    })])
+
+    dsl1_result = compare_init.reconcile_dsl1_vs_dsl2(dsl1, dsl2, unmatched_path=tmp_path / "dsl1.csv")
+    ps_result = compare_init.reconcile_ps_vs_dsl2(ps, dsl2, unmatched_path=tmp_path / "ps.csv")
+
+    assert dsl1_result.unmatched_dsl1 == 1
+    assert pl.read_csv(tmp_path / "dsl1.csv", infer_schema=False)["ACC_NO"].to_list() == ["6"]
+    assert ps_result.unmatched_ps == 3
+    assert pl.read_csv(tmp_path / "ps.csv", infer_schema=False)["ACC_NO"].to_list() == ["8", "9", "10"]
+
+
+def test_cli_unmatched_lists_match_the_manifest(default_run):
+    stats = stable_stats(default_run)
+    dsl1_list = pl.read_csv(default_run / compare_init.UNMATCHED_DSL1_FILE, infer_schema=False)
+    ps_list = pl.read_csv(default_run / compare_init.UNMATCHED_PS_FILE, infer_schema=False)
+
+    assert dsl1_list["ACC_NO"].to_list() == ["42"]
+    assert "999999999999" in ps_list["ACC_NO"].to_list()
+    assert stats["dsl1_vs_dsl2"]["unmatched_dsl1"] == dsl1_list.height
+    assert stats["ps_vs_dsl2"]["unmatched_ps"] == ps_list.height
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# DSL2 CONFLICTS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def preprocess_dsl2_rows(tmp_path, rows):
+    folder = tmp_path / "DSL2"
+    folder.mkdir()
+    write_dsl2(folder / "dsl2.csv", [[str(i), *row] for i, row in enumerate(rows, 1)])
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    return compare_init.preprocess_dsl2_with_source_tracking(folder, work_dir=work_dir)
+
+
+def test_conflicts_compare_balances_by_parsed_value(tmp_path):
+    _, result = preprocess_dsl2_rows(tmp_path, [
+        ["1", "01/01/2567", "100"], ["1", "01/01/2567", "\"100.00\""],
+        ["2", "01/01/2567", "abc"], ["2", "01/01/2567", "x"],
+        ["3", "01/01/2567", "abc"], ["3", "01/01/2567", "0"],
+        ["4", "01/01/2567", "-"], ["4", "01/01/2567", "abc"],
+        ["5", "01/01/2567", "1"], ["5", "01/02/2567", "1"],
+    ])
+
+    assert result.conflict_accounts == 4
+    assert result.conflict_records["เลขบัญชี"].cast(pl.Utf8).to_list() == ["2", "2", "3", "3", "4", "4", "5", "5"]
+    assert result.conflict_records["_SOURCE_FILE"].unique().to_list() == ["dsl2.csv"]
+
+
+def test_cli_conflicts_match_the_manifest(default_run):
+    stats = stable_stats(default_run)["dsl2_preprocessing"]
+    conflicts = pl.read_csv(default_run / "dsl2_conflicts.csv", infer_schema=False)
+
+    assert stats["conflict_accounts"] == conflicts["เลขบัญชี"].n_unique() > 0
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# DSL2 DEDUPLICATION
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_dedup_keeps_the_first_row_of_each_parsed_balance(tmp_path):
+    deduplicated, result = preprocess_dsl2_rows(tmp_path, [
+        ["1", "01/01/2567", "100"], ["1", "01/01/2567", "\"100.00\""],
+        ["2", "01/01/2567", "abc"], ["2", "01/01/2567", "0"], ["2", "01/01/2567", "-"],
+        ["2", "01/01/2567", "abc"], ["2", "01/01/2567", "x"],
+    ])
+
+    assert (result.original_rows, result.deduplicated_rows, result.duplicates_removed) == (7, 5, 2)
+    assert "_SOURCE_FILE" not in deduplicated.columns
+    assert deduplicated["ยอดหนี้เงินกู้"].to_list() == ["100", "abc", "0", "-", "x"]
+
+
+def test_dedup_matches_the_pandas_drop_duplicates_on_clean_balances(fixture_data, tmp_path):
+    deduplicated, _ = compare_init.preprocess_dsl2_with_source_tracking(fixture_data / "DSL2", work_dir=tmp_path)
+    combined = pl.concat(
+        [lf.collect() for _, lf in compare_init.ingest_files("dsl2", compare_init.discover_files(fixture_data / "DSL2"), work_dir=tmp_path)],
+        how="diagonal",
+    )
+    balance = combined["ยอดหนี้เงินกู้"].cast(pl.Utf8).str.replace_all(",", "").cast(pl.Float64, strict=False)
+    expected = (
+        combined.with_columns(balance.alias("_BAL")).to_pandas()
+        .drop_duplicates(subset=["เลขบัญชี", "วันที่เริ่มชำระหนี้", "_BAL"], keep="first")
+    )
+
+    assert deduplicated.height == len(expected)
+    assert deduplicated["เลขบัญชี"].to_list() == expected["เลขบัญชี"].tolist()
+
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# DUCKDB ENGINE
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_duckdb_engine_matches_the_polars_plans(tmp_path):
+    pytest.importorskip("duckdb")
+    dsl1, dsl2, ps = tiny_sources()
+    dsl1 = dsl1.filter(pl.col("GROUP_FLAG") == "1")
+    ps = pl.concat([ps, pl.DataFrame({"ACC_NO": ["0008"], "DUE_PAYMENT_DATE": ["2024-01-15"], "CAPITAL_REMAIN": ["1"]})])
+
+    duckdb_results = compare_init.reconcile_duckdb(dsl1, dsl2, ps, work_dir=tmp_path / "duckdb", max_records=10)
+    polars_results = (
+        compare_init.reconcile_dsl1_vs_dsl2(dsl1, dsl2, max_error_records=10, dsl1_prefiltered=True),
+        compare_init.reconcile_ps_vs_dsl2(ps, dsl2, max_error_records=10),
+        compare_init.reconcile_three_way(dsl1, dsl2, ps, max_records=10, dsl1_prefiltered=True),
+    )
+
+    for duckdb_result, polars_result in zip(duckdb_results, polars_results):
+        duckdb_fields, polars_fields = result_fields(duckdb_result), result_fields(polars_result)
+        duckdb_fields.pop("record_order"), polars_fields.pop("record_order")
+        assert duckdb_fields == polars_fields
+    assert duckdb_results[1].unmatched_ps == 1
+
+
+@pytest.mark.parametrize("args", [(), ("--partitions", "3")])
+def test_cli_duckdb_engine_matches_the_polars_engine(fixture_data, tmp_path, args):
+    pytest.importorskip("duckdb")
+    tuned = ("--balance-tolerance", "5", "--max-errors", "7", *args)
+    polars_run = run_reconciliation(fixture_data, tmp_path / "polars", *tuned)
+    duckdb_run = run_reconciliation(fixture_data, tmp_path / "duckdb", "--engine", "duckdb", "--memory-limit-gb", "1", *tuned)
+
+    assert_same_outputs(polars_run, duckdb_run)
+
+
+@pytest.mark.parametrize("args", [(), ("--engine", "duckdb"), ("--partitions", "4")])
+def test_cli_without_rich_honours_tolerance_and_max_errors(fixture_data, tmp_path, args):
+    if "duckdb" in args:
+        pytest.importorskip("duckdb")
+    tuned = ("--balance-tolerance", "5", "--max-errors", "7", *args)
+    rich_run = run_reconciliation(fixture_data, tmp_path / "rich", *tuned)
+    plain_run = run_reconciliation(fixture_data, tmp_path / "plain", *tuned, without_rich=True)
+
+    assert_same_outputs(rich_run, plain_run)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PANDAS FALLBACK
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_pandas_to_polars_keeps_strings_and_nulls():
+    df = compare_init.pd.DataFrame({"ACC_NO": ["0012", None, "34"], "BAL": [1.5, None, 2.0]})
+    df = df.astype({"ACC_NO": compare_init.PANDAS_STRING_DTYPE})
+
+    frame = compare_init.pandas_to_polars(df)
+
+    assert frame.schema == {"ACC_NO": pl.Utf8, "BAL": pl.Float64}
+    assert frame["ACC_NO"].to_list() == ["0012", None, "34"]
+    assert frame["BAL"].to_list() == [1.5, None, 2.0]
+
+
+def test_pandas_fallback_loaders_read_the_same_accounts(fixture_data):
+    pytest.importorskip("pyarrow")
+    dsl1 = compare_init.load_dsl1_pandas_fallback(fixture_data / "DSL1")
+    ps = compare_init.load_payment_schedule_pandas_fallback(fixture_data / "PS")
+
+    assert str(dsl1["ACC_NO"].dtype) == str(ps["ACC_NO"].dtype) == "string"
+    assert dsl1["ACC_NO"].str.startswith("0").any()
+    for frame, loaded in (
+        (dsl1, compare_init.load_dsl1_polars(fixture_data / "DSL1")),
+        (ps, compare_init.load_payment_schedule_polars(fixture_data / "PS")),
+    ):
+        keys = compare_init.pandas_to_polars(frame).select(compare_init.account_key_expr("ACC_NO"))
+        assert keys[compare_init.ACC_KEY_COL].to_list() == loaded.collect()[compare_init.ACC_KEY_COL].to_list()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ARROW IPC STAGING
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_read_ipc_mapped_round_trips_the_frame(tmp_path):
+    frame = pl.DataFrame({"ACC_NO": ["1", None, "ก"], "BAL": [1.5, 2.0, None], "DATE": [date(2024, 1, 1), None, date(2024, 2, 29)]})
+    frame.write_ipc(tmp_path / "frame.arrow")
+
+    assert compare_init.read_ipc_mapped(tmp_path / "frame.arrow").equals(frame)
+
+
+def test_stage_frame_backs_the_frame_by_its_file(tmp_path):
+    dsl1, dsl2, _ = tiny_sources()
+
+    scanned = compare_init.stage_frame(dsl1.lazy(), tmp_path / "dsl1.arrow", streaming=True)
+    mapped = compare_init.stage_frame(dsl2, tmp_path / "dsl2.arrow")
+
+    assert isinstance(scanned, pl.LazyFrame) and scanned.collect().equals(dsl1)
+    assert isinstance(mapped, pl.DataFrame) and mapped.equals(dsl2)
+    assert compare_init.open_staged(tmp_path / "dsl1.arrow").equals(dsl1)
+
+
+def test_cli_removes_the_stage_files(default_run):
+    assert not (default_run / compare_init.STAGE_DIR_NAME).exists()
+    assert not list(default_run.glob("*.arrow"))
+
+
+def test_dsl2_preprocessing_keeps_no_heap_copy_of_the_deduplicated_frame(tmp_path):
+    _, result = preprocess_dsl2_rows(tmp_path, [["1", "01/01/2567", "100"], ["1", "01/01/2567", "100"]])
+
+    assert [name for name, value in vars(result).items() if isinstance(value, pl.DataFrame)] == ["conflict_records"]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# STAGE CHECKPOINTS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_checkpoints_skip_only_completed_stages_with_the_same_fingerprint(tmp_path):
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return value
+
+    compare_init.StageCheckpoints(tmp_path).run("stage", "fp", lambda: compute(1))
+    resumed = compare_init.StageCheckpoints(tmp_path, resume=True)
+
+    assert resumed.run("stage", "fp", lambda: compute(2)) == 1
+    assert resumed.run("stage", "other", lambda: compute(3)) == 3
+    assert compare_init.StageCheckpoints(tmp_path).run("stage", "other", lambda: compute(4)) == 4
+    assert calls == [1, 3, 4]
+
+
+def test_checkpoints_reopen_a_completed_source_stage(tmp_path):
+    _, dsl2, _ = tiny_sources()
+    loads = []
+
+    def load():
+        loads.append(1)
+        return dsl2, {"rows": dsl2.height}
+
+    compare_init.StageCheckpoints(tmp_path).run_source("dsl2", "fp", load)
+    frame, meta = compare_init.StageCheckpoints(tmp_path, resume=True).run_source("dsl2", "fp", load)
+
+    assert frame.equals(dsl2) and meta == {"rows": 5}
+    assert loads == [1]
+
+
+def test_checkpoints_do_not_record_an_interrupted_stage(tmp_path):
+    def crash():
+        raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        compare_init.StageCheckpoints(tmp_path).run("stage", "fp", crash)
+
+    assert not compare_init.StageCheckpoints(tmp_path, resume=True).completed("stage", "fp")
+
+
+def test_cli_resume_after_a_crash_matches_the_default(fixture_data, default_run, tmp_path):
+    output = tmp_path / "out"
+    crash = (
+        "import os, sys; sys.argv[0] = sys.argv.pop(1); sys.path.insert(0, os.path.dirname(sys.argv[0])); "
+        "import compare_init\n"
+        "def crash(*args, **kwargs): raise RuntimeError('interrupted')\n"
+        "compare_init.reconcile_three_way = crash; compare_init.main()"
+    )
+    args = [
+        str(SCRIPT), "--dsl1", str(fixture_data / "DSL1"), "--dsl2", str(fixture_data / "DSL2"),
+        "--payment-schedule", str(fixture_data / "PS"), "--output", str(output), "--max-errors", "25",
+    ]
+
+    crashed = subprocess.run([sys.executable, "-c", crash, *args], capture_output=True)
+    assert crashed.returncode != 0
+    assert (output / "_tmp" / compare_init.CHECKPOINT_DIR_NAME / "dsl1_vs_dsl2.json").exists()
+
+    resumed = subprocess.run([sys.executable, *args, "--resume"], capture_output=True, check=True)
+    assert "stage 'dsl1_vs_dsl2' already complete" in resumed.stdout.decode("utf-8", "replace")
+    assert_same_outputs(default_run, output)
+    assert not (output / "_tmp").exists()
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# INCREMENTAL RUNS
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_with_file_order_is_stable_per_file():
+    files = [Path("a.csv"), Path("b.csv")]
+    sources = [(path, pl.LazyFrame({"x": [1, 2]})) for path in reversed(files)]
+
+    ordered = compare_init.with_file_order(sources, files, "_ROW")
+
+    rows = {path.name: lf.collect()["_ROW"].to_list() for path, lf in ordered}
+    shift = 1 << compare_init.FILE_RANK_SHIFT
+    assert rows == {"b.csv": [shift, shift + 1], "a.csv": [0, 1]}
+    assert compare_init.with_file_order(sources, files, None) is sources
+
+
+def assert_same_as_fresh(incremental: Path, fresh: Path) -> dict:
+    """The incremental run's reports equal a fresh run's; returns its incremental statistics."""
+    stats = stable_stats(incremental)
+    summary = stats.pop("incremental")
+    assert stats == stable_stats(fresh)
+    assert_same_reports(fresh, incremental)
+    return summary
+
+
+def test_cli_incremental_runs_match_fresh_runs(fixture_data, default_run, tmp_path):
+    data = tmp_path / "data"
+    shutil.copytree(fixture_data, data)
+    output = tmp_path / "incremental"
+
+    first = assert_same_as_fresh(run_reconciliation(data, output, "--incremental"), default_run)
+    assert first["full_rebuild"]
+
+    unchanged = assert_same_as_fresh(run_reconciliation(data, output, "--incremental"), default_run)
+    assert unchanged["recomputed_buckets"] == 0
+
+    (data / "DSL1" / "c.csv").write_text(
+        "ACC_NO,GROUP_FLAG,FIRST_PAYMENT_DATE,PRE_BALANCE,EXACT_PRE_BALANCE\n000000000777,1,2021-05-05,5.0,5.0\n",
+        encoding="utf-8",
+    )
+    ps_file = data / "PS" / "ps.csv"
+    lines = ps_file.read_text(encoding="utf-8").splitlines()
+    lines[1] = lines[1].rsplit(",", 1)[0] + ",1.23"
+    ps_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    (data / "DSL2" / "br2.csv").unlink()
+
+    changed = assert_same_as_fresh(
+        run_reconciliation(data, output, "--incremental"),
+        run_reconciliation(data, tmp_path / "fresh"),
+    )
+    assert not changed["full_rebuild"]
+    assert 0 < changed["recomputed_buckets"] < changed["buckets"]
+    assert changed["files"] == {
+        "dsl1": {"changed": ["c.csv"], "removed": []},
+        "dsl2": {"changed": [], "removed": ["br2.csv"]},
+        "ps": {"changed": ["ps.csv"], "removed": []},
+    }
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# RUN-TO-RUN DELTA
+# ══════════════════════════════════════════════════════════════════════════════
+
+def test_account_outcomes_classify_each_matched_account(tmp_path):
+    dsl1, dsl2, _ = tiny_sources()
+
+    compare_init.reconcile_dsl1_vs_dsl2(dsl1, dsl2, outcomes_path=tmp_path / "outcomes.parquet")
+
+    outcomes = pl.read_parquet(tmp_path / "outcomes.parquet")
+    assert outcomes["ACC_NO"].to_list() == ["1", "2", "3", "4"]
+    assert outcomes["STATUS"].to_list() == ["perfect", "date", "balance", "both"]
+    assert outcomes["MAX_ABS_BAL_DIFF"].to_list() == [0.0, 0.0, 50.0, 50.0]
+
+
+def outcome_rows(rows):
+    return pl.LazyFrame(
+        [(key, key, *values) for key, *values in rows],
+        schema=[compare_init.ACC_KEY_COL, "ACC_NO", "STATUS", *compare_init.OUTCOME_VALUE_COLS],
+        orient="row",
+    )
+
+
+def test_diff_outcomes_reports_new_resolved_and_changed_accounts(tmp_path):
+    base = outcome_rows([
+        ("1", "perfect", 1, 0, 0, 0.0),
+        ("2", "balance", 1, 0, 1, 5.0),
+        ("3", "balance", 1, 0, 1, 5.0),
+        ("4", "date", 1, 1, 0, 0.0),
+        ("5", "unmatched", 0, 0, 0, None),
+    ])
+    new = outcome_rows([
+        ("1", "date", 1, 1, 0, 0.0),
+        ("2", "perfect", 1, 0, 0, 0.0),
+        ("3", "balance", 1, 0, 1, 7.0),
+        ("4", "date", 1, 1, 0, 0.0),
+        ("6", "both", 1, 1, 1, 1.0),
+    ])
+
+    counts = compare_init.diff_outcomes(base, new, tmp_path / "delta.csv")
+
+    assert (counts["new"], counts["resolved"], counts["changed"], counts["unchanged_discrepant"]) == (2, 2, 1, 1)
+    delta = pl.read_csv(tmp_path / "delta.csv", infer_schema=False)
+    assert list(zip(delta["ACC_NO"], delta["CHANGE"])) == [
+        ("1", "new"), ("2", "resolved"), ("3", "changed"), ("5", "resolved"), ("6", "new"),
+    ]
+    assert delta.filter(pl.col("ACC_NO") == "5")["STATUS_NEW"].to_list() == ["absent"]
+
+
+def test_cli_diff_reports_the_accounts_a_source_change_broke(fixture_data, default_run, tmp_path):
+    data = tmp_path / "data"
+    shutil.copytree(fixture_data, data)
+    ps_file = data / "PS" / "ps.csv"
+    lines = ps_file.read_text(encoding="utf-8").splitlines()
+    broken_acc = lines[1].split(",", 1)[0]
+    lines[1] = lines[1].rsplit(",", 1)[0] + ",-1"
+    ps_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    new_run = run_reconciliation(data, tmp_path / "new")
+
+    subprocess.run([sys.executable, str(SCRIPT), "diff", str(default_run), str(new_run)], check=True, capture_output=True)
+
+    with open(new_run / "delta" / compare_init.DIFF_SUMMARY_FILE, "r", encoding="utf-8") as f:
+        comparisons = json.load(f)["comparisons"]
+    assert comparisons["dsl1_vs_dsl2"]["new"] == comparisons["dsl1_vs_dsl2"]["resolved"] == 0
+    assert comparisons["ps_vs_dsl2"]["new"] + comparisons["ps_vs_dsl2"]["changed"] == 1
+    delta = pl.read_csv(new_run / "delta" / "delta_ps_vs_dsl2.csv", infer_schema=False)
+    assert delta["ACC_NO"].str.strip_chars_start("0").to_list() == [broken_acc.lstrip("0")]